@@ -1,6 +1,10 @@
 # GRASP – Pure Fabrication: Main module handles UI presentation layer
+import argparse
+import json
+import sys
+
 from src.services.reservation_service import ReservationService
-from src.utils.logging_config import setup_logging, get_logger
+from src.utils.logging_config import setup_logging, get_logger, parse_log_levels
 
 
 def print_menu():
@@ -23,10 +27,28 @@ def print_menu():
     print("14. Make Payment")
     print("15. View Payments")
     print("16. Delete Payment")
+    print("17. Search Guests")
     print("0. Exit")
     print("="*50)
 
 
+# Menus only need a few columns; projected rows skip the rest and skip model hydration
+ROOM_MENU_FIELDS = ["id", "number", "room_type", "price_per_night", "is_available"]
+GUEST_MENU_FIELDS = ["id", "name", "email"]
+
+# Long-running commands are profiled per service call rather than as one operation
+PER_CALL_PROFILED_COMMANDS = ("serve", "loadtest")
+
+
+def describe_room(room):
+    status = "Available" if room.is_available else "Occupied"
+    return f"Room {room.number} ({room.room_type}) - ${room.price_per_night}/night - {status}"
+
+
+def describe_guest(guest):
+    return f"Guest: {guest.name} ({guest.email})"
+
+
 # GRASP – Controller: Function delegates to service layer
 def add_room(service):
     logger = get_logger(__name__)
@@ -37,24 +59,24 @@ def add_room(service):
         price = float(input("Price per night: "))
         capacity = int(input("Capacity: "))
         
-        logger.info(f"User adding room #{number}")
+        logger.info("User adding room #%s", number)
         room = service.add_room(number, room_type, price, capacity)
         print(f"✓ Room added successfully! ID: {room.id}")
     except Exception as error:
-        logger.error(f"Error adding room: {error}")
+        logger.error("Error adding room: %s", error)
         print(f"✗ Error: {error}")
 
 # GRASP – Low Coupling: UI functions only interact with service, not repositories
 def view_rooms(service):
     print("\n--- All Rooms ---")
     try:
-        rooms = service.get_all_rooms()
+        rooms = service.get_all_rooms(fields=ROOM_MENU_FIELDS)
         if not rooms:
             print("No rooms found.")
             return
         
         for room in rooms:
-            print(room)
+            print(describe_room(room))
     except Exception as error:
         print(f"✗ Error: {error}")
 
@@ -63,14 +85,14 @@ def update_room(service):
     logger = get_logger(__name__)
     print("\n--- Update Room ---")
     try:
-        rooms = service.get_all_rooms()
+        rooms = service.get_all_rooms(fields=ROOM_MENU_FIELDS)
         if not rooms:
             print("No rooms found.")
             return
         
         print("Rooms:")
         for i, room in enumerate(rooms, 1):
-            print(f"{i}. {room}")
+            print(f"{i}. {describe_room(room)}")
         
         choice_input = input(f"Select from list (1-{len(rooms)}): ").strip()
         choice = int(choice_input) - 1
@@ -78,7 +100,7 @@ def update_room(service):
         if choice < 0 or choice >= len(rooms):
             print(f"✗ Invalid selection. Please enter a number between 1 and {len(rooms)}")
             return
-        selected_room = rooms[choice]
+        selected_room = service.get_room(rooms[choice].id)
         
         print("\nLeave blank to keep current value")
         number = input(f"Room number [{selected_room.number}]: ").strip()
@@ -87,7 +109,7 @@ def update_room(service):
         capacity = input(f"Capacity [{selected_room.capacity}]: ").strip()
         available = input(f"Available [{selected_room.is_available}] (yes/no): ").strip().lower()
         
-        logger.info(f"User updating room: {selected_room.id}")
+        logger.info("User updating room: %s", selected_room.id)
         service.update_room(
             selected_room.id,
             number=number if number else None,
@@ -100,7 +122,7 @@ def update_room(service):
     except ValueError:
         print("✗ Invalid input. Please enter a valid number.")
     except Exception as error:
-        logger.error(f"Error updating room: {error}")
+        logger.error("Error updating room: %s", error)
         print(f"✗ Error: {error}")
 
 
@@ -108,14 +130,14 @@ def delete_room(service):
     logger = get_logger(__name__)
     print("\n--- Delete Room ---")
     try:
-        rooms = service.get_all_rooms()
+        rooms = service.get_all_rooms(fields=ROOM_MENU_FIELDS)
         if not rooms:
             print("No rooms found.")
             return
         
         print("Rooms:")
         for i, room in enumerate(rooms, 1):
-            print(f"{i}. {room}")
+            print(f"{i}. {describe_room(room)}")
         
         choice_input = input(f"Select from list (1-{len(rooms)}): ").strip()
         choice = int(choice_input) - 1
@@ -127,7 +149,7 @@ def delete_room(service):
         
         confirm = input(f"Delete room {selected_room.number}? (yes/no): ").strip().lower()
         if confirm in ['yes', 'y']:
-            logger.info(f"User deleting room: {selected_room.id}")
+            logger.info("User deleting room: %s", selected_room.id)
             service.delete_room(selected_room.id)
             print("✓ Room deleted successfully!")
         else:
@@ -135,7 +157,7 @@ def delete_room(service):
     except ValueError:
         print("✗ Invalid input. Please enter a valid number.")
     except Exception as error:
-        logger.error(f"Error deleting room: {error}")
+        logger.error("Error deleting room: %s", error)
         print(f"✗ Error: {error}")
 
 
@@ -147,24 +169,39 @@ def add_guest(service):
         email = input("Email: ")
         phone = input("Phone: ")
         
-        logger.info(f"User registering guest: {name}")
+        logger.info("User registering guest: %s", name)
         guest = service.add_guest(name, email, phone)
         print(f"✓ Guest added successfully! ID: {guest.id}")
     except Exception as error:
-        logger.error(f"Error adding guest: {error}")
+        logger.error("Error adding guest: %s", error)
         print(f"✗ Error: {error}")
 
 
 def view_guests(service):
     print("\n--- All Guests ---")
     try:
-        guests = service.get_all_guests()
+        guests = service.get_all_guests(fields=GUEST_MENU_FIELDS)
         if not guests:
             print("No guests found.")
             return
         
         for guest in guests:
-            print(guest)
+            print(describe_guest(guest))
+    except Exception as error:
+        print(f"✗ Error: {error}")
+
+
+def search_guests(service):
+    print("\n--- Search Guests ---")
+    try:
+        query = input("Name, email or phone (partial is fine): ")
+        guests = service.search_guests(query)
+        if not guests:
+            print("No matching guests.")
+            return
+        
+        for guest in guests:
+            print(f"{guest} - {guest.phone} (ID: {guest.id})")
     except Exception as error:
         print(f"✗ Error: {error}")
 
@@ -173,14 +210,14 @@ def update_guest(service):
     logger = get_logger(__name__)
     print("\n--- Update Guest ---")
     try:
-        guests = service.get_all_guests()
+        guests = service.get_all_guests(fields=GUEST_MENU_FIELDS)
         if not guests:
             print("No guests found.")
             return
         
         print("Guests:")
         for i, guest in enumerate(guests, 1):
-            print(f"{i}. {guest}")
+            print(f"{i}. {describe_guest(guest)}")
         
         choice_input = input(f"Select from list (1-{len(guests)}): ").strip()
         choice = int(choice_input) - 1
@@ -188,14 +225,14 @@ def update_guest(service):
         if choice < 0 or choice >= len(guests):
             print(f"✗ Invalid selection. Please enter a number between 1 and {len(guests)}")
             return
-        selected_guest = guests[choice]
+        selected_guest = service.get_guest(guests[choice].id)
         
         print("\nLeave blank to keep current value")
         name = input(f"Guest name [{selected_guest.name}]: ").strip()
         email = input(f"Email [{selected_guest.email}]: ").strip()
         phone = input(f"Phone [{selected_guest.phone}]: ").strip()
         
-        logger.info(f"User updating guest: {selected_guest.id}")
+        logger.info("User updating guest: %s", selected_guest.id)
         service.update_guest(
             selected_guest.id,
             name=name if name else None,
@@ -204,7 +241,7 @@ def update_guest(service):
         )
         print("✓ Guest updated successfully!")
     except Exception as error:
-        logger.error(f"Error updating guest: {error}")
+        logger.error("Error updating guest: %s", error)
         print(f"✗ Error: {error}")
 
 
@@ -212,14 +249,14 @@ def delete_guest(service):
     logger = get_logger(__name__)
     print("\n--- Delete Guest ---")
     try:
-        guests = service.get_all_guests()
+        guests = service.get_all_guests(fields=GUEST_MENU_FIELDS)
         if not guests:
             print("No guests found.")
             return
         
         print("Guests:")
         for i, guest in enumerate(guests, 1):
-            print(f"{i}. {guest}")
+            print(f"{i}. {describe_guest(guest)}")
         
         choice_input = input(f"Select from list (1-{len(guests)}): ").strip()
         choice = int(choice_input) - 1
@@ -231,13 +268,13 @@ def delete_guest(service):
         
         confirm = input(f"Delete guest {selected_guest.name}? (yes/no): ").strip().lower()
         if confirm in ['yes', 'y']:
-            logger.info(f"User deleting guest: {selected_guest.id}")
+            logger.info("User deleting guest: %s", selected_guest.id)
             service.delete_guest(selected_guest.id)
             print("✓ Guest deleted successfully!")
         else:
             print("Deletion cancelled.")
     except Exception as error:
-        logger.error(f"Error deleting guest: {error}")
+        logger.error("Error deleting guest: %s", error)
         print(f"✗ Error: {error}")
 
 
@@ -246,7 +283,7 @@ def create_reservation(service):
     logger = get_logger(__name__)
     print("\n--- Create Reservation ---")
     try:
-        rooms = service.get_all_rooms()
+        rooms = service.get_all_rooms(fields=ROOM_MENU_FIELDS)
         available_rooms = [r for r in rooms if r.is_available]
         
         if not available_rooms:
@@ -255,21 +292,21 @@ def create_reservation(service):
         
         print("Available rooms:")
         for i, room in enumerate(available_rooms, 1):
-            print(f"{i}. {room}")
+            print(f"{i}. {describe_room(room)}")
         
         room_choice = int(input(f"Select from list (1-{len(available_rooms)}): "))
         if room_choice < 1 or room_choice > len(available_rooms):
             raise ValueError(f"Please select a number between 1 and {len(available_rooms)}")
         selected_room = available_rooms[room_choice - 1]
         
-        guests = service.get_all_guests()
+        guests = service.get_all_guests(fields=GUEST_MENU_FIELDS)
         if not guests:
             print("No guests found. Please add a guest first.")
             return
         
         print("\nGuests:")
         for i, guest in enumerate(guests, 1):
-            print(f"{i}. {guest}")
+            print(f"{i}. {describe_guest(guest)}")
         
         guest_choice = int(input(f"Select from list (1-{len(guests)}): "))
         if guest_choice < 1 or guest_choice > len(guests):
@@ -279,7 +316,7 @@ def create_reservation(service):
         check_in = input("Check-in date (YYYY-MM-DD): ")
         check_out = input("Check-out date (YYYY-MM-DD): ")
         
-        logger.info(f"User creating reservation: {selected_guest.name} → Room #{selected_room.number}")
+        logger.info("User creating reservation: %s → Room #%s", selected_guest.name, selected_room.number)
         reservation = service.create_reservation(
             selected_guest.id,
             selected_room.id,
@@ -288,30 +325,30 @@ def create_reservation(service):
         )
         print(f"✓ Reservation created successfully! ID: {reservation.id}")
     except ValueError as error:
-        logger.error(f"Invalid input for reservation: {error}")
+        logger.error("Invalid input for reservation: %s", error)
         print(f"✗ Error: {error}")
     except Exception as error:
-        logger.error(f"Error creating reservation: {error}")
+        logger.error("Error creating reservation: %s", error)
         print(f"✗ Error: {error}")
 
 
+def print_reservation_list(reservations):
+    for i, reservation in enumerate(reservations, 1):
+        guest_name = reservation["guest_name"] or "Unknown Guest"
+        room_number = reservation["room_number"] or "Unknown Room"
+        print(f"{i}. Guest: {guest_name} | Room: {room_number} | {reservation['check_in_date']} to {reservation['check_out_date']} | Status: {reservation['status']}")
+
+
 def view_reservations(service):
     print("\n--- All Reservations ---")
     try:
-        reservations = service.get_all_reservations()
+        # Guest names and room numbers come from one joined query, not a lookup per row
+        reservations = service.get_reservation_details()
         if not reservations:
             print("No reservations found.")
             return
         
-        for i, reservation in enumerate(reservations, 1):
-            # Get guest and room details for readable display
-            guest = service.guest_repo.get_by_id(reservation.guest_id)
-            room = service.room_repo.get_by_id(reservation.room_id)
-            
-            guest_name = guest.name if guest else "Unknown Guest"
-            room_number = room.number if room else "Unknown Room"
-            
-            print(f"{i}. Guest: {guest_name} | Room: {room_number} | {reservation.check_in_date} to {reservation.check_out_date} | Status: {reservation.status}")
+        print_reservation_list(reservations)
     except Exception as error:
         print(f"✗ Error: {error}")
 
@@ -320,18 +357,13 @@ def update_reservation(service):
     logger = get_logger(__name__)
     print("\n--- Update Reservation ---")
     try:
-        reservations = service.get_all_reservations()
+        reservations = service.get_reservation_details()
         if not reservations:
             print("No reservations found.")
             return
         
         print("Reservations:")
-        for i, reservation in enumerate(reservations, 1):
-            guest = service.guest_repo.get_by_id(reservation.guest_id)
-            room = service.room_repo.get_by_id(reservation.room_id)
-            guest_name = guest.name if guest else "Unknown"
-            room_number = room.number if room else "Unknown"
-            print(f"{i}. Guest: {guest_name} | Room: {room_number} | {reservation.check_in_date} to {reservation.check_out_date} | Status: {reservation.status}")
+        print_reservation_list(reservations)
         
         choice_input = input(f"Select from list (1-{len(reservations)}): ").strip()
         choice = int(choice_input) - 1
@@ -342,18 +374,18 @@ def update_reservation(service):
         selected_reservation = reservations[choice]
         
         print("\nLeave blank to keep current value")
-        check_in = input(f"Check-in date [{selected_reservation.check_in_date}] (YYYY-MM-DD): ").strip()
-        check_out = input(f"Check-out date [{selected_reservation.check_out_date}] (YYYY-MM-DD): ").strip()
+        check_in = input(f"Check-in date [{selected_reservation['check_in_date']}] (YYYY-MM-DD): ").strip()
+        check_out = input(f"Check-out date [{selected_reservation['check_out_date']}] (YYYY-MM-DD): ").strip()
         
-        logger.info(f"User updating reservation: {selected_reservation.id}")
+        logger.info("User updating reservation: %s", selected_reservation['reservation_id'])
         service.update_reservation(
-            selected_reservation.id,
+            selected_reservation['reservation_id'],
             check_in_date=check_in if check_in else None,
             check_out_date=check_out if check_out else None
         )
         print("✓ Reservation updated successfully!")
     except Exception as error:
-        logger.error(f"Error updating reservation: {error}")
+        logger.error("Error updating reservation: %s", error)
         print(f"✗ Error: {error}")
 
 
@@ -361,18 +393,13 @@ def delete_reservation(service):
     logger = get_logger(__name__)
     print("\n--- Delete Reservation ---")
     try:
-        reservations = service.get_all_reservations()
+        reservations = service.get_reservation_details()
         if not reservations:
             print("No reservations found.")
             return
         
         print("Reservations:")
-        for i, reservation in enumerate(reservations, 1):
-            guest = service.guest_repo.get_by_id(reservation.guest_id)
-            room = service.room_repo.get_by_id(reservation.room_id)
-            guest_name = guest.name if guest else "Unknown"
-            room_number = room.number if room else "Unknown"
-            print(f"{i}. Guest: {guest_name} | Room: {room_number} | {reservation.check_in_date} to {reservation.check_out_date} | Status: {reservation.status}")
+        print_reservation_list(reservations)
         
         choice_input = input(f"Select from list (1-{len(reservations)}): ").strip()
         choice = int(choice_input) - 1
@@ -382,15 +409,15 @@ def delete_reservation(service):
             return
         selected_reservation = reservations[choice]
         
-        confirm = input(f"Delete reservation {selected_reservation.id}? (yes/no): ").strip().lower()
+        confirm = input(f"Delete reservation {selected_reservation['reservation_id']}? (yes/no): ").strip().lower()
         if confirm in ['yes', 'y']:
-            logger.info(f"User deleting reservation: {selected_reservation.id}")
-            service.delete_reservation(selected_reservation.id)
+            logger.info("User deleting reservation: %s", selected_reservation['reservation_id'])
+            service.delete_reservation(selected_reservation['reservation_id'])
             print("✓ Reservation deleted successfully!")
         else:
             print("Deletion cancelled.")
     except Exception as error:
-        logger.error(f"Error deleting reservation: {error}")
+        logger.error("Error deleting reservation: %s", error)
         print(f"✗ Error: {error}")
 
 
@@ -398,18 +425,13 @@ def cancel_reservation(service):
     logger = get_logger(__name__)
     print("\n--- Cancel Reservation ---")
     try:
-        reservations = service.get_all_reservations()
+        reservations = service.get_reservation_details()
         if not reservations:
             print("No reservations found.")
             return
         
         print("Reservations:")
-        for i, reservation in enumerate(reservations, 1):
-            guest = service.guest_repo.get_by_id(reservation.guest_id)
-            room = service.room_repo.get_by_id(reservation.room_id)
-            guest_name = guest.name if guest else "Unknown"
-            room_number = room.number if room else "Unknown"
-            print(f"{i}. Guest: {guest_name} | Room: {room_number} | {reservation.check_in_date} to {reservation.check_out_date} | Status: {reservation.status}")
+        print_reservation_list(reservations)
         
         choice_input = input(f"Select from list (1-{len(reservations)}): ").strip()
         choice = int(choice_input) - 1
@@ -419,11 +441,11 @@ def cancel_reservation(service):
             return
         selected_reservation = reservations[choice]
         
-        logger.info(f"User cancelling reservation: {selected_reservation.id}")
-        service.cancel_reservation(selected_reservation.id)
+        logger.info("User cancelling reservation: %s", selected_reservation['reservation_id'])
+        service.cancel_reservation(selected_reservation['reservation_id'])
         print("✓ Reservation cancelled successfully!")
     except Exception as error:
-        logger.error(f"Error cancelling reservation: {error}")
+        logger.error("Error cancelling reservation: %s", error)
         print(f"✗ Error: {error}")
 
 
@@ -432,31 +454,17 @@ def make_payment(service):
     logger = get_logger(__name__)
     print("\n--- Make Payment ---")
     try:
-        reservations = service.get_all_reservations()
+        # Balances come with the joined rows, so listing needs no per-reservation queries
+        reservations = service.get_reservation_details()
         if not reservations:
             print("No reservations found.")
             return
         
         print("Reservations:")
         for i, reservation in enumerate(reservations, 1):
-            guest = service.guest_repo.get_by_id(reservation.guest_id)
-            room = service.room_repo.get_by_id(reservation.room_id)
-            guest_name = guest.name if guest else "Unknown"
-            room_number = room.number if room else "Unknown"
-            
-            # Calculate total cost and paid amount
-            from datetime import datetime
-            check_in = datetime.strptime(reservation.check_in_date, "%Y-%m-%d")
-            check_out = datetime.strptime(reservation.check_out_date, "%Y-%m-%d")
-            nights = (check_out - check_in).days
-            total_cost = room.price_per_night * nights if room else 0
-            
-            # Get existing payments for this reservation
-            all_payments = service.payment_repo.get_all()
-            paid_amount = sum(p.amount for p in all_payments if p.reservation_id == reservation.id and p.status in ["completed", "partial"])
-            remaining = total_cost - paid_amount
-            
-            print(f"{i}. Guest: {guest_name} | Room: {room_number} | {nights} nights | Total: ${total_cost:.2f} | Paid: ${paid_amount:.2f} | Remaining: ${remaining:.2f}")
+            guest_name = reservation["guest_name"] or "Unknown"
+            room_number = reservation["room_number"] or "Unknown"
+            print(f"{i}. Guest: {guest_name} | Room: {room_number} | {reservation['nights']} nights | Total: ${reservation['amount_due']:.2f} | Paid: ${reservation['amount_paid']:.2f} | Remaining: ${reservation['remaining']:.2f}")
         
         choice = int(input(f"Select from list (1-{len(reservations)}): "))
         if choice < 1 or choice > len(reservations):
@@ -464,14 +472,9 @@ def make_payment(service):
         selected_reservation = reservations[choice - 1]
         
         # Show payment summary for selected reservation
-        room = service.room_repo.get_by_id(selected_reservation.room_id)
-        check_in = datetime.strptime(selected_reservation.check_in_date, "%Y-%m-%d")
-        check_out = datetime.strptime(selected_reservation.check_out_date, "%Y-%m-%d")
-        nights = (check_out - check_in).days
-        total_cost = room.price_per_night * nights if room else 0
-        all_payments = service.payment_repo.get_all()
-        paid_amount = sum(p.amount for p in all_payments if p.reservation_id == selected_reservation.id and p.status in ["completed", "partial"])
-        remaining = total_cost - paid_amount
+        total_cost = selected_reservation["amount_due"]
+        paid_amount = selected_reservation["amount_paid"]
+        remaining = selected_reservation["remaining"]
         
         print(f"\nTotal Cost: ${total_cost:.2f}")
         print(f"Already Paid: ${paid_amount:.2f}")
@@ -484,9 +487,9 @@ def make_payment(service):
         if payment_type == "card":
             card_number = input("Card number: ")
         
-        logger.info(f"User making {payment_type} payment of ${amount:.2f}")
+        logger.info("User making %s payment of $%.2f", payment_type, amount)
         payment = service.process_payment(
-            selected_reservation.id,
+            selected_reservation["reservation_id"],
             amount,
             payment_type,
             card_number
@@ -507,10 +510,28 @@ def make_payment(service):
             print(f"✓ Overpaid by: ${abs(new_remaining):.2f} - Status: COMPLETED")
             
     except Exception as error:
-        logger.error(f"Error processing payment: {error}")
+        logger.error("Error processing payment: %s", error)
         print(f"✗ Error: {error}")
 
 
+def print_payment_list(service, payments):
+    # Reservations, guests and rooms are loaded in three batched queries, not per payment
+    reservations = service.reservation_repo.get_many([payment.reservation_id for payment in payments])
+    related = service.prefetch_related(reservations, include=("guests", "rooms"))
+    reservations = {reservation.id: reservation for reservation in reservations}
+    
+    for i, payment in enumerate(payments, 1):
+        reservation = reservations.get(payment.reservation_id)
+        if reservation:
+            guest = related["guests"].get(reservation.guest_id)
+            room = related["rooms"].get(reservation.room_id)
+            guest_name = guest.name if guest else "Unknown"
+            room_number = room.number if room else "Unknown"
+            print(f"{i}. ${payment.amount:.2f} ({payment.payment_type}) | Guest: {guest_name} | Room: {room_number} | Status: {payment.status}")
+        else:
+            print(f"{i}. ${payment.amount:.2f} ({payment.payment_type}) | Status: {payment.status}")
+
+
 def view_payments(service):
     print("\n--- All Payments ---")
     try:
@@ -519,17 +540,7 @@ def view_payments(service):
             print("No payments found.")
             return
         
-        for i, payment in enumerate(payments, 1):
-            # Get reservation details
-            reservation = service.reservation_repo.get_by_id(payment.reservation_id)
-            if reservation:
-                guest = service.guest_repo.get_by_id(reservation.guest_id)
-                room = service.room_repo.get_by_id(reservation.room_id)
-                guest_name = guest.name if guest else "Unknown"
-                room_number = room.number if room else "Unknown"
-                print(f"{i}. ${payment.amount:.2f} ({payment.payment_type}) | Guest: {guest_name} | Room: {room_number} | Status: {payment.status}")
-            else:
-                print(f"{i}. ${payment.amount:.2f} ({payment.payment_type}) | Status: {payment.status}")
+        print_payment_list(service, payments)
     except Exception as error:
         print(f"✗ Error: {error}")
 
@@ -544,16 +555,7 @@ def delete_payment(service):
             return
         
         print("Payments:")
-        for i, payment in enumerate(payments, 1):
-            reservation = service.reservation_repo.get_by_id(payment.reservation_id)
-            if reservation:
-                guest = service.guest_repo.get_by_id(reservation.guest_id)
-                room = service.room_repo.get_by_id(reservation.room_id)
-                guest_name = guest.name if guest else "Unknown"
-                room_number = room.number if room else "Unknown"
-                print(f"{i}. ${payment.amount:.2f} ({payment.payment_type}) | Guest: {guest_name} | Room: {room_number} | Status: {payment.status}")
-            else:
-                print(f"{i}. ${payment.amount:.2f} ({payment.payment_type}) | Status: {payment.status}")
+        print_payment_list(service, payments)
         
         choice_input = input(f"Select from list (1-{len(payments)}): ").strip()
         choice = int(choice_input) - 1
@@ -565,34 +567,398 @@ def delete_payment(service):
         
         confirm = input(f"Delete payment {selected_payment.id}? (yes/no): ").strip().lower()
         if confirm in ['yes', 'y']:
-            logger.info(f"User deleting payment: {selected_payment.id}")
+            logger.info("User deleting payment: %s", selected_payment.id)
             service.delete_payment(selected_payment.id)
             print("✓ Payment deleted successfully!")
         else:
             print("Deletion cancelled.")
     except Exception as error:
-        logger.error(f"Error deleting payment: {error}")
+        logger.error("Error deleting payment: %s", error)
+        print(f"✗ Error: {error}")
+
+
+def rebuild_summary(service):
+    print("\n--- Rebuild Daily Summary ---")
+    try:
+        service.rebuild_daily_summary()
+        print("✓ Daily summary rebuilt successfully!")
+    except Exception as error:
+        print(f"✗ Error: {error}")
+
+
+# One-shot commands import their services on first use to keep startup fast
+def export_collection(service, args):
+    from src.services.export_service import ExportService
+    
+    print(f"\n--- Export {args.collection} ---")
+    try:
+        fields = args.fields.split(",") if args.fields else None
+        result = ExportService(service.storage).export(
+            args.collection,
+            args.path,
+            fields=fields,
+            start_date=args.start,
+            end_date=args.end,
+            date_field=args.date_field
+        )
+        print(f"✓ Exported {result['rows']} rows to {result['path']} in {result['elapsed']:.2f}s")
+    except Exception as error:
+        print(f"✗ Error: {error}")
+
+
+def import_collection(service, args):
+    from src.services.import_service import ImportService
+    
+    print(f"\n--- Import {args.collection} ---")
+    try:
+        result = ImportService(service.storage).import_file(
+            args.collection,
+            args.path,
+            batch_size=args.batch_size,
+            checkpoint_path=args.checkpoint
+        )
+        print(f"✓ Imported {result['imported']} of {result['read']} rows in {result['elapsed']:.2f}s "
+              f"({result['rows_per_second']:.0f} rows/s)")
+        print(f"  Duplicates skipped: {result['duplicates']}, invalid rows: {result['invalid']}")
+        for error in result["errors"]:
+            print(f"  line {error['line']}: {error['error']}")
+    except Exception as error:
+        print(f"✗ Error: {error}")
+
+
+def dedup_guests(service, args):
+    from src.services.guest_dedup_service import GuestDedupService
+    
+    print("\n--- Duplicate Guests ---")
+    try:
+        groups = GuestDedupService(service.storage).find_duplicates(max_block_size=args.max_block_size)
+        if not groups:
+            print("No duplicate guests found.")
+            return
+        
+        for group in groups:
+            print(f"\nMatched on {', '.join(group['reasons'])}:")
+            for guest in group["guests"]:
+                marker = "*" if guest["id"] == group["survivor_id"] else " "
+                print(f" {marker} {guest['name']} ({guest['email']}, {guest['phone']}) ID: {guest['id']}")
+            if args.merge:
+                service.merge_guests(group["survivor_id"], group["duplicate_ids"])
+                print(f"✓ Merged into {group['survivor_id']}")
+        
+        print(f"\n{len(groups)} duplicate groups found" + (" and merged." if args.merge else "; * marks the suggested survivor."))
+    except Exception as error:
+        print(f"✗ Error: {error}")
+
+
+def run_commands(service, args):
+    from src.services.command_runner import CommandRunner, READ_COMMANDS, to_plain
+    
+    runner = CommandRunner(service, group_size=args.group_size)
+    try:
+        source = sys.stdin if args.path == "-" else open(args.path, encoding="utf-8")
+        with source:
+            outcome = runner.run(runner.read_commands(source))
+    except Exception as error:
+        print(f"✗ Error: {error}")
+        return
+    
+    for entry in outcome["entries"]:
+        if not entry["ok"]:
+            print(f"✗ line {entry['line']} ({entry['command']}): {entry['error']}", file=sys.stderr)
+        elif entry["command"] in READ_COMMANDS:
+            print(json.dumps({"line": entry["line"], "result": to_plain(entry["result"])}))
+    
+    summary = outcome["summary"]
+    print(f"\n{summary['commands']} commands in {summary['elapsed']:.2f}s "
+          f"({summary['commands_per_second']:.0f}/s) - {summary['succeeded']} succeeded, {summary['failed']} failed",
+          file=sys.stderr)
+    for name, stats in summary["latency"].items():
+        print(f"  {name:<24} {stats['count']:>7}  mean {stats['mean_ms']:.2f}ms  "
+              f"p50 {stats['p50_ms']:.2f}ms  p95 {stats['p95_ms']:.2f}ms  p99 {stats['p99_ms']:.2f}ms",
+              file=sys.stderr)
+
+
+def read_changes(service, args):
+    from src.services.outbox_consumer import OutboxConsumer
+    
+    consumer = OutboxConsumer(service.storage, args.consumer, batch_size=args.batch_size)
+    
+    def emit(events):
+        for event in events:
+            print(json.dumps(event))
+    
+    try:
+        if args.peek:
+            emit(consumer.poll())
+            return
+        total = consumer.drain(emit)
+        print(f"{total} changes for {args.consumer}, now at position {consumer.position}", file=sys.stderr)
+    except Exception as error:
+        print(f"✗ Error: {error}", file=sys.stderr)
+
+
+def chain_report(args):
+    from src.repositories.sharded_storage import ShardedSQLiteStorage
+    from src.services.report_service import ChainReportService
+    
+    try:
+        summary = ChainReportService(ShardedSQLiteStorage(args.shard_dir)).occupancy_summary(args.start, args.end)
+    except Exception as error:
         print(f"✗ Error: {error}")
+        return
+    
+    print(f"\n{'Property':<20} {'Rooms':>6} {'Sold':>7} {'Occupancy':>10} {'ADR':>9} {'RevPAR':>9} {'Revenue':>11}")
+    rows = list(summary["by_property"].items()) + [("CHAIN", summary)]
+    for property_id, figures in rows:
+        print(f"{property_id:<20} {figures['rooms']:>6} {figures['nights_sold']:>7} {figures['occupancy_rate']:>10.1%} "
+              f"{figures['adr']:>9.2f} {figures['revpar']:>9.2f} {figures['room_revenue']:>11.2f}")
+
+
+def bench_logging(args):
+    from src.utils.logging_benchmark import measure_logging_overhead
+    
+    result = measure_logging_overhead(args.calls)
+    print(f"Per-call cost over {result['calls']} calls:")
+    print(f"  DEBUG line, level INFO, %-style     {result['disabled_ns']:>8.0f} ns")
+    print(f"  DEBUG line, level INFO, f-string    {result['disabled_fstring_ns']:>8.0f} ns")
+    print(f"  INFO line, written synchronously    {result['synchronous_ns']:>8.0f} ns")
+    print(f"  INFO line, queued to listener       {result['queued_ns']:>8.0f} ns "
+          f"({result['queued_total_ns']:.0f} ns including the listener's writes)")
+
+
+def serve_api(service, args):
+    import asyncio
+    from src.api import HotelApiServer
+    
+    server = HotelApiServer(service, host=args.host, port=args.port, workers=args.workers)
+    print(f"Serving the hotel API on http://{args.host}:{args.port} (Ctrl+C to stop)")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print(f"\nStopped after {server.requests} requests.")
+
+
+def load_test_api(service, args):
+    import asyncio
+    from src.api import HotelApiServer
+    from src.api.load_test import LoadTestClient
+    
+    # Without --port the test runs against a server started in this process
+    server = None
+    port = args.port
+    if port is None:
+        server = HotelApiServer(service, host=args.host, port=0, workers=args.workers).start_in_thread()
+        port = server.port
+    
+    client = LoadTestClient(args.host, port, path=args.path, pipeline=args.pipeline)
+    try:
+        result = asyncio.run(client.run(requests=args.requests, connections=args.connections))
+    finally:
+        if server is not None:
+            server.stop_thread()
+    
+    print(f"{result['requests']} requests to {args.path} in {result['elapsed']:.2f}s "
+          f"({result['requests_per_second']:.0f} req/s) over {args.connections} connections, "
+          f"pipeline depth {args.pipeline}")
+    print(f"  latency p50 {result['p50_ms']:.2f}ms  p95 {result['p95_ms']:.2f}ms  p99 {result['p99_ms']:.2f}ms")
+    print(f"  error responses: {result['failed']}, connection errors: {result['connection_errors']}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Hotel Reservation System")
+    parser.add_argument("--log-level", help="root level and per-logger levels, e.g. INFO,src.repositories=DEBUG "
+                                            "(default: $HOTEL_LOG_LEVEL or INFO)")
+    parser.add_argument("--metrics", metavar="PATH",
+                        help="time service and storage calls; print a summary and write Prometheus text to PATH "
+                             "(- for the summary only)")
+    parser.add_argument("--slow-query-ms", type=float,
+                        help="log SQLite statements slower than this with their query plan (default 100) "
+                             "and print the statements with the most total time on exit")
+    parser.add_argument("--profile", metavar="PATH",
+                        help="run each command or service call under cProfile and tracemalloc and write the "
+                             "per-operation hot spots to PATH (- for stderr)")
+    parser.add_argument("--property", help="work on this property's own database (see --shard-dir)")
+    parser.add_argument("--shard-dir", default="src/data/properties", help="directory holding one database per property")
+    commands = parser.add_subparsers(dest="command", help="run a one-shot command instead of the interactive menu")
+    
+    commands.add_parser("rebuild-summary", help="recompute the daily summary table")
+    
+    export_parser = commands.add_parser("export", help="stream a collection to CSV or JSON Lines (.gz to compress)")
+    export_parser.add_argument("collection", choices=["rooms", "guests", "reservations", "payments", "daily_summary"])
+    export_parser.add_argument("path", help="output file, e.g. payments.csv or reservations.jsonl.gz")
+    export_parser.add_argument("--fields", help="comma-separated columns to export")
+    export_parser.add_argument("--start", help="first date to include (YYYY-MM-DD)")
+    export_parser.add_argument("--end", help="first date to exclude (YYYY-MM-DD)")
+    export_parser.add_argument("--date-field", help="column the date range applies to")
+    
+    import_parser = commands.add_parser("import", help="bulk-load a CSV or JSON Lines file (.gz accepted)")
+    import_parser.add_argument("collection", choices=["rooms", "guests", "reservations"])
+    import_parser.add_argument("path", help="input file, e.g. guests.csv or reservations.jsonl.gz")
+    import_parser.add_argument("--batch-size", type=int, default=1000, help="rows per transaction")
+    import_parser.add_argument("--checkpoint", help="file recording progress, so a rerun resumes where it stopped")
+    
+    dedup_parser = commands.add_parser("dedup-guests", help="find (and optionally merge) duplicate guests")
+    dedup_parser.add_argument("--merge", action="store_true", help="merge each group into its suggested survivor")
+    dedup_parser.add_argument("--max-block-size", type=int, default=50,
+                              help="skip name/phone groups larger than this as too generic")
+    
+    run_parser = commands.add_parser("run", help="execute JSON Lines commands without the menus")
+    run_parser.add_argument("path", help="commands file, or - for standard input")
+    run_parser.add_argument("--group-size", type=int, default=500,
+                            help="most consecutive writes committed in one transaction")
+    
+    changes_parser = commands.add_parser("changes", help="print outbox changes a consumer hasn't seen yet (JSON Lines)")
+    changes_parser.add_argument("consumer", help="consumer name, e.g. housekeeping; its offset is saved")
+    changes_parser.add_argument("--batch-size", type=int, default=100, help="events read per query")
+    changes_parser.add_argument("--peek", action="store_true", help="print the next batch without moving the offset")
+    
+    chain_parser = commands.add_parser("chain-report", help="occupancy, ADR and RevPAR for every property in --shard-dir")
+    chain_parser.add_argument("start", help="first night to include (YYYY-MM-DD)")
+    chain_parser.add_argument("end", help="first night to exclude (YYYY-MM-DD)")
+    
+    bench_log_parser = commands.add_parser("bench-logging", help="measure the per-call cost of logging on and off")
+    bench_log_parser.add_argument("--calls", type=int, default=100000)
+    
+    serve_parser = commands.add_parser("serve", help="run the HTTP/JSON API for the booking website")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8080)
+    serve_parser.add_argument("--workers", type=int, default=8, help="threads running storage reads")
+    
+    load_parser = commands.add_parser("loadtest", help="measure API requests per second")
+    load_parser.add_argument("--host", default="127.0.0.1")
+    load_parser.add_argument("--port", type=int, help="running server to test; omit to start one in-process")
+    load_parser.add_argument("--path", default="/rooms/available", help="GET path to request")
+    load_parser.add_argument("--requests", type=int, default=10000)
+    load_parser.add_argument("--connections", type=int, default=16)
+    load_parser.add_argument("--pipeline", type=int, default=1, help="requests sent per connection before reading")
+    load_parser.add_argument("--workers", type=int, default=8, help="threads running storage reads (in-process server)")
+    return parser.parse_args(argv)
 
 
 # GRASP – Controller: Main function coordinates entire application flow
 # SOLID – DIP: Main depends on service abstraction
 def main():
-    setup_logging()
+    args = parse_args()
+    try:
+        level, module_levels = parse_log_levels(args.log_level) if args.log_level else (None, None)
+    except ValueError as error:
+        print(f"✗ Error: {error}", file=sys.stderr)
+        return
+    setup_logging(level, module_levels)
     logger = get_logger(__name__)
     
     logger.info("="*60)
     logger.info("Hotel Reservation System starting up...")
     logger.info("="*60)
     
+    if args.command == "chain-report":
+        chain_report(args)
+        return
+    if args.command == "bench-logging":
+        bench_logging(args)
+        return
+    
     # GRASP – Creator: Main creates service instance
-    service = ReservationService()
+    if args.property:
+        from src.repositories.sharded_storage import ShardedSQLiteStorage
+        service = ReservationService(ShardedSQLiteStorage(args.shard_dir).shard(args.property))
+    else:
+        service = ReservationService()
+    slow_query_log = getattr(service.storage, "slow_query_log", None)
+    if args.slow_query_ms is not None and slow_query_log is not None:
+        slow_query_log.threshold = args.slow_query_ms / 1000
+    if args.metrics:
+        from src.utils.instrumentation import instrument
+        service = instrument(service)
+    profiler = None
+    if args.profile:
+        from src.utils.profiling import ProfiledService, Profiler
+        profiler = Profiler()
+        service = ProfiledService(service, profiler)
+    
+    try:
+        if not args.command:
+            run_menu(service, logger)
+        elif profiler is None or args.command in PER_CALL_PROFILED_COMMANDS:
+            run_command(service, args)
+        else:
+            # A one-shot command is profiled as a whole, including the service calls it makes
+            with profiler.profile(args.command):
+                run_command(service, args)
+    finally:
+        if args.metrics:
+            write_metrics(args.metrics)
+        if profiler is not None:
+            write_profile(profiler, args.profile)
+        if args.slow_query_ms is not None and slow_query_log is not None:
+            print_slow_queries(slow_query_log)
+
+
+def run_command(service, args):
+    if args.command == "rebuild-summary":
+        rebuild_summary(service)
+    elif args.command == "export":
+        export_collection(service, args)
+    elif args.command == "import":
+        import_collection(service, args)
+    elif args.command == "dedup-guests":
+        dedup_guests(service, args)
+    elif args.command == "run":
+        run_commands(service, args)
+    elif args.command == "changes":
+        read_changes(service, args)
+    elif args.command == "serve":
+        serve_api(service, args)
+    elif args.command == "loadtest":
+        load_test_api(service, args)
+
+
+def write_metrics(path):
+    """Per-operation summary on stderr and, unless path is "-", the Prometheus dump in path."""
+    from src.utils.metrics import METRICS
     
+    rows = METRICS.snapshot()
+    print(f"\n{'Operation':<44} {'Calls':>7} {'Total ms':>9} {'p50 ms':>7} {'p99 ms':>7} {'Rows':>7} {'Bytes':>9}",
+          file=sys.stderr)
+    for row in rows[:25]:
+        name = f"{row['layer']}.{row['operation']}" + (f"[{row['collection']}]" if row["collection"] else "")
+        print(f"{name:<44} {row['calls']:>7} {row['total_ms']:>9.1f} {row['p50_ms']:>7.2f} {row['p99_ms']:>7.2f} "
+              f"{row['rows_read'] + row['rows_written']:>7} {row['bytes']:>9}", file=sys.stderr)
+    if path != "-":
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(METRICS.to_prometheus())
+        print(f"Metrics written to {path}", file=sys.stderr)
+
+
+def write_profile(profiler, path):
+    """The per-operation profile report on stderr ("-") or in path."""
+    profiler.stop()
+    report = profiler.format_report()
+    if path == "-":
+        print("\n" + report, file=sys.stderr)
+        return
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(report)
+    print(f"Profile written to {path}", file=sys.stderr)
+
+
+def print_slow_queries(slow_query_log, limit=15):
+    """The statements with the most total time, their plans, and any that ran over the threshold."""
+    print(f"\n{'Calls':>7} {'Total ms':>9} {'Max ms':>8} {'Slow':>5}  Statement", file=sys.stderr)
+    for row in slow_query_log.report(limit):
+        print(f"{row['calls']:>7} {row['total_ms']:>9.1f} {row['max_ms']:>8.1f} {row['slow_calls']:>5}  {row['sql'][:100]}",
+              file=sys.stderr)
+        if row["plan"]:
+            flag = f"  <- full scan of {', '.join(row['full_scans'])}" if row["full_scans"] else ""
+            print(f"{'':>33}plan: {'; '.join(row['plan'])}{flag}", file=sys.stderr)
+
+
+def run_menu(service, logger):
     while True:
         print_menu()
         choice = input("\nEnter your choice: ")
         
-        logger.debug(f"User selected option: {choice}")
+        logger.debug("User selected option: %s", choice)
         
         if choice == "1":
             add_room(service)
@@ -626,12 +992,14 @@ def main():
             view_payments(service)
         elif choice == "16":
             delete_payment(service)
+        elif choice == "17":
+            search_guests(service)
         elif choice == "0":
             logger.info("User exiting system")
             print("\nThank you for using Hotel Reservation System!")
             break
         else:
-            logger.warning(f"Invalid choice: {choice}")
+            logger.warning("Invalid choice: %s", choice)
             print("Invalid choice. Please try again.")
 
 
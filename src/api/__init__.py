@@ -0,0 +1,5 @@
+"""HTTP/JSON API over ReservationService; the load-test client lives in load_test."""
+
+from .http_server import HotelApiServer, ApiError
+
+__all__ = ["HotelApiServer", "ApiError"]
@@ -0,0 +1,469 @@
+import asyncio
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import urlsplit, parse_qs
+from ..services.command_runner import to_plain
+from ..utils.logging_config import get_logger
+from ..utils.metrics import METRICS
+
+DEFAULT_WORKERS = 8
+
+# Idle time a keep-alive connection may wait for its next request
+DEFAULT_KEEPALIVE_TIMEOUT = 15.0
+
+# Requests read ahead on one connection before the server stops reading from it
+MAX_PIPELINE_DEPTH = 32
+
+# Largest request head (request line and headers) and body the server accepts
+MAX_HEAD_BYTES = 64 * 1024
+MAX_BODY_BYTES = 1024 * 1024
+
+# Requests with other methods change data, so they run one at a time on the writer thread
+SAFE_METHODS = ("GET", "HEAD")
+
+# Method, path pattern and handler name; the first matching pattern wins
+ROUTES = [
+    ("GET", r"/health", "health"),
+    ("GET", r"/metrics", "metrics"),
+    ("GET", r"/rooms", "list_rooms"),
+    ("POST", r"/rooms", "add_room"),
+    ("GET", r"/rooms/available", "available_rooms"),
+    ("GET", r"/rooms/([^/]+)", "get_room"),
+    ("PATCH", r"/rooms/([^/]+)", "update_room"),
+    ("DELETE", r"/rooms/([^/]+)", "delete_room"),
+    ("GET", r"/guests", "list_guests"),
+    ("POST", r"/guests", "add_guest"),
+    ("GET", r"/guests/search", "search_guests"),
+    ("GET", r"/guests/([^/]+)", "get_guest"),
+    ("PATCH", r"/guests/([^/]+)", "update_guest"),
+    ("DELETE", r"/guests/([^/]+)", "delete_guest"),
+    ("GET", r"/reservations", "list_reservations"),
+    ("POST", r"/reservations", "create_reservation"),
+    ("GET", r"/reservations/([^/]+)", "get_reservation"),
+    ("PATCH", r"/reservations/([^/]+)", "update_reservation"),
+    ("DELETE", r"/reservations/([^/]+)", "delete_reservation"),
+    ("POST", r"/reservations/([^/]+)/cancel", "cancel_reservation"),
+    ("GET", r"/reservations/([^/]+)/balance", "get_balance"),
+    ("GET", r"/payments", "list_payments"),
+    ("POST", r"/payments", "process_payment"),
+    ("GET", r"/payments/([^/]+)", "get_payment"),
+    ("DELETE", r"/payments/([^/]+)", "delete_payment"),
+]
+
+
+class ApiError(Exception):
+    """Raised for a request that is answered with an error status instead of a result."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def query_value(query, name, convert=str, default=None):
+    values = query.get(name)
+    if not values:
+        return default
+    try:
+        return convert(values[-1])
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"Invalid {name}: {values[-1]}")
+
+
+def body_fields(body, required=(), optional=()):
+    """The request body as keyword arguments, after checking for missing and unknown fields."""
+    if not isinstance(body, dict):
+        raise ApiError(HTTPStatus.BAD_REQUEST, "Request body must be a JSON object")
+    missing = [field for field in required if field not in body]
+    if missing:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"Missing fields: {', '.join(missing)}")
+    unknown = [field for field in body if field not in required and field not in optional]
+    if unknown:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"Unknown fields: {', '.join(unknown)}")
+    return dict(body)
+
+
+def payment_json(payment):
+    data = payment.to_dict()
+    if data.get("card_number"):
+        data["card_number"] = "**** " + data["card_number"][-4:]
+    return data
+
+
+def encode_response(status, payload, keep_alive):
+    """JSON for results and errors; a str payload (the metrics dump) is sent as plain text."""
+    status = HTTPStatus(status)
+    if isinstance(payload, str):
+        body, content_type = payload.encode(), "text/plain; version=0.0.4"
+    else:
+        body, content_type = json.dumps(payload, default=str).encode(), "application/json"
+    if METRICS.enabled:
+        METRICS.add_bytes("http", "response", len(body))
+    head = (
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode() + body
+
+
+# GRASP – Controller: Exposes ReservationService to the booking website over HTTP
+# SOLID – SRP: Only parses HTTP, routes requests and encodes JSON; business rules stay in the service
+class HotelApiServer:
+    """
+    Asyncio HTTP/1.1 server speaking JSON.
+    Connections are kept alive and may pipeline requests: reads that follow each other on a
+    connection run concurrently, while a write waits for everything before it and everything after
+    it waits for the write, so a client always sees its own changes. Responses go out in request order.
+    Storage work runs on a bounded thread pool for reads and a single writer thread, so the event
+    loop never blocks on SQLite and writes never race each other.
+    """
+
+    def __init__(self, service, host="127.0.0.1", port=8080, workers=DEFAULT_WORKERS,
+                 keepalive_timeout=DEFAULT_KEEPALIVE_TIMEOUT, max_pipeline=MAX_PIPELINE_DEPTH):
+        self.service = service
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.keepalive_timeout = keepalive_timeout
+        self.max_pipeline = max_pipeline
+        self.logger = get_logger(self.__class__.__name__)
+        self.routes = [(method, re.compile(f"^{pattern}$"), name) for method, pattern, name in ROUTES]
+
+        self.requests = 0
+        self.connections = 0
+        self._server = None
+        self._connection_tasks = set()
+        self._read_executor = None
+        self._write_executor = None
+        # Caps jobs queued on the executors so overload pushes back on clients instead of piling up
+        self._job_slots = None
+        self._thread = None
+        self._loop = None
+
+    async def start(self):
+        self._read_executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="api-read")
+        self._write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="api-write")
+        self._job_slots = asyncio.Semaphore(self.workers * 4)
+        self._server = await asyncio.start_server(self._handle, self.host, self.port, limit=MAX_HEAD_BYTES)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self.logger.info("Hotel API listening on http://%s:%s", self.host, self.port)
+        return self
+
+    async def stop(self):
+        if self._server is None:
+            return
+        self._server.close()
+        # Idle keep-alive connections would otherwise hold the server open until they time out
+        for task in list(self._connection_tasks):
+            task.cancel()
+        await asyncio.gather(*self._connection_tasks, return_exceptions=True)
+        await self._server.wait_closed()
+        self._server = None
+        self._read_executor.shutdown()
+        self._write_executor.shutdown()
+        self.logger.info("Hotel API stopped after %s requests on %s connections", self.requests, self.connections)
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    # ---- Connections ----
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        task = asyncio.current_task()
+        self._connection_tasks.add(task)
+        responses = asyncio.Queue(maxsize=self.max_pipeline)
+        sender = asyncio.create_task(self._send_responses(responses, writer))
+        # Reads since the last write, and the last write; used to order pipelined requests
+        reads = []
+        last_write = None
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), self.keepalive_timeout)
+                except ApiError as error:
+                    await responses.put(self._finished(error.status, {"error": str(error)}, False))
+                    break
+                if request is None:
+                    break
+                method, target, body, keep_alive = request
+                self.requests += 1
+
+                write = method not in SAFE_METHODS
+                waits = ([last_write] if last_write else []) + (reads if write else [])
+                job = asyncio.create_task(self._respond(method, target, body, keep_alive, waits))
+                if write:
+                    last_write, reads = job, []
+                else:
+                    reads = [read for read in reads if not read.done()] + [job]
+                await responses.put(job)
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except asyncio.CancelledError:
+            # Server shutting down with the client still connected
+            sender.cancel()
+        finally:
+            if not sender.cancelled():
+                await responses.put(None)
+            await asyncio.gather(sender, return_exceptions=True)
+            writer.close()
+            self._connection_tasks.discard(task)
+
+    async def _send_responses(self, responses, writer):
+        """Write responses in request order, flushing once the pipeline has drained."""
+        broken = False
+        while True:
+            job = await responses.get()
+            if job is None:
+                return
+            response = await job
+            if broken:
+                continue
+            try:
+                writer.write(response)
+                if responses.empty():
+                    await writer.drain()
+            except ConnectionError:
+                # Keep consuming so the reader never blocks on a full queue
+                broken = True
+
+    @staticmethod
+    def _finished(status, payload, keep_alive):
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(encode_response(status, payload, keep_alive))
+        return future
+
+    async def _read_request(self, reader):
+        """(method, target, body, keep_alive) for the next request, or None at end of stream."""
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError as error:
+            if error.partial.strip():
+                raise ApiError(HTTPStatus.BAD_REQUEST, "Incomplete request")
+            return None
+        except asyncio.LimitOverrunError:
+            raise ApiError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Request head too large")
+
+        lines = head.decode("latin-1").split("\r\n")
+        parts = lines[0].split(" ")
+        if len(parts) != 3 or not parts[2].startswith("HTTP/1."):
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+        method, target, version = parts
+
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+        if "transfer-encoding" in headers:
+            raise ApiError(HTTPStatus.NOT_IMPLEMENTED, "Chunked request bodies are not supported")
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise ApiError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+        body = await reader.readexactly(length) if length else b""
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        return method.upper(), target, body, keep_alive
+
+    # ---- Dispatch ----
+
+    def _route(self, method, path):
+        allowed = False
+        for route_method, pattern, name in self.routes:
+            match = pattern.match(path)
+            if not match:
+                continue
+            if route_method == method:
+                return getattr(self, name), match.groups()
+            allowed = True
+        if allowed:
+            raise ApiError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} not allowed on {path}")
+        raise ApiError(HTTPStatus.NOT_FOUND, f"No route for {path}")
+
+    async def _respond(self, method, target, body, keep_alive, waits):
+        started = time.perf_counter()
+        route = "unmatched"
+        if waits:
+            await asyncio.wait(waits)
+        try:
+            url = urlsplit(target)
+            handler, path_args = self._route(method, url.path.rstrip("/") or "/")
+            route = handler.__name__
+            query = parse_qs(url.query)
+            try:
+                payload = json.loads(body) if body else {}
+            except ValueError:
+                raise ApiError(HTTPStatus.BAD_REQUEST, "Request body is not valid JSON")
+
+            executor = self._read_executor if method in SAFE_METHODS else self._write_executor
+            async with self._job_slots:
+                status, result = await asyncio.get_running_loop().run_in_executor(
+                    executor, lambda: handler(query, payload, *path_args)
+                )
+        except ApiError as error:
+            status, result = error.status, {"error": str(error)}
+        except ValueError as error:
+            # Service validation errors; "Room not found" style messages become 404
+            message = str(error)
+            status = HTTPStatus.NOT_FOUND if "not found" in message.lower() else HTTPStatus.BAD_REQUEST
+            result = {"error": message}
+        except Exception as error:
+            self.logger.error("%s %s failed: %s", method, target, error, exc_info=True)
+            status, result = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Internal server error"}
+
+        elapsed = time.perf_counter() - started
+        if METRICS.enabled:
+            METRICS.record("http", route, elapsed, error=status >= HTTPStatus.INTERNAL_SERVER_ERROR)
+        self.logger.debug("%s %s -> %s in %.1fms", method, target, int(status), elapsed * 1000)
+        return encode_response(status, result, keep_alive)
+
+    # ---- Handlers (run on the executors) ----
+
+    def health(self, query, body):
+        return HTTPStatus.OK, {"status": "ok"}
+
+    def metrics(self, query, body):
+        """Prometheus text dump of the process metrics (empty unless started with --metrics)."""
+        return HTTPStatus.OK, METRICS.to_prometheus()
+
+    @staticmethod
+    def _fields(query):
+        # Unknown names are rejected by the storage with a ValueError, answered as 400
+        fields = [field.strip() for field in (query_value(query, "fields") or "").split(",") if field.strip()]
+        return fields or None
+
+    @staticmethod
+    def _found(item, kind, item_id, serialize=to_plain):
+        if item is None:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"{kind} not found: {item_id}")
+        return HTTPStatus.OK, serialize(item)
+
+    def list_rooms(self, query, body):
+        return HTTPStatus.OK, to_plain(self.service.get_all_rooms(self._fields(query)))
+
+    def add_room(self, query, body):
+        fields = body_fields(body, ("number", "room_type", "price_per_night"), ("capacity",))
+        return HTTPStatus.CREATED, to_plain(self.service.add_room(**fields))
+
+    def available_rooms(self, query, body):
+        rooms = self.service.search_available_rooms(
+            room_type=query_value(query, "room_type"),
+            min_capacity=query_value(query, "min_capacity", int),
+            max_price=query_value(query, "max_price", float)
+        )
+        return HTTPStatus.OK, to_plain(rooms)
+
+    def get_room(self, query, body, room_id):
+        return self._found(self.service.get_room(room_id), "Room", room_id)
+
+    def update_room(self, query, body, room_id):
+        fields = body_fields(body, optional=("number", "room_type", "price_per_night", "capacity", "is_available"))
+        return HTTPStatus.OK, to_plain(self.service.update_room(room_id, **fields))
+
+    def delete_room(self, query, body, room_id):
+        self.service.delete_room(room_id)
+        return HTTPStatus.OK, {"deleted": room_id}
+
+    def list_guests(self, query, body):
+        return HTTPStatus.OK, to_plain(self.service.get_all_guests(self._fields(query)))
+
+    def add_guest(self, query, body):
+        fields = body_fields(body, ("name", "email", "phone"))
+        return HTTPStatus.CREATED, to_plain(self.service.add_guest(**fields))
+
+    def search_guests(self, query, body):
+        text = query_value(query, "q", default="")
+        return HTTPStatus.OK, to_plain(self.service.search_guests(text, limit=query_value(query, "limit", int, 20)))
+
+    def get_guest(self, query, body, guest_id):
+        return self._found(self.service.get_guest(guest_id), "Guest", guest_id)
+
+    def update_guest(self, query, body, guest_id):
+        fields = body_fields(body, optional=("name", "email", "phone"))
+        return HTTPStatus.OK, to_plain(self.service.update_guest(guest_id, **fields))
+
+    def delete_guest(self, query, body, guest_id):
+        self.service.delete_guest(guest_id)
+        return HTTPStatus.OK, {"deleted": guest_id}
+
+    def list_reservations(self, query, body):
+        return HTTPStatus.OK, self.service.get_reservation_details()
+
+    def create_reservation(self, query, body):
+        fields = body_fields(body, ("guest_id", "room_id", "check_in_date", "check_out_date"))
+        return HTTPStatus.CREATED, to_plain(self.service.create_reservation(**fields))
+
+    def get_reservation(self, query, body, reservation_id):
+        details = self.service.get_reservation_details(reservation_id)
+        return self._found(details[0] if details else None, "Reservation", reservation_id)
+
+    def update_reservation(self, query, body, reservation_id):
+        fields = body_fields(body, optional=("check_in_date", "check_out_date"))
+        return HTTPStatus.OK, to_plain(self.service.update_reservation(reservation_id, **fields))
+
+    def delete_reservation(self, query, body, reservation_id):
+        self.service.delete_reservation(reservation_id)
+        return HTTPStatus.OK, {"deleted": reservation_id}
+
+    def cancel_reservation(self, query, body, reservation_id):
+        return HTTPStatus.OK, to_plain(self.service.cancel_reservation(reservation_id))
+
+    def get_balance(self, query, body, reservation_id):
+        return self._found(self.service.get_balance(reservation_id), "Reservation", reservation_id)
+
+    def list_payments(self, query, body):
+        return HTTPStatus.OK, [payment_json(payment) for payment in self.service.get_all_payments()]
+
+    def process_payment(self, query, body):
+        fields = body_fields(
+            body, ("reservation_id", "amount", "payment_type"), ("card_number", "idempotency_key")
+        )
+        return HTTPStatus.CREATED, payment_json(self.service.process_payment(**fields))
+
+    def get_payment(self, query, body, payment_id):
+        return self._found(self.service.get_payment(payment_id), "Payment", payment_id, payment_json)
+
+    def delete_payment(self, query, body, payment_id):
+        self.service.delete_payment(payment_id)
+        return HTTPStatus.OK, {"deleted": payment_id}
+
+    # CUPID – Composable: Runs the server on its own loop for synchronous callers and tests
+    def start_in_thread(self):
+        self._loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self.start())
+            started.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        started.wait()
+        return self
+
+    def stop_thread(self):
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
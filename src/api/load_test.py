@@ -0,0 +1,76 @@
+import asyncio
+import time
+from ..services.command_runner import percentile
+
+
+class LoadTestClient:
+    """
+    Minimal HTTP/1.1 client for benchmarking the API: each connection is kept alive and
+    sends its requests in pipelined windows of `pipeline` before reading the responses.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8080, path="/rooms/available", pipeline=1):
+        self.host = host
+        self.port = port
+        self.path = path
+        self.pipeline = max(1, pipeline)
+        self.request = f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode()
+
+    @staticmethod
+    async def read_response(reader):
+        """Status code of the next response; the body is read and discarded."""
+        head = await reader.readuntil(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        status = int(lines[0].split(" ")[1])
+        length = 0
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        if length:
+            await reader.readexactly(length)
+        return status
+
+    async def run_connection(self, count, latencies, failures):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            sent = 0
+            while sent < count:
+                window = min(self.pipeline, count - sent)
+                started = time.perf_counter()
+                writer.write(self.request * window)
+                await writer.drain()
+                for _ in range(window):
+                    status = await self.read_response(reader)
+                    latencies.append(time.perf_counter() - started)
+                    if status >= 400:
+                        failures.append(status)
+                sent += window
+        finally:
+            writer.close()
+
+    async def run(self, requests=10000, connections=16):
+        """Spread requests over keep-alive connections; returns throughput and latency percentiles."""
+        latencies = []
+        failures = []
+        per_connection = [requests // connections + (1 if index < requests % connections else 0)
+                          for index in range(connections)]
+
+        started = time.perf_counter()
+        outcomes = await asyncio.gather(
+            *(self.run_connection(count, latencies, failures) for count in per_connection if count),
+            return_exceptions=True
+        )
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        return {
+            "requests": len(latencies),
+            "failed": len(failures),
+            "connection_errors": sum(1 for outcome in outcomes if isinstance(outcome, Exception)),
+            "elapsed": elapsed,
+            "requests_per_second": len(latencies) / elapsed if elapsed > 0 else 0.0,
+            "p50_ms": percentile(latencies, 0.50) * 1000,
+            "p95_ms": percentile(latencies, 0.95) * 1000,
+            "p99_ms": percentile(latencies, 0.99) * 1000,
+        }
@@ -11,25 +11,25 @@ class PaymentFactory:
     # SOLID – SRP: Static method only creates payment objects
     # OOP – Polymorphism: Returns different subclasses based on type
     @staticmethod
-    def create_payment(payment_type, reservation_id, amount, card_number=""):
-        PaymentFactory.logger.info(f"Creating {payment_type} payment of ${amount:.2f}")
+    def create_payment(payment_type, reservation_id, amount, card_number="", gateway=None):
+        PaymentFactory.logger.info("Creating %s payment of $%.2f", payment_type, amount)
         
         try:
             # SOLID – OCP: Adding new payment types requires only extending, not modifying
             if payment_type.lower() == "cash":
                 payment = CashPayment(reservation_id, amount)
-                PaymentFactory.logger.info(f"Cash payment created: {payment.id}")
+                PaymentFactory.logger.info("Cash payment created: %s", payment.id)
                 return payment
             elif payment_type.lower() == "card":
-                payment = CardPayment(reservation_id, amount, card_number)
-                PaymentFactory.logger.info(f"Card payment created: {payment.id}")
+                payment = CardPayment(reservation_id, amount, card_number, gateway)
+                PaymentFactory.logger.info("Card payment created: %s", payment.id)
                 return payment
             else:
-                PaymentFactory.logger.warning(f"Unknown payment type '{payment_type}', using generic")
+                PaymentFactory.logger.warning("Unknown payment type '%s', using generic", payment_type)
                 payment = Payment(reservation_id, amount)
-                PaymentFactory.logger.info(f"Generic payment created: {payment.id}")
+                PaymentFactory.logger.info("Generic payment created: %s", payment.id)
                 return payment
         except Exception as error:
-            PaymentFactory.logger.error(f"Payment creation failed: {error}", exc_info=True)
+            PaymentFactory.logger.error("Payment creation failed: %s", error, exc_info=True)
             raise
 
@@ -0,0 +1,5 @@
+"""Payment gateway clients; the local fake gateway lives in fake_gateway."""
+
+from .payment_gateway import PaymentGateway, AsyncGatewayClient, GatewayError
+
+__all__ = ["PaymentGateway", "AsyncGatewayClient", "GatewayError"]
@@ -0,0 +1,186 @@
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+import uuid
+from .payment_gateway import AsyncGatewayClient
+from ..utils.logging_config import get_logger
+
+
+# GRASP – Pure Fabrication: Local stand-in for the card processor, used offline
+# SOLID – SRP: Only simulates latency, outages and declines
+class FakeGatewayServer:
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.01, failure_rate=0.0,
+                 decline_rate=0.0, seed=None):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.decline_rate = decline_rate
+        self.random = random.Random(seed)
+        self.logger = get_logger(self.__class__.__name__)
+
+        self.requests = 0
+        self.connections = 0
+        # Cards actually charged, not counting replayed answers
+        self.charges = 0
+        self._responses = {}
+        self._server = None
+        self._thread = None
+        self._loop = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self.logger.info("Fake gateway listening on %s:%s", self.host, self.port)
+        return self
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                request = json.loads(line)
+                self.requests += 1
+                response = await self._respond(request)
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, json.JSONDecodeError) as error:
+            self.logger.debug("Fake gateway connection dropped: %r", error)
+        except asyncio.CancelledError:
+            # Server shutting down with the client still connected
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, request):
+        # A repeated idempotency key gets the first answer again, even while that charge is still running
+        key = request.get("idempotency_key")
+        if key is not None and key in self._responses:
+            return await asyncio.shield(self._responses[key])
+
+        pending = None
+        if key is not None:
+            pending = self._responses[key] = asyncio.get_running_loop().create_future()
+        try:
+            response = await self._charge(request)
+        except BaseException:
+            if pending is not None:
+                del self._responses[key]
+                pending.cancel()
+            raise
+        if pending is not None:
+            if response.get("retryable"):
+                # Nothing was charged, so the retry is a fresh attempt
+                del self._responses[key]
+            pending.set_result(response)
+        return response
+
+    async def _charge(self, request):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        roll = self.random.random()
+        if roll < self.failure_rate:
+            return {"approved": False, "retryable": True, "error": "Gateway temporarily unavailable"}
+        if roll < self.failure_rate + self.decline_rate:
+            return {"approved": False, "retryable": False, "error": "Card declined"}
+        self.charges += 1
+        return {
+            "approved": True,
+            "transaction_id": uuid.uuid4().hex,
+            "reference": request.get("reference"),
+        }
+
+    # CUPID – Composable: Runs the server on its own loop for synchronous callers and tests
+    def start_in_thread(self):
+        self._loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self.start())
+            started.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        started.wait()
+        return self
+
+    def stop_thread(self):
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+
+
+async def measure_throughput(client, count=1000, amount=10.0):
+    """Fire count charges concurrently through client and report approvals per second."""
+    started = time.perf_counter()
+
+    async def one(index):
+        try:
+            response = await client.charge("4111111111111111", amount, f"bench-{index}")
+            return bool(response.get("approved"))
+        except Exception:
+            return None
+
+    outcomes = await asyncio.gather(*(one(i) for i in range(count)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": count,
+        "approved": sum(1 for outcome in outcomes if outcome is True),
+        "declined": sum(1 for outcome in outcomes if outcome is False),
+        "errors": sum(1 for outcome in outcomes if outcome is None),
+        "elapsed": elapsed,
+        "throughput": count / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+async def _benchmark(args):
+    server = await FakeGatewayServer(
+        latency=args.latency, failure_rate=args.failure_rate, decline_rate=args.decline_rate
+    ).start()
+    client = AsyncGatewayClient(
+        port=server.port, pool_size=args.pool_size, max_concurrency=args.concurrency
+    )
+    try:
+        return await measure_throughput(client, args.requests)
+    finally:
+        await client.close()
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure card gateway throughput against a local fake gateway")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--decline-rate", type=float, default=0.0)
+    parser.add_argument("--pool-size", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=50)
+    result = asyncio.run(_benchmark(parser.parse_args()))
+    print(
+        f"{result['requests']} requests in {result['elapsed']:.2f}s "
+        f"({result['throughput']:.1f} req/s) - approved {result['approved']}, "
+        f"declined {result['declined']}, errors {result['errors']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+import asyncio
+import json
+import threading
+from ..utils.logging_config import get_logger
+
+# Guards creating a gateway's background loop, which gateways don't set up in __init__
+_runner_lock = threading.Lock()
+
+
+class GatewayError(Exception):
+    """Raised when the payment gateway cannot be reached or keeps failing."""
+
+
+# OOP – Abstraction: Card payments talk to any gateway through this interface
+# SOLID – DIP: CardPayment depends on PaymentGateway, not on a network client
+class PaymentGateway:
+
+    async def charge(self, card_number, amount, reference):
+        raise NotImplementedError("Gateways must implement charge()")
+
+    # CUPID – Composable: Lets synchronous code (CLI, thread pools) use an async gateway
+    def charge_sync(self, card_number, amount, reference):
+        runner = getattr(self, "_runner", None)
+        if runner is None:
+            # Batch workers call this concurrently; they must all share one loop (and the pool bound to it)
+            with _runner_lock:
+                runner = getattr(self, "_runner", None)
+                if runner is None:
+                    runner = self._runner = _BackgroundLoop()
+        return runner.run(self.charge(card_number, amount, reference))
+
+    def close_sync(self):
+        with _runner_lock:
+            runner = getattr(self, "_runner", None)
+            self._runner = None
+        if runner is not None:
+            runner.run(self.close())
+            runner.stop()
+
+    async def close(self):
+        pass
+
+
+class _BackgroundLoop:
+    """Event loop running in a daemon thread so sync callers can share one async client."""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+    def run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
+# OOP – Inheritance: Concrete gateway speaking newline-delimited JSON over TCP
+# SOLID – SRP: Only handles transport concerns (pooling, timeouts, retries)
+class AsyncGatewayClient(PaymentGateway):
+    """
+    Asyncio client for a card gateway.
+    A client belongs to the event loop it is first used on; charge_sync() runs it
+    on a private background loop instead.
+    """
+
+    def __init__(self, host="127.0.0.1", port=9100, pool_size=10, timeout=5.0,
+                 max_concurrency=50, retries=3, backoff=0.05):
+        self.host = host
+        self.port = port
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.logger = get_logger(self.__class__.__name__)
+
+        self._idle = None
+        self._slots = None
+        self._semaphore = None
+        self._runner = None
+
+    def _ensure_pool(self):
+        if self._idle is None:
+            self._idle = asyncio.LifoQueue()
+            self._slots = asyncio.Semaphore(self.pool_size)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def _acquire(self):
+        # Reuse an idle connection, otherwise open one while the pool has room
+        await self._slots.acquire()
+        while not self._idle.empty():
+            reader, writer = self._idle.get_nowait()
+            if not writer.is_closing():
+                return reader, writer
+        try:
+            return await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port), self.timeout
+            )
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _release(self, connection, reusable):
+        reader, writer = connection
+        if reusable:
+            self._idle.put_nowait(connection)
+        else:
+            writer.close()
+        self._slots.release()
+
+    async def _send(self, request):
+        connection = await self._acquire()
+        reusable = False
+        try:
+            reader, writer = connection
+            writer.write(json.dumps(request).encode() + b"\n")
+            await writer.drain()
+            line = await asyncio.wait_for(reader.readline(), self.timeout)
+            if not line:
+                raise ConnectionError("Gateway closed the connection")
+            reusable = True
+            return json.loads(line)
+        finally:
+            self._release(connection, reusable)
+
+    async def charge(self, card_number, amount, reference):
+        self._ensure_pool()
+        # Every attempt carries the same key, so a retry after a timeout can't charge the card twice
+        request = {"reference": reference, "idempotency_key": reference, "card_number": card_number, "amount": amount}
+
+        async with self._semaphore:
+            last_error = None
+            for attempt in range(self.retries + 1):
+                if attempt:
+                    # Exponential backoff between attempts: backoff, 2*backoff, 4*backoff...
+                    await asyncio.sleep(self.backoff * (2 ** (attempt - 1)))
+                try:
+                    response = await self._send(request)
+                except (OSError, ConnectionError, asyncio.TimeoutError, ValueError) as error:
+                    last_error = error
+                    self.logger.warning("Gateway attempt %s for %s failed: %r", attempt + 1, reference, error)
+                    continue
+
+                if response.get("retryable"):
+                    last_error = GatewayError(response.get("error", "Gateway asked to retry"))
+                    self.logger.warning("Gateway attempt %s for %s asked to retry", attempt + 1, reference)
+                    continue
+                return response
+
+        self.logger.error("Gateway gave up on %s after %s attempts", reference, self.retries + 1)
+        raise GatewayError(f"Gateway unavailable: {last_error}")
+
+    async def close(self):
+        if self._idle is None:
+            return
+        while not self._idle.empty():
+            reader, writer = self._idle.get_nowait()
+            writer.close()
@@ -1,3 +1,4 @@
+from datetime import datetime
 from .base import BaseModel
 from ..utils.logging_config import get_logger
 
@@ -13,26 +14,29 @@ class Payment(BaseModel):
         self.amount = amount
         self.status = "pending"
         self.payment_type = "generic"
+        # Client-supplied key so retried submissions map back to this payment
+        self.idempotency_key = None
+        self.created_at = datetime.now().isoformat(timespec="seconds")
         self.logger = get_logger(self.__class__.__name__)
     
         if amount < 0:
-            self.logger.error(f"Invalid amount: ${amount}")
+            self.logger.error("Invalid amount: $%s", amount)
             raise ValueError("Payment amount cannot be negative")
         if amount == 0:
-            self.logger.error(f"Invalid amount: ${amount}")
+            self.logger.error("Invalid amount: $%s", amount)
             raise ValueError("Payment amount cannot be zero")
     
     # OOP – Polymorphism: Subclasses override this with specific payment logic
     # GRASP – Information Expert: Payment processes itself
     def process(self):
-        self.logger.info(f"Processing payment {self.id}: ${self.amount:.2f}")
+        self.logger.info("Processing payment %s: $%.2f", self.id, self.amount)
         try:
             self.status = "completed"
-            self.logger.info(f"Payment {self.id} completed")
+            self.logger.info("Payment %s completed", self.id)
             return True
         except Exception as error:
             self.status = "failed"
-            self.logger.error(f"Payment {self.id} failed: {error}", exc_info=True)
+            self.logger.error("Payment %s failed: %s", self.id, error, exc_info=True)
             return False
     
     def to_dict(self):
@@ -41,7 +45,9 @@ class Payment(BaseModel):
             "reservation_id": self.reservation_id,
             "amount": self.amount,
             "status": self.status,
-            "payment_type": self.payment_type
+            "payment_type": self.payment_type,
+            "idempotency_key": self.idempotency_key,
+            "created_at": self.created_at
         }
     
     @classmethod
@@ -67,6 +73,8 @@ class Payment(BaseModel):
         
         payment.id = data["id"]
         payment.status = data.get("status", "pending")
+        payment.idempotency_key = data.get("idempotency_key")
+        payment.created_at = data.get("created_at")
         return payment
     
     def __str__(self):
@@ -80,15 +88,15 @@ class CashPayment(Payment):
         self.payment_type = "cash"
     
     def process(self):
-        self.logger.info(f"💵 Processing cash payment {self.id}: ${self.amount:.2f}")
+        self.logger.info("💵 Processing cash payment %s: $%.2f", self.id, self.amount)
         try:
             print(f"Processing cash payment of ${self.amount}")
             self.status = "completed"
-            self.logger.info(f"✅ Cash payment {self.id} successful")
+            self.logger.info("✅ Cash payment %s successful", self.id)
             return True
         except Exception as error:
             self.status = "failed"
-            self.logger.error(f"❌ Cash payment {self.id} failed: {error}", exc_info=True)
+            self.logger.error("❌ Cash payment %s failed: %s", self.id, error, exc_info=True)
             return False
     
     def __str__(self):
@@ -97,7 +105,7 @@ class CashPayment(Payment):
 
 class CardPayment(Payment):
     
-    def __init__(self, reservation_id, amount, card_number=""):
+    def __init__(self, reservation_id, amount, card_number="", gateway=None):
         super().__init__(reservation_id, amount)
         self.payment_type = "card"
         
@@ -105,21 +113,60 @@ class CardPayment(Payment):
             raise ValueError("Card number must be at least 13 digits")
         
         self.card_number = card_number
+        # SOLID – DIP: Optional PaymentGateway; without one the card is accepted locally
+        self.gateway = gateway
+        self.transaction_id = None
+    
+    def gateway_reference(self):
+        """Key the gateway deduplicates on; every retry of one client submission sends the same one."""
+        return self.idempotency_key or self.id
+    
+    def _gateway_unreachable(self, error):
+        # The charge may have gone through before the timeout, so it isn't a decline
+        self.status = "unknown"
+        self.logger.error("❌ Card payment %s outcome unknown: %s", self.id, error, exc_info=True)
+        return False
+    
+    def _apply_gateway_response(self, response):
+        if response.get("approved"):
+            self.status = "completed"
+            self.transaction_id = response.get("transaction_id")
+            self.logger.info("✅ Card payment %s successful", self.id)
+            return True
+        self.status = "failed"
+        self.logger.warning("❌ Card payment %s declined: %s", self.id, response.get('error', 'unknown reason'))
+        return False
     
     def process(self):
         masked_card = f"****{self.card_number[-4:]}" if len(self.card_number) >= 4 else "XXXX"
-        self.logger.info(f"💳 Processing card payment {self.id}: ${self.amount:.2f} ({masked_card})")
+        self.logger.info("💳 Processing card payment %s: $%.2f (%s)", self.id, self.amount, masked_card)
         try:
             print(f"Processing card payment of ${self.amount}")
             print(f"Card ending in: {self.card_number[-4:] if len(self.card_number) >= 4 else 'XXXX'}")
+            if self.gateway is not None:
+                try:
+                    response = self.gateway.charge_sync(self.card_number, self.amount, self.gateway_reference())
+                except Exception as error:
+                    return self._gateway_unreachable(error)
+                return self._apply_gateway_response(response)
             self.status = "completed"
-            self.logger.info(f"✅ Card payment {self.id} successful")
+            self.logger.info("✅ Card payment %s successful", self.id)
             return True
         except Exception as error:
             self.status = "failed"
-            self.logger.error(f"❌ Card payment {self.id} failed: {error}", exc_info=True)
+            self.logger.error("❌ Card payment %s failed: %s", self.id, error, exc_info=True)
             return False
     
+    # OOP – Polymorphism: Async variant for callers already running an event loop
+    async def process_async(self):
+        if self.gateway is None:
+            return self.process()
+        try:
+            response = await self.gateway.charge(self.card_number, self.amount, self.gateway_reference())
+        except Exception as error:
+            return self._gateway_unreachable(error)
+        return self._apply_gateway_response(response)
+    
     def to_dict(self):
         data = super().to_dict()
         data["card_number"] = self.card_number
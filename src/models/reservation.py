@@ -37,6 +37,18 @@ class Reservation(BaseModel):
             raise ValueError("Reservation is already cancelled")
         self.status = "cancelled"
     
+    # GRASP – Information Expert: Reservation knows how long the stay is
+    def nights(self):
+        """Number of nights between check-in and check-out."""
+        return self.count_nights(self.check_in_date, self.check_out_date)
+    
+    @staticmethod
+    def count_nights(check_in_date, check_out_date):
+        """Nights between two "YYYY-MM-DD" dates; also used for rows read without building a model."""
+        check_in = datetime.strptime(check_in_date, "%Y-%m-%d")
+        check_out = datetime.strptime(check_out_date, "%Y-%m-%d")
+        return (check_out - check_in).days
+    
     def to_dict(self):
         """Convert reservation to dictionary for storage."""
         return {
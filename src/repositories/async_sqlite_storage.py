@@ -0,0 +1,180 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .sqlite_storage import SQLiteStorage, _SharedConnection
+from ..utils.logging_config import get_logger
+
+DEFAULT_READ_CONNECTIONS = 4
+
+# Most queued writes committed together in one transaction
+DEFAULT_MAX_BATCH = 256
+
+# Storage calls that only read, and those that change data
+READ_OPERATIONS = (
+    "read_collection", "find_by", "find_in", "sum_column", "query", "search", "column_names",
+)
+WRITE_OPERATIONS = (
+    "insert_items", "update_item", "delete_item", "increment_counters", "write_collection", "execute",
+)
+
+
+def _read_operation(name):
+    async def operation(self, *args, **kwargs):
+        return await self.read(getattr(self.storage, name), *args, **kwargs)
+    operation.__name__ = name
+    operation.__doc__ = f"SQLiteStorage.{name} on a pooled read connection."
+    return operation
+
+
+def _write_operation(name):
+    async def operation(self, *args, **kwargs):
+        return await self.write(getattr(self.storage, name), *args, **kwargs)
+    operation.__name__ = name
+    operation.__doc__ = f"SQLiteStorage.{name} through the batching writer."
+    return operation
+
+
+# OOP – Composition: Wraps the synchronous SQLiteStorage instead of reimplementing its queries
+# SOLID – SRP: Only decides where and when storage calls run; the SQL stays in SQLiteStorage
+class AsyncSQLiteStorage:
+    """
+    Awaitable front for SQLiteStorage.
+    Reads run concurrently on a pool of threads, each holding its own open connection.
+    Writes are queued to a single writer task that takes everything waiting (up to max_batch),
+    runs it on one writer thread inside a single transaction with a savepoint per call, and
+    commits once. A failing call only rolls back its own savepoint; the rest of the batch commits.
+    read() and write() accept any callable, so whole service methods can run the same way.
+    """
+
+    def __init__(self, storage=None, read_connections=DEFAULT_READ_CONNECTIONS, max_batch=DEFAULT_MAX_BATCH):
+        self.storage = storage if storage is not None else SQLiteStorage()
+        self.read_connections = read_connections
+        self.max_batch = max_batch
+        self.logger = get_logger(self.__class__.__name__)
+
+        self.batches = 0
+        self.writes = 0
+        self._readers = None
+        self._writer = None
+        self._queue = None
+        self._writer_task = None
+        self._connections = []
+        self._connections_lock = threading.Lock()
+
+    # ---- Lifecycle ----
+
+    async def start(self):
+        if self._writer_task is not None:
+            return self
+        self._readers = ThreadPoolExecutor(
+            max_workers=self.read_connections, thread_name_prefix="sqlite-read", initializer=self._open_read_connection
+        )
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-write")
+        self._queue = asyncio.Queue()
+        self._writer_task = asyncio.create_task(self._write_loop())
+        self.logger.info("Async storage ready: %s read connections, one batching writer", self.read_connections)
+        return self
+
+    async def close(self):
+        if self._writer_task is None:
+            return
+        await self._queue.put(None)
+        await self._writer_task
+        self._writer_task = None
+        self._readers.shutdown()
+        self._writer.shutdown()
+        with self._connections_lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections = []
+        self.logger.info("Async storage closed after %s writes in %s batches", self.writes, self.batches)
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        await self.close()
+
+    def _open_read_connection(self):
+        if not self.storage._schema_ready:
+            self.storage._ensure_schema()
+        connection = self.storage._connect(check_same_thread=False)
+        with self._connections_lock:
+            self._connections.append(connection)
+        # Storage calls on this thread reuse the connection instead of opening one each time
+        self.storage._local.connection = _SharedConnection(connection)
+
+    # ---- Reads ----
+
+    async def read(self, function, *args, **kwargs):
+        await self.start()
+        return await asyncio.get_running_loop().run_in_executor(self._readers, lambda: function(*args, **kwargs))
+
+    # ---- Writes ----
+
+    async def write(self, function, *args, **kwargs):
+        await self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((function, args, kwargs, future))
+        return await future
+
+    async def _write_loop(self):
+        loop = asyncio.get_running_loop()
+        # WAL lets the read connections keep reading while the writer commits
+        await loop.run_in_executor(self._writer, self.storage.query, "PRAGMA journal_mode=WAL")
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            while len(batch) < self.max_batch and not self._queue.empty():
+                item = self._queue.get_nowait()
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            batch = [item for item in batch if not item[3].cancelled()]
+            if not batch:
+                continue
+            try:
+                outcomes = await loop.run_in_executor(self._writer, self._apply_batch, batch)
+            except Exception as error:
+                self.logger.error("Write batch of %s failed to commit: %s", len(batch), error, exc_info=True)
+                outcomes = [(False, error)] * len(batch)
+
+            self.batches += 1
+            self.writes += len(batch)
+            for (_, _, _, future), (ok, value) in zip(batch, outcomes):
+                if future.cancelled():
+                    continue
+                if ok:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+
+    def _apply_batch(self, batch):
+        """Run queued writes in one transaction, isolating each behind a savepoint."""
+        outcomes = []
+        with self.storage.transaction() as connection:
+            connection.execute("BEGIN")
+            for function, args, kwargs, _ in batch:
+                connection.execute("SAVEPOINT batch_write")
+                try:
+                    result = function(*args, **kwargs)
+                except Exception as error:
+                    connection.execute("ROLLBACK TO batch_write")
+                    connection.execute("RELEASE batch_write")
+                    outcomes.append((False, error))
+                    continue
+                connection.execute("RELEASE batch_write")
+                outcomes.append((True, result))
+        self.logger.debug("Committed %s writes in one transaction", len(batch))
+        return outcomes
+
+
+for _name in READ_OPERATIONS:
+    setattr(AsyncSQLiteStorage, _name, _read_operation(_name))
+for _name in WRITE_OPERATIONS:
+    setattr(AsyncSQLiteStorage, _name, _write_operation(_name))
@@ -1,5 +1,13 @@
+from collections import namedtuple
+from functools import lru_cache
 from ..utils.logging_config import get_logger
 
+
+@lru_cache(maxsize=None)
+def projection_type(type_name, fields):
+    """Named row type for a projection; cached so each field list gets one class."""
+    return namedtuple(type_name, fields)
+
 # OOP – Inheritance: Abstract base class for all repositories
 # SOLID – SRP: BaseRepository only handles generic CRUD operations
 # GRASP – Information Expert: Repository knows how to persist its model
@@ -11,39 +19,72 @@ class BaseRepository:
         self.collection_name = collection_name
         self.model_class = model_class
         self.logger = get_logger(self.__class__.__name__)
-        self.logger.debug(f"{self.__class__.__name__} initialized for {collection_name}")
+        self.logger.debug("%s initialized for %s", self.__class__.__name__, collection_name)
     
     # GRASP – Creator: Repository creates and saves model instances
     def create(self, item):
-        self.logger.debug(f"Saving new {self.collection_name}: {item.id}")
+        self.logger.debug("Saving new %s: %s", self.collection_name, item.id)
         try:
-            items = self.storage.read_collection(self.collection_name)
-            items.append(item.to_dict())
-            self.storage.write_collection(self.collection_name, items)
-            self.logger.info(f"{self.collection_name.title()} saved: {item.id}")
+            self.storage.insert_items(self.collection_name, [item.to_dict()])
+            self.logger.info("%s saved: %s", self.collection_name.title(), item.id)
             return item
         except Exception as error:
-            self.logger.error(f"Failed to save {self.collection_name}: {error}", exc_info=True)
+            self.logger.error("Failed to save %s: %s", self.collection_name, error, exc_info=True)
+            raise
+    
+    # SOLID – SRP: Bulk variant of create that persists everything in one write
+    def create_many(self, items):
+        self.logger.debug("Saving %s new %s", len(items), self.collection_name)
+        try:
+            self.storage.insert_items(self.collection_name, [item.to_dict() for item in items])
+            self.logger.info("%s %s saved", len(items), self.collection_name)
+            return items
+        except Exception as error:
+            self.logger.error("Failed to save %s: %s", self.collection_name, error, exc_info=True)
             raise
     
     # GRASP – Information Expert: Repository knows how to find its items
     def get_by_id(self, item_id):
-        self.logger.debug(f"Looking up {self.collection_name}: {item_id}")
+        self.logger.debug("Looking up %s: %s", self.collection_name, item_id)
         try:
-            items = self.storage.read_collection(self.collection_name)
-            for item_data in items:
-                if item_data.get("id") == item_id:
-                    self.logger.debug(f"Found {self.collection_name}: {item_id}")
-                    return self.model_class.from_dict(item_data)
-            self.logger.debug(f"{self.collection_name.title()} not found: {item_id}")
+            # Primary-key lookup instead of loading the whole collection
+            items = self.storage.find_by(self.collection_name, "id", item_id)
+            if items:
+                self.logger.debug("Found %s: %s", self.collection_name, item_id)
+                return self.model_class.from_dict(items[0])
+            self.logger.debug("%s not found: %s", self.collection_name.title(), item_id)
             return None
         except Exception as error:
-            self.logger.error(f"Lookup failed: {error}", exc_info=True)
+            self.logger.error("Lookup failed: %s", error, exc_info=True)
+            raise
+    
+    # SOLID – SRP: Bulk variant of get_by_id; chunked IN queries instead of one lookup per id
+    def get_many(self, item_ids):
+        """Items for the given ids in request order; unknown ids are left out."""
+        item_ids = list(dict.fromkeys(item_ids))
+        self.logger.debug("Looking up %s %s", len(item_ids), self.collection_name)
+        try:
+            found = {
+                item_data["id"]: item_data
+                for item_data in self.storage.find_in(self.collection_name, "id", item_ids)
+            }
+            return [self.model_class.from_dict(found[item_id]) for item_id in item_ids if item_id in found]
+        except Exception as error:
+            self.logger.error("Bulk lookup failed: %s", error, exc_info=True)
             raise
     
-    def get_all(self):
-        self.logger.debug(f"Loading all {self.collection_name}")
+    def get_all(self, fields=None):
+        """
+        All items as models, or as lightweight named rows holding only `fields` when given;
+        the field list is pushed down to the storage so other columns are never read.
+        """
+        self.logger.debug("Loading all %s", self.collection_name)
         try:
+            if fields:
+                result = list(self.iter_all(fields))
+                self.logger.debug("Loaded %s %s (%s)", len(result), self.collection_name, ', '.join(fields))
+                return result
+            
             items = self.storage.read_collection(self.collection_name)
             
             result = []
@@ -51,57 +92,51 @@ class BaseRepository:
                 model_object = self.model_class.from_dict(item_data)
                 result.append(model_object)
             
-            self.logger.debug(f"Loaded {len(result)} {self.collection_name}")
+            self.logger.debug("Loaded %s %s", len(result), self.collection_name)
             return result
         except Exception as error:
-            self.logger.error(f"Failed to load {self.collection_name}: {error}", exc_info=True)
+            self.logger.error("Failed to load %s: %s", self.collection_name, error, exc_info=True)
             raise
     
+    # SOLID – SRP: Streaming variant of get_all for large collections
+    def iter_all(self, fields=None, batch_size=500):
+        """Yield items one at a time, as models or as named rows when `fields` is given."""
+        items = self.storage.iter_collection(self.collection_name, fields=fields, batch_size=batch_size)
+        if not fields:
+            for item_data in items:
+                yield self.model_class.from_dict(item_data)
+            return
+        
+        row_type = projection_type(f"{self.model_class.__name__}Row", tuple(fields))
+        for item_data in items:
+            yield row_type(*(item_data.get(field) for field in fields))
+    
     # GRASP – Information Expert: Repository updates its own collection
     def update(self, item):
-        self.logger.debug(f"Updating {self.collection_name}: {item.id}")
+        self.logger.debug("Updating %s: %s", self.collection_name, item.id)
         try:
-            items = self.storage.read_collection(self.collection_name)
-            
-            found = False
-            for i in range(len(items)):
-                if items[i].get("id") == item.id:
-                    items[i] = item.to_dict()
-                    found = True
-                    break
-            
-            if not found:
+            if not self.storage.update_item(self.collection_name, item.to_dict()):
                 error_msg = f"{self.collection_name.title()} not found: {item.id}"
                 self.logger.warning(error_msg)
                 raise ValueError(error_msg)
             
-            self.storage.write_collection(self.collection_name, items)
-            self.logger.info(f"{self.collection_name.title()} updated: {item.id}")
+            self.logger.info("%s updated: %s", self.collection_name.title(), item.id)
             return item
         except Exception as error:
-            self.logger.error(f"Update failed: {error}", exc_info=True)
+            self.logger.error("Update failed: %s", error, exc_info=True)
             raise
     
     def delete(self, item_id):
-        self.logger.debug(f"Deleting {self.collection_name}: {item_id}")
+        self.logger.debug("Deleting %s: %s", self.collection_name, item_id)
         try:
-            items = self.storage.read_collection(self.collection_name)
-            original_count = len(items)
-            
-            filtered_items = []
-            for item in items:
-                if item.get("id") != item_id:
-                    filtered_items.append(item)
-            
-            if len(filtered_items) == original_count:
+            if not self.storage.delete_item(self.collection_name, item_id):
                 error_msg = f"{self.collection_name.title()} not found: {item_id}"
                 self.logger.warning(error_msg)
                 raise ValueError(error_msg)
             
-            self.storage.write_collection(self.collection_name, filtered_items)
-            self.logger.info(f"{self.collection_name.title()} deleted: {item_id}")
+            self.logger.info("%s deleted: %s", self.collection_name.title(), item_id)
             return True
         except Exception as error:
-            self.logger.error(f"Deletion failed: {error}", exc_info=True)
+            self.logger.error("Deletion failed: %s", error, exc_info=True)
             raise
 
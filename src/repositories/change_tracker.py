@@ -0,0 +1,94 @@
+"""
+Change trackers - tell a process which collections other writers changed, without reading them.
+"""
+
+import os
+import threading
+from ..utils.logging_config import get_logger
+
+# Collections whose writes are counted (SQLite keeps the counters in table_versions via triggers)
+TRACKED_COLLECTIONS = ("rooms", "guests", "reservations", "payments")
+
+_UNSET = object()
+
+
+# GRASP – Pure Fabrication: Cheap "did anyone write?" probe kept apart from the storage's queries
+# SOLID – SRP: Only detects changes; deciding what to drop is the cache's job
+class SQLiteChangeTracker:
+    """
+    Holds one read-only connection of its own. PRAGMA data_version on it only changes when some
+    other connection (another process, or another connection in this one) commits, so the common
+    "nothing happened" case costs one pragma. When it moves, the per-table counters in
+    table_versions show which collections were written.
+    """
+
+    def __init__(self, storage):
+        self.storage = storage
+        self.logger = get_logger(self.__class__.__name__)
+        self._lock = threading.Lock()
+        self._connection = None
+        self._data_version = None
+        self._versions = {}
+
+    def _read_versions(self):
+        return dict(self._connection.execute("SELECT name, version FROM table_versions"))
+
+    def changed_collections(self):
+        """Collections committed to since the previous call; the first call only takes a baseline."""
+        with self._lock:
+            if self._connection is None:
+                self.storage._ensure_schema()
+                self._connection = self.storage._connect(check_same_thread=False)
+                self._data_version = self._connection.execute("PRAGMA data_version").fetchone()[0]
+                self._versions = self._read_versions()
+                return set()
+
+            data_version = self._connection.execute("PRAGMA data_version").fetchone()[0]
+            if data_version == self._data_version:
+                return set()
+            self._data_version = data_version
+            versions = self._read_versions()
+            changed = {name for name, version in versions.items() if self._versions.get(name) != version}
+            self._versions = versions
+        if changed:
+            self.logger.debug("Collections changed by other writers: %s", sorted(changed))
+        return changed
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+# GRASP – Pure Fabrication: Same probe for the single-file JSON storage
+class FileChangeTracker:
+    """
+    The JSON file is rewritten as a whole, so a new modification time or size means
+    every collection may have changed.
+    """
+
+    def __init__(self, file_path, collections=TRACKED_COLLECTIONS):
+        self.file_path = file_path
+        self.collections = collections
+        self._lock = threading.Lock()
+        self._signature = _UNSET
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.file_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def changed_collections(self):
+        with self._lock:
+            signature = self._stat()
+            if self._signature is _UNSET or signature == self._signature:
+                self._signature = signature
+                return set()
+            self._signature = signature
+        return set(self.collections)
+
+    def close(self):
+        pass
@@ -0,0 +1,170 @@
+"""
+Daily summary repository - materialised per-day, per-room-type figures for dashboards.
+"""
+
+from datetime import date, datetime, timedelta
+from ..utils.logging_config import get_logger
+
+# Payment statuses that count as money received
+PAID_STATUSES = ("completed", "partial")
+
+# Expands every non-cancelled reservation into one row per night sold inside [:start, :end)
+STAY_NIGHTS_CTE = """
+    WITH RECURSIVE stay(room_id, day, last_night_end) AS (
+        SELECT room_id,
+               MAX(check_in_date, :start),
+               MIN(check_out_date, :end)
+        FROM reservations
+        WHERE status != 'cancelled'
+          AND check_in_date < :end
+          AND check_out_date > :start
+        UNION ALL
+        SELECT room_id, date(day, '+1 day'), last_night_end
+        FROM stay
+        WHERE date(day, '+1 day') < last_night_end
+    )
+"""
+
+
+# GRASP – Pure Fabrication: Read model for dashboards, separate from the booking tables
+# SOLID – SRP: Only maintains and reads the daily_summary counters
+class DailySummaryRepository:
+    """
+    Keeps one row per (day, room_type) with nights sold, room revenue and payments received.
+    Write paths add signed deltas, so dashboards read a handful of rows instead of re-aggregating.
+    """
+
+    KEY_FIELDS = ["day", "room_type"]
+
+    def __init__(self, storage):
+        self.storage = storage
+        self.collection_name = "daily_summary"
+        self.logger = get_logger(self.__class__.__name__)
+
+    @staticmethod
+    def _row(day, room_type, nights_sold=0, room_revenue=0.0, payments_received=0.0):
+        return {
+            "day": day,
+            "room_type": room_type,
+            "nights_sold": nights_sold,
+            "room_revenue": room_revenue,
+            "payments_received": payments_received
+        }
+
+    def _increment(self, rows):
+        # Merge rows sharing a key so each summary row is touched once
+        merged = {}
+        for row in rows:
+            key = (row["day"], row["room_type"])
+            if key not in merged:
+                merged[key] = dict(row)
+                continue
+            for field in ("nights_sold", "room_revenue", "payments_received"):
+                merged[key][field] += row[field]
+        self.storage.increment_counters(self.collection_name, self.KEY_FIELDS, list(merged.values()))
+
+    # GRASP – Information Expert: Turns a stay into one delta per night
+    def record_stay(self, reservation, room, sign=1):
+        if room is None or reservation.status == "cancelled":
+            return
+        day = date.fromisoformat(reservation.check_in_date)
+        check_out = date.fromisoformat(reservation.check_out_date)
+        rows = []
+        while day < check_out:
+            rows.append(self._row(day.isoformat(), room.room_type, sign, sign * room.price_per_night))
+            day += timedelta(days=1)
+        self._increment(rows)
+
+    def record_payments(self, payments_with_room_types, sign=1):
+        """Record (payment, room_type) pairs; payments without a date or not yet paid are skipped."""
+        rows = []
+        for payment, room_type in payments_with_room_types:
+            if room_type is None or payment.status not in PAID_STATUSES or not payment.created_at:
+                continue
+            rows.append(self._row(payment.created_at[:10], room_type, payments_received=sign * payment.amount))
+        self._increment(rows)
+
+    def record_payment(self, payment, room_type, sign=1):
+        self.record_payments([(payment, room_type)], sign)
+
+    def get_range(self, start_date, end_date, room_type=None):
+        self.logger.debug("Loading daily summary %s to %s", start_date, end_date)
+        if getattr(self.storage, "supports_sql", False):
+            sql = f"SELECT * FROM {self.collection_name} WHERE day >= ? AND day < ?"
+            params = [start_date, end_date]
+            if room_type is not None:
+                sql += " AND room_type = ?"
+                params.append(room_type)
+            rows = self.storage.query(sql + " ORDER BY day, room_type", params)
+            return [self._row(*row) for row in rows]
+
+        rows = [
+            row for row in self.storage.read_collection(self.collection_name)
+            if start_date <= row["day"] < end_date and (room_type is None or row["room_type"] == room_type)
+        ]
+        return sorted(rows, key=lambda row: (row["day"], row["room_type"]))
+
+    # SOLID – SRP: Recomputes the whole table from source data, atomically
+    def rebuild(self):
+        self.logger.info("Rebuilding daily summary from reservations and payments")
+        started = datetime.now()
+        with self.storage.transaction():
+            if getattr(self.storage, "supports_sql", False):
+                self._rebuild_sql()
+            else:
+                self._rebuild_in_memory()
+        elapsed = (datetime.now() - started).total_seconds()
+        self.logger.info("Daily summary rebuilt in %.2fs", elapsed)
+
+    def _rebuild_sql(self):
+        self.storage.execute(f"DELETE FROM {self.collection_name}")
+        self.storage.execute(STAY_NIGHTS_CTE + f"""
+            INSERT INTO {self.collection_name} (day, room_type, nights_sold, room_revenue, payments_received)
+            SELECT stay.day, rooms.room_type, COUNT(*), SUM(rooms.price_per_night), 0
+            FROM stay JOIN rooms ON rooms.id = stay.room_id
+            GROUP BY stay.day, rooms.room_type
+        """, {"start": "0001-01-01", "end": "9999-12-31"})
+        self.storage.execute(f"""
+            INSERT INTO {self.collection_name} (day, room_type, nights_sold, room_revenue, payments_received)
+            SELECT substr(payments.created_at, 1, 10), rooms.room_type, 0, 0, SUM(payments.amount)
+            FROM payments
+            JOIN reservations ON reservations.id = payments.reservation_id
+            JOIN rooms ON rooms.id = reservations.room_id
+            WHERE payments.status IN ('completed', 'partial') AND payments.created_at IS NOT NULL
+            GROUP BY 1, 2
+            ON CONFLICT(day, room_type) DO UPDATE SET payments_received = excluded.payments_received
+        """)
+
+    def _rebuild_in_memory(self):
+        data = self.storage.read_all()
+        rooms = {room["id"]: room for room in data.get("rooms", [])}
+        reservations = {reservation["id"]: reservation for reservation in data.get("reservations", [])}
+        summary = {}
+
+        def entry(day, room_type):
+            key = (day, room_type)
+            if key not in summary:
+                summary[key] = self._row(day, room_type)
+            return summary[key]
+
+        for reservation in reservations.values():
+            room = rooms.get(reservation["room_id"])
+            if room is None or reservation.get("status") == "cancelled":
+                continue
+            day = date.fromisoformat(reservation["check_in_date"])
+            check_out = date.fromisoformat(reservation["check_out_date"])
+            while day < check_out:
+                row = entry(day.isoformat(), room["room_type"])
+                row["nights_sold"] += 1
+                row["room_revenue"] += room["price_per_night"]
+                day += timedelta(days=1)
+
+        for payment in data.get("payments", []):
+            reservation = reservations.get(payment["reservation_id"])
+            room = rooms.get(reservation["room_id"]) if reservation else None
+            if room is None or payment.get("status") not in PAID_STATUSES or not payment.get("created_at"):
+                continue
+            entry(payment["created_at"][:10], room["room_type"])["payments_received"] += payment["amount"]
+
+        data[self.collection_name] = list(summary.values())
+        self.storage.write_all(data)
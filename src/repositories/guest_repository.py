@@ -18,3 +18,23 @@ class GuestRepository(BaseRepository):
         # SOLID – DIP: Depends on storage abstraction, not concrete class
         super().__init__(storage, "guests", Guest)
 
+    
+    # GRASP – Information Expert: Indexed lookup by the guest's natural key
+    def get_by_email(self, email):
+        self.logger.debug("Looking up guest by email: %s", email)
+        try:
+            items = self.storage.find_by(self.collection_name, "email", email)
+            return self.model_class.from_dict(items[0]) if items else None
+        except Exception as error:
+            self.logger.error("Guest lookup failed: %s", error, exc_info=True)
+            raise
+    
+    # GRASP – Information Expert: Ranked partial-match search over name, email and phone
+    def search(self, query, limit=20):
+        self.logger.debug("Searching guests for: %s", query)
+        try:
+            items = self.storage.search(self.collection_name, ["name", "email", "phone"], query, limit)
+            return [self.model_class.from_dict(item_data) for item_data in items]
+        except Exception as error:
+            self.logger.error("Guest search failed: %s", error, exc_info=True)
+            raise
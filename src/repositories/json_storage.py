@@ -1,6 +1,11 @@
 import json
 import os
+import threading
+from contextlib import contextmanager
+from .change_tracker import FileChangeTracker
+from .search_index import TrigramIndex
 from ..utils.logging_config import get_logger
+from ..utils.metrics import METRICS
 
 # OOP – Singleton: Only one JSONStorage instance exists
 # SOLID – SRP: JSONStorage only handles JSON file operations
@@ -8,6 +13,7 @@ from ..utils.logging_config import get_logger
 class JSONStorage:
     
     _instance = None
+    supports_sql = False
     
     # OOP – Singleton: __new__ ensures single instance
     def __new__(cls, file_path="src/data/hotel_data.json"):
@@ -22,19 +28,23 @@ class JSONStorage:
         
         self.file_path = file_path
         self._initialized = True
+        self._local = threading.local()
+        # Search indexes are rebuilt when the file changes; the counter catches writes within one mtime tick
+        self._write_count = 0
+        self._search_indexes = {}
         self.logger = get_logger(self.__class__.__name__)
         
         # CUPID – Predictable: Auto-creates directories and files
         directory = os.path.dirname(file_path)
         if directory and not os.path.exists(directory):
             os.makedirs(directory)
-            self.logger.info(f"Created data directory: {directory}")
+            self.logger.info("Created data directory: %s", directory)
         
         if not os.path.exists(file_path):
             self._create_empty_file()
-            self.logger.info(f"Storage initialized: {file_path}")
+            self.logger.info("Storage initialized: %s", file_path)
         else:
-            self.logger.debug(f"Using existing storage: {file_path}")
+            self.logger.debug("Using existing storage: %s", file_path)
     
     def _create_empty_file(self):
         empty_data = {
@@ -45,39 +55,209 @@ class JSONStorage:
         }
         with open(self.file_path, 'w') as file:
             json.dump(empty_data, file, indent=4)
-        self.logger.info(f"Created fresh database: {self.file_path}")
+        self.logger.info("Created fresh database: %s", self.file_path)
+    
+    # SOLID – SRP: Batches several writes into one file rewrite, discarded on error
+    @contextmanager
+    def transaction(self):
+        if getattr(self._local, "data", None) is not None:
+            yield self._local.data
+            return
+        
+        self._local.data = self.read_all()
+        self._local.after_commit = []
+        try:
+            yield self._local.data
+            data = self._local.data
+            self._local.data = None
+            self.write_all(data)
+            callbacks = self._local.after_commit
+        finally:
+            self._local.data = None
+            self._local.after_commit = None
+        for callback in callbacks:
+            callback()
+    
+    def in_transaction(self):
+        """Whether this thread has a transaction open, whose writes aren't written yet."""
+        return getattr(self._local, "data", None) is not None
+    
+    def change_tracker(self):
+        """A tracker reporting collections as changed whenever the file is rewritten."""
+        return FileChangeTracker(self.file_path)
+    
+    def on_commit(self, callback):
+        """Run callback once the current transaction is written, or right away outside one."""
+        pending = getattr(self._local, "after_commit", None)
+        if pending is None:
+            callback()
+        else:
+            pending.append(callback)
     
     # GRASP – Information Expert: JSONStorage knows how to read its file
     def read_all(self):
+        pending = getattr(self._local, "data", None)
+        if pending is not None:
+            return pending
         try:
             with open(self.file_path, 'r') as file:
-                data = json.load(file)
-                self.logger.debug(f"Read data from storage")
-                return data
+                text = file.read()
+            data = json.loads(text)
+            if METRICS.enabled:
+                METRICS.add_bytes("json_storage", "read_all", len(text))
+            self.logger.debug("Read data from storage")
+            return data
         except (FileNotFoundError, json.JSONDecodeError) as error:
-            self.logger.warning(f"Storage corrupted, recreating: {error}")
+            self.logger.warning("Storage corrupted, recreating: %s", error)
             self._create_empty_file()
             return self.read_all()
     
     # GRASP – Information Expert: JSONStorage knows how to write its file
     def write_all(self, data):
+        if getattr(self._local, "data", None) is not None:
+            self._local.data = data
+            return
         try:
-            with open(self.file_path, 'w') as file:
-                json.dump(data, file, indent=4)
-            self.logger.debug(f"Data saved to storage")
+            text = json.dumps(data, indent=4)
+            # Written aside and swapped in, so a reader on another thread never sees a half-written file
+            temp_path = f"{self.file_path}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'w') as file:
+                file.write(text)
+            os.replace(temp_path, self.file_path)
+            self._write_count += 1
+            if METRICS.enabled:
+                METRICS.add_bytes("json_storage", "write_all", len(text))
+            self.logger.debug("Data saved to storage")
         except Exception as error:
-            self.logger.error(f"Failed to write: {error}", exc_info=True)
+            self.logger.error("Failed to write: %s", error, exc_info=True)
             raise
     
     def read_collection(self, collection_name):
         data = self.read_all()
         collection = data.get(collection_name, [])
-        self.logger.debug(f"Loaded {len(collection)} items from {collection_name}")
+        self.logger.debug("Loaded %s items from %s", len(collection), collection_name)
         return collection
     
     def write_collection(self, collection_name, items):
         data = self.read_all()
         data[collection_name] = items
         self.write_all(data)
-        self.logger.debug(f"Saved {len(items)} items to {collection_name}")
-
+        self.logger.debug("Saved %s items to %s", len(items), collection_name)
+    
+    def update_item(self, collection_name, item):
+        """Replace the item with the same id; returns False when there is no such item."""
+        items = self.read_collection(collection_name)
+        for i in range(len(items)):
+            if items[i].get("id") == item["id"]:
+                items[i] = item
+                self.write_collection(collection_name, items)
+                return True
+        return False
+    
+    def delete_item(self, collection_name, item_id):
+        """Remove the item with this id; returns False when there is no such item."""
+        items = self.read_collection(collection_name)
+        remaining = [item for item in items if item.get("id") != item_id]
+        if len(remaining) == len(items):
+            return False
+        self.write_collection(collection_name, remaining)
+        return True
+    
+    def insert_items(self, collection_name, items):
+        data = self.read_all()
+        data.setdefault(collection_name, []).extend(items)
+        self.write_all(data)
+        self.logger.debug("Inserted %s items into %s", len(items), collection_name)
+    
+    def increment_counters(self, collection_name, key_fields, rows):
+        if not rows:
+            return
+        items = self.read_collection(collection_name)
+        index = {tuple(item[field] for field in key_fields): item for item in items}
+        
+        for row in rows:
+            key = tuple(row[field] for field in key_fields)
+            existing = index.get(key)
+            if existing is None:
+                existing = dict(row)
+                items.append(existing)
+                index[key] = existing
+                continue
+            for field, value in row.items():
+                if field not in key_fields:
+                    existing[field] = existing.get(field, 0) + value
+        
+        self.write_collection(collection_name, items)
+    
+    # The JSON file has to be parsed whole, so this streams from the loaded collection
+    def iter_collection(self, collection_name, fields=None, filters=None, ranges=None, batch_size=500):
+        items = self.read_collection(collection_name)
+        if fields and items:
+            # Same error as SQLite for a field no stored item has; an empty collection can't tell
+            unknown = [field for field in fields if field not in items[0]]
+            if unknown:
+                names = {key for item in items for key in item}
+                unknown = [field for field in unknown if field not in names]
+            if unknown:
+                raise ValueError(f"Unknown {collection_name} fields: {', '.join(unknown)}")
+        for item in items:
+            if any(item.get(field) != value for field, value in (filters or {}).items()):
+                continue
+            in_range = True
+            for field, (start, end) in (ranges or {}).items():
+                value = item.get(field)
+                if value is None or (start is not None and value < start) or (end is not None and value >= end):
+                    in_range = False
+                    break
+            if not in_range:
+                continue
+            yield {field: item.get(field) for field in fields} if fields else item
+    
+    def column_names(self, collection_name):
+        names = []
+        for item in self.read_collection(collection_name):
+            for key in item:
+                if key not in names:
+                    names.append(key)
+        return names
+    
+    # GRASP – Information Expert: Substring search through a cached trigram / prefix index
+    def search(self, collection_name, fields, query, limit=20):
+        if getattr(self._local, "data", None) is not None:
+            # Uncommitted transaction data isn't cached; index it just for this call
+            return TrigramIndex(self.read_collection(collection_name), fields).search(query, limit)
+        
+        stamp = (self._write_count, os.stat(self.file_path).st_mtime_ns)
+        key = (collection_name, tuple(fields))
+        cached = self._search_indexes.get(key)
+        if cached is None or cached[0] != stamp:
+            cached = (stamp, TrigramIndex(self.read_collection(collection_name), fields))
+            self._search_indexes[key] = cached
+            self.logger.debug("Built search index over %s %s", len(cached[1]), collection_name)
+        return cached[1].search(query, limit)
+    
+    def find_in(self, collection_name, field, values, fields=None, chunk_size=500):
+        wanted = set(values)
+        matches = [item for item in self.read_collection(collection_name) if item.get(field) in wanted]
+        if fields:
+            return [{name: item.get(name) for name in fields} for item in matches]
+        return matches
+    
+    def find_by(self, collection_name, field, value):
+        collection = self.read_collection(collection_name)
+        return [item for item in collection if item.get(field) == value]
+    
+    def sum_column(self, collection_name, column, filters):
+        total = 0
+        for item in self.read_collection(collection_name):
+            matches = True
+            for field, value in filters.items():
+                if isinstance(value, (list, tuple, set)):
+                    matches = item.get(field) in value
+                else:
+                    matches = item.get(field) == value
+                if not matches:
+                    break
+            if matches:
+                total += item.get(column) or 0
+        return total
@@ -0,0 +1,121 @@
+"""
+Outbox repository - an append-only log of changes for downstream consumers.
+"""
+
+import json
+from datetime import datetime
+from ..utils.logging_config import get_logger
+from ..utils.metrics import METRICS
+
+
+# GRASP – Pure Fabrication: Change log kept beside the booking tables, written in their transactions
+# SOLID – SRP: Only appends change events and tracks how far each consumer has read
+class OutboxRepository:
+    """
+    Each row is one change: an increasing seq, the event name ("reservation_created", ...),
+    the collection and id it concerns, and a JSON payload. Consumers remember the last seq they
+    processed in outbox_offsets and read only what came after it.
+    """
+
+    def __init__(self, storage):
+        self.storage = storage
+        self.collection_name = "outbox"
+        self.offsets_collection = "outbox_offsets"
+        self.logger = get_logger(self.__class__.__name__)
+
+    def append(self, event, collection, item_id, payload):
+        self.append_many([(event, collection, item_id, payload)])
+
+    def append_many(self, changes):
+        """Append (event, collection, item_id, payload) tuples; call inside the write's transaction."""
+        if not changes:
+            return
+        created_at = datetime.now().isoformat()
+        rows = [
+            {
+                "event": event,
+                "collection": collection,
+                "item_id": item_id,
+                "payload": json.dumps(payload, default=str),
+                "created_at": created_at
+            }
+            for event, collection, item_id, payload in changes
+        ]
+        if not getattr(self.storage, "supports_sql", False):
+            # SQLite numbers rows itself; the JSON file continues from its last entry
+            existing = self.storage.read_collection(self.collection_name)
+            next_seq = existing[-1]["seq"] + 1 if existing else 1
+            for offset, row in enumerate(rows):
+                row["seq"] = next_seq + offset
+        self.storage.insert_items(self.collection_name, rows)
+        if METRICS.enabled:
+            METRICS.add_bytes("outbox", "append", sum(len(row["payload"]) for row in rows))
+        self.logger.debug("Appended %s outbox events", len(rows))
+
+    @staticmethod
+    def _decode(row):
+        row = dict(row)
+        row["payload"] = json.loads(row["payload"])
+        return row
+
+    # GRASP – Information Expert: Reads the next slice after a consumer's position, oldest first
+    def read_after(self, position, limit=100):
+        self.logger.debug("Reading up to %s outbox events after %s", limit, position)
+        try:
+            if getattr(self.storage, "supports_sql", False):
+                rows = self.storage.query(
+                    "SELECT seq, event, collection, item_id, payload, created_at FROM outbox "
+                    "WHERE seq > ? ORDER BY seq LIMIT ?",
+                    (position, limit)
+                )
+                columns = ("seq", "event", "collection", "item_id", "payload", "created_at")
+                return [self._decode(dict(zip(columns, row))) for row in rows]
+
+            events = []
+            for row in self.storage.read_collection(self.collection_name):
+                if row["seq"] > position:
+                    events.append(self._decode(row))
+                    if len(events) >= limit:
+                        break
+            return events
+        except Exception as error:
+            self.logger.error("Failed to read outbox: %s", error, exc_info=True)
+            raise
+
+    def latest_position(self):
+        if getattr(self.storage, "supports_sql", False):
+            # AUTOINCREMENT keeps its high-water mark even after prune empties the table
+            return self.storage.query(
+                "SELECT COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'outbox'), 0)"
+            )[0][0]
+        existing = self.storage.read_collection(self.collection_name)
+        return existing[-1]["seq"] if existing else 0
+
+    def get_offset(self, consumer):
+        rows = self.storage.find_by(self.offsets_collection, "id", consumer)
+        return rows[0]["position"] if rows else 0
+
+    def save_offset(self, consumer, position):
+        row = {"id": consumer, "position": position, "updated_at": datetime.now().isoformat()}
+        with self.storage.transaction():
+            if not self.storage.update_item(self.offsets_collection, row):
+                self.storage.insert_items(self.offsets_collection, [row])
+        self.logger.debug("Consumer %s committed offset %s", consumer, position)
+
+    def prune(self):
+        """Delete events every known consumer has already processed; returns how many were removed."""
+        offsets = [row["position"] for row in self.storage.read_collection(self.offsets_collection)]
+        if not offsets:
+            return 0
+        floor = min(offsets)
+        if getattr(self.storage, "supports_sql", False):
+            removed = self.storage.execute("DELETE FROM outbox WHERE seq <= ?", (floor,))
+        else:
+            with self.storage.transaction():
+                events = self.storage.read_collection(self.collection_name)
+                # The newest event stays so the next seq still continues from it
+                remaining = [row for row in events if row["seq"] > floor] or events[-1:]
+                removed = len(events) - len(remaining)
+                self.storage.write_collection(self.collection_name, remaining)
+        self.logger.info("Pruned %s outbox events up to %s", removed, floor)
+        return removed
@@ -16,4 +16,43 @@ class PaymentRepository(BaseRepository):
     
     def __init__(self, storage):
         super().__init__(storage, "payments", Payment)
-
+    
+    # GRASP – Information Expert: Repository knows which payments belong to a reservation
+    def get_by_reservation(self, reservation_id):
+        self.logger.debug("Loading payments for reservation: %s", reservation_id)
+        try:
+            items = self.storage.find_by(self.collection_name, "reservation_id", reservation_id)
+            return [self.model_class.from_dict(item_data) for item_data in items]
+        except Exception as error:
+            self.logger.error("Failed to load payments for reservation: %s", error, exc_info=True)
+            raise
+    
+    def get_by_reservations(self, reservation_ids):
+        """Payments for many reservations in one chunked query, grouped by reservation id."""
+        self.logger.debug("Loading payments for %s reservations", len(reservation_ids))
+        try:
+            grouped = {reservation_id: [] for reservation_id in reservation_ids}
+            for item_data in self.storage.find_in(self.collection_name, "reservation_id", reservation_ids):
+                grouped[item_data["reservation_id"]].append(self.model_class.from_dict(item_data))
+            return grouped
+        except Exception as error:
+            self.logger.error("Failed to load payments for reservations: %s", error, exc_info=True)
+            raise
+    
+    def get_by_idempotency_key(self, idempotency_key):
+        self.logger.debug("Looking up payment by idempotency key: %s", idempotency_key)
+        try:
+            items = self.storage.find_by(self.collection_name, "idempotency_key", idempotency_key)
+            return self.model_class.from_dict(items[0]) if items else None
+        except Exception as error:
+            self.logger.error("Idempotency lookup failed: %s", error, exc_info=True)
+            raise
+    
+    def get_total_paid(self, reservation_id, statuses=("completed", "partial")):
+        self.logger.debug("Summing payments for reservation: %s", reservation_id)
+        try:
+            filters = {"reservation_id": reservation_id, "status": list(statuses)}
+            return self.storage.sum_column(self.collection_name, "amount", filters)
+        except Exception as error:
+            self.logger.error("Failed to sum payments: %s", error, exc_info=True)
+            raise
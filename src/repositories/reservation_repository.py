@@ -3,8 +3,25 @@ Reservation repository for managing reservation data.
 """
 
 from .base_repository import BaseRepository
+from .daily_summary_repository import PAID_STATUSES
 from ..models.reservation import Reservation
 
+DETAIL_FIELDS = [
+    "reservation_id", "guest_id", "guest_name", "room_id", "room_number", "room_type",
+    "price_per_night", "check_in_date", "check_out_date", "status", "amount_paid"
+]
+
+# One row per reservation with its guest, room and money received; LEFT JOINs keep orphans visible
+DETAILS_SQL = f"""
+    SELECT r.id, r.guest_id, g.name, r.room_id, rm.number, rm.room_type, rm.price_per_night,
+           r.check_in_date, r.check_out_date, r.status,
+           (SELECT COALESCE(SUM(p.amount), 0) FROM payments AS p
+            WHERE p.reservation_id = r.id AND p.status IN ({', '.join(repr(status) for status in PAID_STATUSES)}))
+    FROM reservations AS r
+    LEFT JOIN guests AS g ON g.id = r.guest_id
+    LEFT JOIN rooms AS rm ON rm.id = r.room_id
+"""
+
 # OOP – Inheritance: ReservationRepository inherits CRUD operations
 # SOLID – SRP: Handles only Reservation persistence
 # GRASP – Pure Fabrication: Repository separates domain from persistence
@@ -16,4 +33,66 @@ class ReservationRepository(BaseRepository):
     
     def __init__(self, storage):
         super().__init__(storage, "reservations", Reservation)
-
+    
+    # GRASP – Information Expert: Repository knows which reservations use a room
+    def get_by_room(self, room_id):
+        self.logger.debug("Loading reservations for room: %s", room_id)
+        try:
+            items = self.storage.find_by(self.collection_name, "room_id", room_id)
+            return [self.model_class.from_dict(item_data) for item_data in items]
+        except Exception as error:
+            self.logger.error("Failed to load reservations for room: %s", error, exc_info=True)
+            raise
+    
+    def get_by_guest(self, guest_id):
+        self.logger.debug("Loading reservations for guest: %s", guest_id)
+        try:
+            items = self.storage.find_by(self.collection_name, "guest_id", guest_id)
+            return [self.model_class.from_dict(item_data) for item_data in items]
+        except Exception as error:
+            self.logger.error("Failed to load reservations for guest: %s", error, exc_info=True)
+            raise
+    
+    # GRASP – Information Expert: Denormalised reservation rows in one query instead of N+1 lookups
+    def get_details(self, reservation_id=None):
+        """Reservations joined with guest name, room number/type/price and total paid, in storage order."""
+        self.logger.debug("Loading reservation details: %s", reservation_id or 'all')
+        try:
+            if getattr(self.storage, "supports_sql", False):
+                sql = DETAILS_SQL
+                params = []
+                if reservation_id is not None:
+                    sql += " WHERE r.id = ?"
+                    params.append(reservation_id)
+                rows = self.storage.query(sql + " ORDER BY r.rowid", params)
+                return [dict(zip(DETAIL_FIELDS, row)) for row in rows]
+            return self._hash_join_details(reservation_id)
+        except Exception as error:
+            self.logger.error("Failed to load reservation details: %s", error, exc_info=True)
+            raise
+    
+    def _hash_join_details(self, reservation_id):
+        data = self.storage.read_all()
+        reservations = [
+            reservation for reservation in data.get("reservations", [])
+            if reservation_id is None or reservation["id"] == reservation_id
+        ]
+        wanted = {reservation["id"] for reservation in reservations}
+        guests = {guest["id"]: guest for guest in data.get("guests", [])}
+        rooms = {room["id"]: room for room in data.get("rooms", [])}
+        paid = {}
+        for payment in data.get("payments", []):
+            if payment["reservation_id"] in wanted and payment.get("status") in PAID_STATUSES:
+                paid[payment["reservation_id"]] = paid.get(payment["reservation_id"], 0) + payment["amount"]
+        
+        details = []
+        for reservation in reservations:
+            guest = guests.get(reservation["guest_id"], {})
+            room = rooms.get(reservation["room_id"], {})
+            details.append(dict(zip(DETAIL_FIELDS, [
+                reservation["id"], reservation["guest_id"], guest.get("name"), reservation["room_id"],
+                room.get("number"), room.get("room_type"), room.get("price_per_night"),
+                reservation["check_in_date"], reservation["check_out_date"], reservation["status"],
+                paid.get(reservation["id"], 0)
+            ])))
+        return details
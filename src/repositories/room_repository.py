@@ -18,3 +18,34 @@ class RoomRepository(BaseRepository):
         # SOLID – DIP: Depends on storage interface, not implementation
         super().__init__(storage, "rooms", Room)
 
+    
+    # GRASP – Information Expert: Indexed lookup by the room's natural key
+    def get_by_number(self, number):
+        self.logger.debug("Looking up room by number: %s", number)
+        try:
+            items = self.storage.find_by(self.collection_name, "number", number)
+            return self.model_class.from_dict(items[0]) if items else None
+        except Exception as error:
+            self.logger.error("Room lookup failed: %s", error, exc_info=True)
+            raise
+    
+    # GRASP – Information Expert: Availability filters are pushed down to the storage
+    def find_available(self, room_type=None, min_capacity=None, max_price=None):
+        """Free rooms, optionally of one type, holding at least min_capacity guests and costing at most max_price."""
+        self.logger.debug("Searching available rooms: type=%s, capacity>=%s, price<=%s",
+                          room_type, min_capacity, max_price)
+        try:
+            filters = {"is_available": True}
+            if room_type:
+                filters["room_type"] = room_type
+            ranges = {"capacity": (min_capacity, None)} if min_capacity is not None else None
+            rooms = []
+            for item_data in self.storage.iter_collection(self.collection_name, filters=filters, ranges=ranges):
+                if max_price is not None and item_data["price_per_night"] > max_price:
+                    continue
+                rooms.append(self.model_class.from_dict(item_data))
+            rooms.sort(key=lambda room: (room.price_per_night, room.number))
+            return rooms
+        except Exception as error:
+            self.logger.error("Available room search failed: %s", error, exc_info=True)
+            raise
@@ -0,0 +1,105 @@
+"""
+In-memory trigram / prefix index used by JSONStorage for substring search.
+"""
+
+import heapq
+import re
+from array import array
+
+# Splits field values into words for the short-term prefix index
+WORD_SPLIT = re.compile(r"[^0-9a-z]+")
+
+# Separates field values in the searchable text so terms never match across fields
+FIELD_SEPARATOR = "\x00"
+
+
+def search_terms(query):
+    """Lower-cased whitespace-separated terms of a search query."""
+    return [term for term in query.lower().split() if term]
+
+
+def word_start_globs(term):
+    """SQLite GLOB patterns matching lower-cased text with a word (as WORD_SPLIT splits it) starting with term."""
+    escaped = re.sub(r"([*?\[])", r"[\1]", term)
+    return [escaped + "*", "*[^0-9a-z]" + escaped + "*"]
+
+
+# SOLID – SRP: Only maps text fragments to item positions and ranks candidates
+class TrigramIndex:
+    """
+    Posting lists of item positions per trigram (terms of 3+ characters) and per 1-2 character
+    word prefix (shorter terms). Lookups intersect candidates from the rarest posting list and
+    confirm each with a substring check, so only a small slice of the collection is touched.
+    """
+
+    def __init__(self, items, fields):
+        self.fields = list(fields)
+        self.items = []
+        self.texts = []
+        self.trigrams = {}
+        self.prefixes = {}
+        for item in items:
+            self.add(item)
+
+    def add(self, item):
+        position = len(self.items)
+        values = [str(item.get(field) or "").lower() for field in self.fields]
+        self.items.append(item)
+        self.texts.append(FIELD_SEPARATOR.join(values))
+
+        grams = set()
+        prefixes = set()
+        for value in values:
+            grams.update(value[i:i + 3] for i in range(len(value) - 2))
+            for word in WORD_SPLIT.split(value):
+                if word:
+                    prefixes.update((word[:1], word[:2]))
+        for gram in grams:
+            self.trigrams.setdefault(gram, array("I")).append(position)
+        for prefix in prefixes:
+            self.prefixes.setdefault(prefix, array("I")).append(position)
+
+    def __len__(self):
+        return len(self.items)
+
+    def _postings(self, term):
+        if len(term) >= 3:
+            return [self.trigrams.get(term[i:i + 3], ()) for i in range(len(term) - 2)]
+        return [self.prefixes.get(term, ())]
+
+    def _matches(self, text, terms):
+        for term in terms:
+            if len(term) >= 3:
+                if term not in text:
+                    return False
+            elif not any(word.startswith(term) for word in WORD_SPLIT.split(text)):
+                return False
+        return True
+
+    def search(self, query, limit=20):
+        terms = search_terms(query)
+        if not terms:
+            return []
+        postings = sorted((posting for term in terms for posting in self._postings(term)), key=len)
+        candidates = set(postings[0])
+        # The next-rarest lists narrow candidates cheaply before the exact check
+        for posting in postings[1:3]:
+            candidates.intersection_update(posting)
+        ranked_by_text = any(len(term) >= 3 for term in terms)
+
+        first_term = terms[0]
+        ranked = []
+        for position in sorted(candidates):
+            text = self.texts[position]
+            if not self._matches(text, terms):
+                continue
+            if not ranked_by_text:
+                # Word prefixes only, as in the SQL storage: first matches win, no ranking pass
+                ranked.append((0, 0, position))
+                if len(ranked) == limit:
+                    break
+                continue
+            # Values starting with the first term rank first, then shorter (more specific) text
+            starts = any(value.startswith(first_term) for value in text.split(FIELD_SEPARATOR))
+            ranked.append((0 if starts else 1, len(text), position))
+        return [self.items[position] for _, _, position in heapq.nsmallest(limit, ranked)]
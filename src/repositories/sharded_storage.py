@@ -0,0 +1,88 @@
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from .sqlite_storage import SQLiteStorage
+from ..utils.logging_config import get_logger
+
+DEFAULT_SHARD_DIR = "src/data/properties"
+
+# Most shards queried at the same time by fan_out
+DEFAULT_FAN_OUT_WORKERS = 8
+
+# Property ids become file names, so keep them to a safe alphabet
+PROPERTY_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]+$")
+
+
+# GRASP – Indirection: Maps a property id to the SQLite file holding that hotel's data
+# SOLID – OCP: Each shard is a plain SQLiteStorage, so repositories and services work on it unchanged
+class ShardedSQLiteStorage:
+    """
+    One SQLite database per property under shard_dir (<property_id>.db).
+    shard(property_id) returns that property's storage; every collection operation made through it
+    (or through a ReservationService built on it) touches only that file, so hotels never wait on
+    each other's write locks. fan_out runs a call against every shard in parallel for chain-wide reads.
+    """
+
+    def __init__(self, shard_dir=DEFAULT_SHARD_DIR, workers=DEFAULT_FAN_OUT_WORKERS):
+        self.shard_dir = shard_dir
+        self.workers = workers
+        self.logger = get_logger(self.__class__.__name__)
+        if not os.path.exists(shard_dir):
+            os.makedirs(shard_dir)
+            self.logger.info("Created shard directory: %s", shard_dir)
+
+    def shard_path(self, property_id):
+        if not PROPERTY_ID_PATTERN.match(str(property_id)):
+            raise ValueError(f"Invalid property id: {property_id!r} (use letters, digits, - and _)")
+        return os.path.join(self.shard_dir, f"{property_id}.db")
+
+    def shard(self, property_id):
+        """The storage for one property; created on first use."""
+        return SQLiteStorage(self.shard_path(property_id))
+
+    def property_ids(self):
+        return sorted(
+            name[:-len(".db")] for name in os.listdir(self.shard_dir)
+            if name.endswith(".db") and PROPERTY_ID_PATTERN.match(name[:-len(".db")])
+        )
+
+    # GRASP – Controller: Scatters one call over the shards and gathers the results per property
+    def fan_out(self, function, property_ids=None):
+        """
+        Call function(storage) for each property (all of them by default) on a thread pool.
+        SQLite releases the GIL while it runs a query, so shards are read in parallel.
+        Returns {property_id: result}; the first failure is logged and raised.
+        """
+        property_ids = list(property_ids) if property_ids is not None else self.property_ids()
+        if not property_ids:
+            return {}
+        shards = [(property_id, self.shard(property_id)) for property_id in property_ids]
+
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(shards)), thread_name_prefix="shard") as pool:
+            futures = [(property_id, pool.submit(function, storage)) for property_id, storage in shards]
+            results = {}
+            for property_id, future in futures:
+                try:
+                    results[property_id] = future.result()
+                except Exception as error:
+                    self.logger.error("Fan-out failed on property %s: %s", property_id, error, exc_info=True)
+                    raise
+        self.logger.debug("Fanned out over %s properties", len(results))
+        return results
+
+    def _tagged(self, results):
+        rows = []
+        for property_id, items in results.items():
+            for item in items:
+                item = dict(item)
+                item["property_id"] = property_id
+                rows.append(item)
+        return rows
+
+    def read_collection(self, collection_name, property_ids=None):
+        """Every property's rows, each tagged with its property_id."""
+        return self._tagged(self.fan_out(lambda storage: storage.read_collection(collection_name), property_ids))
+
+    def find_by(self, collection_name, field, value, property_ids=None):
+        """Matching rows from every property, e.g. a guest's stays across the chain."""
+        return self._tagged(self.fan_out(lambda storage: storage.find_by(collection_name, field, value), property_ids))
@@ -0,0 +1,268 @@
+"""
+Slow-query log - times every SQLite statement, aggregates by normalised SQL and captures
+EXPLAIN QUERY PLAN for statements over a threshold.
+"""
+
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from ..utils.logging_config import get_logger
+
+DEFAULT_SLOW_QUERY_SECONDS = 0.1
+
+# Recent slow statements kept with their parameters and plan
+DEFAULT_RECENT_ENTRIES = 100
+
+# Only these can be explained; PRAGMA, BEGIN, SAVEPOINT and DDL are timed but not explained
+EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "REPLACE", "WITH")
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_NAMED_PLACEHOLDER = re.compile(r":\w+")
+_WHITESPACE = re.compile(r"\s+")
+_FULL_SCAN = re.compile(r"^SCAN (?:TABLE )?(?!CONSTANT ROW)(\w+)(?!.*\b(?:INDEX|VIRTUAL TABLE)\b)")
+
+
+@lru_cache(maxsize=2048)
+def normalize_sql(sql):
+    """Literals and placeholder lists collapsed, so every call of one access path shares a key."""
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NAMED_PLACEHOLDER.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _PLACEHOLDER_LIST.sub("(?, ...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def full_scans(plan):
+    """Tables read row by row without an index, from EXPLAIN QUERY PLAN detail lines."""
+    tables = []
+    for detail in plan:
+        match = _FULL_SCAN.match(detail)
+        if match:
+            tables.append(match.group(1))
+    return tables
+
+
+class _QueryStats:
+    __slots__ = ("calls", "total", "max", "slow_calls", "plan", "full_scans")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.slow_calls = 0
+        self.plan = None
+        self.full_scans = []
+
+
+# GRASP – Pure Fabrication: Keeps query timings apart from the storage that runs the queries
+# SOLID – SRP: Only aggregates statement timings and captures plans for the slow ones
+class SlowQueryLog:
+    """
+    Every statement run on a SQLiteStorage connection is added to the per-normalised-SQL totals.
+    A statement taking threshold seconds or more is logged as a warning with its query plan,
+    which is captured once per normalised statement; plans that scan a whole table are flagged.
+    """
+
+    def __init__(self, threshold=DEFAULT_SLOW_QUERY_SECONDS, recent_entries=DEFAULT_RECENT_ENTRIES):
+        self.threshold = threshold
+        self.logger = get_logger(self.__class__.__name__)
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._recent = deque(maxlen=recent_entries)
+
+    def record(self, connection, sql, params, elapsed):
+        key = normalize_sql(sql)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = _QueryStats()
+            stats.calls += 1
+            stats.total += elapsed
+            if elapsed > stats.max:
+                stats.max = elapsed
+        if elapsed >= self.threshold:
+            self._slow(connection, sql, key, stats, params, elapsed)
+
+    def add_fetch_time(self, connection, sql, params, executed, fetched):
+        """Add the time spent fetching a recorded statement's rows; it becomes slow if the sum crosses the threshold."""
+        key = normalize_sql(sql)
+        elapsed = executed + fetched
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                return
+            stats.total += fetched
+            if elapsed > stats.max:
+                stats.max = elapsed
+        if executed < self.threshold <= elapsed:
+            self._slow(connection, sql, key, stats, params, elapsed)
+
+    def _slow(self, connection, sql, key, stats, params, elapsed):
+        with self._lock:
+            stats.slow_calls += 1
+            needs_plan = stats.plan is None
+        if needs_plan:
+            plan = self._explain(connection, sql, params)
+            with self._lock:
+                stats.plan = plan
+                stats.full_scans = full_scans(plan)
+        entry = {
+            "sql": key,
+            "params": list(params)[:20] if isinstance(params, (list, tuple)) else params,
+            "elapsed_ms": elapsed * 1000,
+            "plan": stats.plan,
+            "full_scans": stats.full_scans
+        }
+        with self._lock:
+            self._recent.append(entry)
+        self.logger.warning("Slow query (%.1fms)%s: %s | plan: %s",
+                            elapsed * 1000, " FULL SCAN of " + ", ".join(stats.full_scans) if stats.full_scans else "",
+                            key, "; ".join(stats.plan) or "n/a")
+
+    def _explain(self, connection, sql, params):
+        if not sql.lstrip().upper().startswith(EXPLAINABLE) or params is None:
+            return []
+        try:
+            # A plain cursor, so the EXPLAIN itself isn't timed and recorded
+            cursor = sqlite3.Cursor(connection)
+            return [row[3] for row in cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()]
+        except sqlite3.Error as error:
+            self.logger.debug("Could not explain %s: %s", sql, error)
+            return []
+
+    def report(self, limit=None):
+        """Aggregates per normalised statement, most total time first."""
+        with self._lock:
+            rows = [
+                {
+                    "sql": sql,
+                    "calls": stats.calls,
+                    "total_ms": stats.total * 1000,
+                    "mean_ms": stats.total / stats.calls * 1000,
+                    "max_ms": stats.max * 1000,
+                    "slow_calls": stats.slow_calls,
+                    "plan": stats.plan,
+                    "full_scans": stats.full_scans
+                }
+                for sql, stats in self._stats.items()
+            ]
+        rows.sort(key=lambda row: row["total_ms"], reverse=True)
+        return rows[:limit] if limit else rows
+
+    def recent(self):
+        with self._lock:
+            return list(self._recent)
+
+    def reset(self):
+        with self._lock:
+            self._stats = {}
+            self._recent.clear()
+
+
+class TimedCursor(sqlite3.Cursor):
+    """
+    Times its statements for the connection's SlowQueryLog. Each statement is recorded when it
+    runs; the time spent fetching its rows is added once they are exhausted, the cursor runs
+    another statement or is closed. Rows left unread on an abandoned cursor add nothing.
+    """
+
+    _sql = None
+    _params = None
+    _executed = 0.0
+    _fetched = 0.0
+
+    def _start(self, sql, params, elapsed):
+        slow_query_log = self.connection.slow_query_log
+        if slow_query_log is not None:
+            slow_query_log.record(self.connection, sql, params, elapsed)
+        if self.description is None:
+            self._sql = None
+        else:
+            self._sql, self._params, self._executed, self._fetched = sql, params, elapsed, 0.0
+
+    def _finish(self):
+        if self._sql is None:
+            return
+        sql, self._sql = self._sql, None
+        slow_query_log = self.connection.slow_query_log
+        if slow_query_log is not None and self._fetched:
+            slow_query_log.add_fetch_time(self.connection, sql, self._params, self._executed, self._fetched)
+
+    def _timed(self, method, *args):
+        started = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            self._fetched += time.perf_counter() - started
+
+    def execute(self, sql, parameters=()):
+        self._finish()
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._start(sql, parameters, time.perf_counter() - started)
+
+    def executemany(self, sql, seq_of_parameters):
+        self._finish()
+        first = seq_of_parameters[0] if isinstance(seq_of_parameters, list) and seq_of_parameters else None
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._start(sql, first, time.perf_counter() - started)
+
+    def fetchall(self):
+        rows = self._timed(super().fetchall)
+        self._finish()
+        return rows
+
+    def fetchmany(self, *args):
+        rows = self._timed(super().fetchmany, *args)
+        if not rows:
+            self._finish()
+        return rows
+
+    def fetchone(self):
+        row = self._timed(super().fetchone)
+        if row is None:
+            self._finish()
+        return row
+
+    def __next__(self):
+        started = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._fetched += time.perf_counter() - started
+            self._finish()
+            raise
+        self._fetched += time.perf_counter() - started
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+
+# SOLID – OCP: A sqlite3.Connection whose cursors report to a SlowQueryLog
+class TimedConnection(sqlite3.Connection):
+    """Connection factory for SQLiteStorage; every statement goes through a TimedCursor."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.slow_query_log = None
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
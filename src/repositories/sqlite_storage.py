@@ -1,17 +1,60 @@
 import sqlite3
 import json
+import os
+import threading
+from contextlib import contextmanager
 from datetime import datetime
+from .change_tracker import SQLiteChangeTracker, TRACKED_COLLECTIONS
+from .search_index import search_terms, word_start_globs
+from .slow_query_log import SlowQueryLog, TimedConnection
 from ..utils.logging_config import get_logger
 
+# Stored in PRAGMA user_version; bump it whenever _initialize_database changes the schema,
+# so databases already at this version skip the DDL on startup
+SCHEMA_VERSION = 3
+
+# Collections with an FTS5 shadow table kept in sync by triggers, and the columns it indexes
+SEARCH_FIELDS = {
+    "guests": ["name", "email", "phone"],
+}
+
+
+class _SharedConnection:
+    """Connection handed out inside transaction(); only the transaction commits or closes it."""
+    
+    def __init__(self, connection):
+        self._connection = connection
+    
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+    
+    def commit(self):
+        pass
+    
+    def rollback(self):
+        pass
+    
+    def close(self):
+        pass
+
+
+# OOP – Registry: One instance per database file, so every caller shares its connections and schema state
 class SQLiteStorage:
     
-    _instance = None
+    _instances = {}
+    _registry_lock = threading.Lock()
+    # Lets reporting code push aggregation down into SQL
+    supports_sql = True
     
     def __new__(cls, db_path="src/data/hotel_system.db"):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
+        key = os.path.abspath(db_path)
+        with cls._registry_lock:
+            instance = cls._instances.get(key)
+            if instance is None:
+                instance = super().__new__(cls)
+                instance._initialized = False
+                cls._instances[key] = instance
+        return instance
     
     def __init__(self, db_path="src/data/hotel_system.db"):
         if self._initialized:
@@ -19,12 +62,34 @@ class SQLiteStorage:
         
         self.db_path = db_path
         self._initialized = True
+        self._local = threading.local()
+        # The schema is checked on first use, so constructing the storage costs nothing
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+        self._search_tables = {}
+        # Table -> column names, so field names can be checked before they go into SQL
+        self._columns = {}
+        # Every statement is timed; ones over the threshold are logged with their query plan
+        self.slow_query_log = SlowQueryLog()
         self.logger = get_logger(self.__class__.__name__)
-        self._initialize_database()
-        self.logger.info(f"Database initialized: {db_path}")
     
-    def _initialize_database(self):
-        conn = self._get_connection()
+    def _ensure_schema(self):
+        with self._schema_lock:
+            if self._schema_ready:
+                return
+            conn = self._connect()
+            try:
+                version = conn.execute("PRAGMA user_version").fetchone()[0]
+                if version < SCHEMA_VERSION:
+                    self._initialize_database(conn)
+                else:
+                    self.logger.debug("Schema version %s is current, skipping table setup", version)
+                self._schema_ready = True
+            finally:
+                conn.close()
+            self.logger.info("Database initialized: %s", self.db_path)
+    
+    def _initialize_database(self, conn):
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -74,22 +139,213 @@ class SQLiteStorage:
                 payment_type TEXT NOT NULL,
                 status TEXT NOT NULL,
                 card_number TEXT,
+                idempotency_key TEXT,
                 created_at TEXT,
                 updated_at TEXT,
                 FOREIGN KEY (reservation_id) REFERENCES reservations(id)
             )
         ''')
         
+        # Databases created before idempotency keys existed need the column added
+        payment_columns = [row[1] for row in cursor.execute("PRAGMA table_info(payments)")]
+        if "idempotency_key" not in payment_columns:
+            cursor.execute("ALTER TABLE payments ADD COLUMN idempotency_key TEXT")
+        
+        # Index the payment ledger so balances don't scan every payment
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_payments_reservation_id ON payments(reservation_id)"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_reservations_stay ON reservations(check_in_date, check_out_date)"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_reservations_room_id ON reservations(room_id)"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_reservations_guest_id ON reservations(guest_id)"
+        )
+        # Natural keys used for duplicate checks and lookups by room number / guest email
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_rooms_number ON rooms(number)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_guests_email ON guests(email)")
+        # NULL keys are allowed many times; real keys only once
+        cursor.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_payments_idempotency_key ON payments(idempotency_key)"
+        )
+        
+        # Materialised per-day figures for dashboards, kept current by the service
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS daily_summary (
+                day TEXT NOT NULL,
+                room_type TEXT NOT NULL,
+                nights_sold INTEGER NOT NULL DEFAULT 0,
+                room_revenue REAL NOT NULL DEFAULT 0,
+                payments_received REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (day, room_type)
+            )
+        ''')
+        
+        # Change log for downstream consumers, appended in the same transaction as each write
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS outbox (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                event TEXT NOT NULL,
+                collection TEXT NOT NULL,
+                item_id TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                created_at TEXT NOT NULL
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS outbox_offsets (
+                id TEXT PRIMARY KEY,
+                position INTEGER NOT NULL,
+                updated_at TEXT
+            )
+        ''')
+        
+        self._create_search_tables(cursor)
+        self._create_version_counters(cursor)
+        
+        cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
         conn.commit()
-        conn.close()
         self.logger.info("Database tables created successfully")
     
+    def _create_search_tables(self, cursor):
+        """FTS5 trigram tables for substring search; falls back to LIKE scans if SQLite lacks them."""
+        for collection_name, fields in SEARCH_FIELDS.items():
+            fts_name = f"{collection_name}_fts"
+            exists = cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts_name,)
+            ).fetchone()
+            if exists:
+                self._search_tables[collection_name] = True
+                continue
+            
+            columns = ', '.join(fields)
+            new_values = ', '.join(f"new.{field}" for field in fields)
+            old_values = ', '.join(f"old.{field}" for field in fields)
+            try:
+                cursor.execute(
+                    f"CREATE VIRTUAL TABLE {fts_name} USING fts5("
+                    f"{columns}, content='{collection_name}', content_rowid='rowid', tokenize='trigram')"
+                )
+            except sqlite3.OperationalError as error:
+                self.logger.warning("Full-text search unavailable, using LIKE scans: %s", error)
+                self._search_tables[collection_name] = False
+                continue
+            
+            cursor.execute(f'''
+                CREATE TRIGGER {fts_name}_insert AFTER INSERT ON {collection_name} BEGIN
+                    INSERT INTO {fts_name} (rowid, {columns}) VALUES (new.rowid, {new_values});
+                END
+            ''')
+            cursor.execute(f'''
+                CREATE TRIGGER {fts_name}_delete AFTER DELETE ON {collection_name} BEGIN
+                    INSERT INTO {fts_name} ({fts_name}, rowid, {columns}) VALUES ('delete', old.rowid, {old_values});
+                END
+            ''')
+            cursor.execute(f'''
+                CREATE TRIGGER {fts_name}_update AFTER UPDATE ON {collection_name} BEGIN
+                    INSERT INTO {fts_name} ({fts_name}, rowid, {columns}) VALUES ('delete', old.rowid, {old_values});
+                    INSERT INTO {fts_name} (rowid, {columns}) VALUES (new.rowid, {new_values});
+                END
+            ''')
+            # Index rows that were there before the search table existed
+            cursor.execute(f"INSERT INTO {fts_name} ({fts_name}) VALUES ('rebuild')")
+            self._search_tables[collection_name] = True
+            self.logger.info("Created full-text index %s", fts_name)
+    
+    def _create_version_counters(self, cursor):
+        """One counter per tracked table, bumped by triggers on every row written, for change trackers."""
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS table_versions (
+                name TEXT PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        for table in TRACKED_COLLECTIONS:
+            cursor.execute("INSERT OR IGNORE INTO table_versions (name, version) VALUES (?, 0)", (table,))
+            for action in ("INSERT", "UPDATE", "DELETE"):
+                cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS {table}_version_{action.lower()} AFTER {action} ON {table}
+                    BEGIN
+                        UPDATE table_versions SET version = version + 1 WHERE name = '{table}';
+                    END
+                ''')
+    
+    def _has_search_table(self, collection_name):
+        if collection_name not in SEARCH_FIELDS:
+            return False
+        if collection_name not in self._search_tables:
+            # Schema setup was skipped this run, so look the table up once
+            rows = self.query(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (f"{collection_name}_fts",)
+            )
+            self._search_tables[collection_name] = bool(rows)
+        return self._search_tables[collection_name]
+    
     def _get_connection(self):
+        shared = getattr(self._local, "connection", None)
+        if shared is not None:
+            return shared
+        
+        if not self._schema_ready:
+            self._ensure_schema()
+        return self._connect()
+    
+    def _connect(self, check_same_thread=True):
         import os
         directory = os.path.dirname(self.db_path)
         if directory and not os.path.exists(directory):
             os.makedirs(directory)
-        return sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(self.db_path, check_same_thread=check_same_thread, factory=TimedConnection)
+        conn.slow_query_log = self.slow_query_log
+        return conn
+    
+    # SOLID – SRP: Groups several storage calls into one atomic SQLite transaction
+    @contextmanager
+    def transaction(self):
+        shared = getattr(self._local, "connection", None)
+        if shared is not None:
+            # Nested transaction joins the outer one
+            yield shared
+            return
+        
+        conn = self._get_connection()
+        self._local.connection = _SharedConnection(conn)
+        self._local.after_commit = []
+        self._local.transaction_open = True
+        try:
+            yield self._local.connection
+            conn.commit()
+            callbacks = self._local.after_commit
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self._local.connection = None
+            self._local.after_commit = None
+            self._local.transaction_open = False
+            conn.close()
+        for callback in callbacks:
+            callback()
+    
+    def in_transaction(self):
+        """Whether this thread has a transaction open, whose writes aren't committed yet."""
+        # Not the shared connection: async reader threads keep one for their whole life
+        return getattr(self._local, "transaction_open", False)
+    
+    def change_tracker(self):
+        """A tracker reporting which collections any connection has committed to since it last looked."""
+        return SQLiteChangeTracker(self)
+    
+    def on_commit(self, callback):
+        """Run callback once the current transaction commits, or right away outside one."""
+        pending = getattr(self._local, "after_commit", None)
+        if pending is None:
+            callback()
+        else:
+            pending.append(callback)
     
     def read_collection(self, collection_name):
         conn = self._get_connection()
@@ -103,19 +359,326 @@ class SQLiteStorage:
             
             result = []
             for row in rows:
-                item = {}
-                for i, column_name in enumerate(column_names):
-                    item[column_name] = row[i]
-                
-                if 'is_available' in item:
-                    item['is_available'] = bool(item['is_available'])
-                
-                result.append(item)
+                result.append(self._row_to_item(column_names, row))
             
-            self.logger.debug(f"Loaded {len(result)} items from {collection_name}")
+            self.logger.debug("Loaded %s items from %s", len(result), collection_name)
+            return result
+        except Exception as error:
+            self.logger.error("Error reading %s: %s", collection_name, error, exc_info=True)
+            raise
+        finally:
+            conn.close()
+    
+    # SOLID – SRP: Streams rows in batches so large tables never sit in memory at once
+    def iter_collection(self, collection_name, fields=None, filters=None, ranges=None, batch_size=500):
+        """
+        Yield rows as dicts. filters maps field -> value for equality,
+        ranges maps field -> (start, end) with start included, end excluded; either bound may be None.
+        Field names go into the SQL, so unknown ones raise ValueError.
+        """
+        self._check_columns(collection_name, [*(fields or ()), *(filters or {}), *(ranges or {})])
+        conditions = []
+        params = []
+        for field, value in (filters or {}).items():
+            conditions.append(f"{field} = ?")
+            params.append(value)
+        for field, (start, end) in (ranges or {}).items():
+            if start is not None:
+                conditions.append(f"{field} >= ?")
+                params.append(start)
+            if end is not None:
+                conditions.append(f"{field} < ?")
+                params.append(end)
+        where_clause = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        column_list = ', '.join(fields) if fields else '*'
+        
+        conn = self._get_connection()
+        try:
+            cursor = conn.execute(f"SELECT {column_list} FROM {collection_name}{where_clause}", params)
+            column_names = [col[0] for col in cursor.description]
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield self._row_to_item(column_names, row)
+        finally:
+            conn.close()
+    
+    def column_names(self, collection_name):
+        conn = self._get_connection()
+        try:
+            return [row[1] for row in conn.execute(f"PRAGMA table_info({collection_name})")]
+        finally:
+            conn.close()
+    
+    def _check_columns(self, collection_name, names):
+        if not names:
+            return
+        columns = self._columns.get(collection_name)
+        if columns is None:
+            columns = self._columns[collection_name] = frozenset(self.column_names(collection_name))
+        unknown = [name for name in names if name not in columns]
+        if unknown:
+            raise ValueError(f"Unknown {collection_name} fields: {', '.join(unknown)}")
+    
+    def _row_to_item(self, column_names, row):
+        item = {}
+        for i, column_name in enumerate(column_names):
+            item[column_name] = row[i]
+        
+        if 'is_available' in item:
+            item['is_available'] = bool(item['is_available'])
+        return item
+    
+    # SOLID – SRP: Read-only query helper for reports; returns plain tuples
+    def query(self, sql, params=()):
+        conn = self._get_connection()
+        try:
+            return conn.execute(sql, params).fetchall()
+        except Exception as error:
+            self.logger.error("Query failed: %s", error, exc_info=True)
+            raise
+        finally:
+            conn.close()
+    
+    def execute(self, sql, params=()):
+        conn = self._get_connection()
+        try:
+            cursor = conn.execute(sql, params)
+            conn.commit()
+            return cursor.rowcount
+        except Exception as error:
+            conn.rollback()
+            self.logger.error("Statement failed: %s", error, exc_info=True)
+            raise
+        finally:
+            conn.close()
+    
+    # GRASP – Information Expert: Lets SQLite use its indexes for equality lookups
+    def find_by(self, collection_name, field, value):
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(f"SELECT * FROM {collection_name} WHERE {field} = ?", (value,))
+            column_names = [col[0] for col in cursor.description]
+            result = [self._row_to_item(column_names, row) for row in cursor.fetchall()]
+            self.logger.debug("Found %s %s where %s matches", len(result), collection_name, field)
+            return result
+        except Exception as error:
+            self.logger.error("Error searching %s: %s", collection_name, error, exc_info=True)
+            raise
+        finally:
+            conn.close()
+    
+    # GRASP – Information Expert: Ranked substring search through the FTS5 trigram index
+    def search(self, collection_name, fields, query, limit=20):
+        """
+        Rows whose fields contain every term of the query. Terms of 3+ characters go through
+        the trigram index; shorter terms match the start of a word, split on the same
+        non-alphanumeric characters as JSONStorage's index.
+        """
+        terms = search_terms(query)
+        if not terms:
+            return []
+        
+        def like_pattern(text):
+            return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        
+        params = {"limit": limit, "first_prefix": like_pattern(terms[0]) + "%"}
+        use_fts = self._has_search_table(collection_name)
+        long_terms = [term for term in terms if len(term) >= 3] if use_fts else []
+        
+        conditions = []
+        for number, term in enumerate(terms):
+            if term in long_terms:
+                continue
+            if len(term) >= 3:
+                # No trigram index available: plain substring scan
+                patterns = ["%" + like_pattern(term) + "%"]
+                match = "c.{field} LIKE :{name} ESCAPE '\\'"
+            else:
+                patterns = word_start_globs(term)
+                match = "lower(c.{field}) GLOB :{name}"
+            matches = []
+            for pattern_number, pattern in enumerate(patterns):
+                name = f"term_{number}_{pattern_number}"
+                params[name] = pattern
+                matches.extend(match.format(field=field, name=name) for field in fields)
+            conditions.append("(" + " OR ".join(matches) + ")")
+        starts_with_first = " OR ".join(f"c.{field} LIKE :first_prefix ESCAPE '\\'" for field in fields)
+        
+        if long_terms:
+            fts_name = f"{collection_name}_fts"
+            params["match"] = " AND ".join('"' + term.replace('"', '""') + '"' for term in long_terms)
+            extra = "".join(f" AND {condition}" for condition in conditions)
+            sql = (
+                f"SELECT c.* FROM {fts_name} JOIN {collection_name} AS c ON c.rowid = {fts_name}.rowid "
+                f"WHERE {fts_name} MATCH :match{extra} "
+                f"ORDER BY CASE WHEN {starts_with_first} THEN 0 ELSE 1 END, bm25({fts_name}) LIMIT :limit"
+            )
+        else:
+            # Short prefixes only: no ORDER BY, so the scan stops as soon as the limit is filled
+            sql = f"SELECT c.* FROM {collection_name} AS c WHERE {' AND '.join(conditions)} LIMIT :limit"
+        
+        conn = self._get_connection()
+        try:
+            cursor = conn.execute(sql, params)
+            column_names = [col[0] for col in cursor.description]
+            result = [self._row_to_item(column_names, row) for row in cursor.fetchall()]
+            self.logger.debug("Search for '%s' found %s %s", query, len(result), collection_name)
             return result
         except Exception as error:
-            self.logger.error(f"Error reading {collection_name}: {error}", exc_info=True)
+            self.logger.error("Error searching %s: %s", collection_name, error, exc_info=True)
+            raise
+        finally:
+            conn.close()
+    
+    # GRASP – Information Expert: Batched lookup of many keys with chunked IN queries
+    def find_in(self, collection_name, field, values, fields=None, chunk_size=500):
+        values = list(dict.fromkeys(values))
+        column_list = ', '.join(fields) if fields else '*'
+        conn = self._get_connection()
+        
+        try:
+            result = []
+            for start in range(0, len(values), chunk_size):
+                chunk = values[start:start + chunk_size]
+                placeholders = ', '.join(['?' for _ in chunk])
+                cursor = conn.execute(
+                    f"SELECT {column_list} FROM {collection_name} WHERE {field} IN ({placeholders})", chunk
+                )
+                column_names = [col[0] for col in cursor.description]
+                result.extend(self._row_to_item(column_names, row) for row in cursor.fetchall())
+            self.logger.debug("Found %s %s for %s %s values", len(result), collection_name, len(values), field)
+            return result
+        except Exception as error:
+            self.logger.error("Error searching %s: %s", collection_name, error, exc_info=True)
+            raise
+        finally:
+            conn.close()
+    
+    # SOLID – SRP: Aggregation is pushed down to SQL instead of loading rows
+    def sum_column(self, collection_name, column, filters):
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        conditions = []
+        params = []
+        for field, value in filters.items():
+            if isinstance(value, (list, tuple, set)):
+                placeholders = ', '.join(['?' for _ in value])
+                conditions.append(f"{field} IN ({placeholders})")
+                params.extend(value)
+            else:
+                conditions.append(f"{field} = ?")
+                params.append(value)
+        where_clause = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        
+        try:
+            cursor.execute(f"SELECT COALESCE(SUM({column}), 0) FROM {collection_name}{where_clause}", params)
+            return cursor.fetchone()[0]
+        except Exception as error:
+            self.logger.error("Error summing %s.%s: %s", collection_name, column, error, exc_info=True)
+            raise
+        finally:
+            conn.close()
+    
+    # SOLID – SRP: Appends rows without rewriting the rest of the table
+    def insert_items(self, collection_name, items):
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            # Group rows by column set so each group is a single executemany
+            groups = {}
+            for item in items:
+                columns = tuple(item.keys())
+                values = []
+                for column in columns:
+                    value = item[column]
+                    if column == 'is_available' and isinstance(value, bool):
+                        value = 1 if value else 0
+                    values.append(value)
+                groups.setdefault(columns, []).append(values)
+            
+            for columns, rows in groups.items():
+                placeholders = ', '.join(['?' for _ in columns])
+                column_names = ', '.join(columns)
+                sql = f"INSERT INTO {collection_name} ({column_names}) VALUES ({placeholders})"
+                cursor.executemany(sql, rows)
+            
+            conn.commit()
+            self.logger.debug("Inserted %s items into %s", len(items), collection_name)
+        except Exception as error:
+            conn.rollback()
+            self.logger.error("Error inserting into %s: %s", collection_name, error, exc_info=True)
+            raise
+        finally:
+            conn.close()
+    
+    # SOLID – SRP: Adds deltas to counter rows, creating rows that don't exist yet
+    def increment_counters(self, collection_name, key_fields, rows):
+        if not rows:
+            return
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        columns = list(rows[0].keys())
+        counter_fields = [column for column in columns if column not in key_fields]
+        placeholders = ', '.join(['?' for _ in columns])
+        updates = ', '.join(f"{field} = {field} + excluded.{field}" for field in counter_fields)
+        sql = (
+            f"INSERT INTO {collection_name} ({', '.join(columns)}) VALUES ({placeholders}) "
+            f"ON CONFLICT({', '.join(key_fields)}) DO UPDATE SET {updates}"
+        )
+        
+        try:
+            cursor.executemany(sql, [[row[column] for column in columns] for row in rows])
+            conn.commit()
+            self.logger.debug("Incremented %s rows in %s", len(rows), collection_name)
+        except Exception as error:
+            conn.rollback()
+            self.logger.error("Error incrementing %s: %s", collection_name, error, exc_info=True)
+            raise
+        finally:
+            conn.close()
+    
+    # SOLID – SRP: Row-level writes, so one change doesn't rewrite the table
+    def update_item(self, collection_name, item):
+        """Update the row with item's id; returns False when there is no such row."""
+        columns = [column for column in item if column != "id"]
+        values = []
+        for column in columns:
+            value = item[column]
+            if column == 'is_available' and isinstance(value, bool):
+                value = 1 if value else 0
+            values.append(value)
+        assignments = ', '.join(f"{column} = ?" for column in columns)
+        
+        conn = self._get_connection()
+        try:
+            cursor = conn.execute(f"UPDATE {collection_name} SET {assignments} WHERE id = ?", values + [item["id"]])
+            conn.commit()
+            return cursor.rowcount > 0
+        except Exception as error:
+            conn.rollback()
+            self.logger.error("Error updating %s: %s", collection_name, error, exc_info=True)
+            raise
+        finally:
+            conn.close()
+    
+    def delete_item(self, collection_name, item_id):
+        """Delete the row with this id; returns False when there is no such row."""
+        conn = self._get_connection()
+        try:
+            cursor = conn.execute(f"DELETE FROM {collection_name} WHERE id = ?", (item_id,))
+            conn.commit()
+            return cursor.rowcount > 0
+        except Exception as error:
+            conn.rollback()
+            self.logger.error("Error deleting from %s: %s", collection_name, error, exc_info=True)
             raise
         finally:
             conn.close()
@@ -143,10 +706,10 @@ class SQLiteStorage:
                 cursor.execute(sql, values)
             
             conn.commit()
-            self.logger.debug(f"Saved {len(items)} items to {collection_name}")
+            self.logger.debug("Saved %s items to %s", len(items), collection_name)
         except Exception as error:
             conn.rollback()
-            self.logger.error(f"Error writing to {collection_name}: {error}", exc_info=True)
+            self.logger.error("Error writing to %s: %s", collection_name, error, exc_info=True)
             raise
         finally:
             conn.close()
@@ -0,0 +1,71 @@
+from .reservation_service import ReservationService
+from ..repositories.async_sqlite_storage import AsyncSQLiteStorage, DEFAULT_READ_CONNECTIONS, DEFAULT_MAX_BATCH
+from ..utils.logging_config import get_logger
+
+# ReservationService methods that only read, and those that change data
+READ_METHODS = (
+    "get_all_rooms", "get_room", "search_available_rooms",
+    "get_all_guests", "get_guest", "search_guests",
+    "get_all_reservations", "get_reservation", "prefetch_related", "get_reservation_details",
+    "get_balance", "get_all_payments", "get_payment", "get_daily_summary",
+)
+WRITE_METHODS = (
+    "add_room", "update_room", "delete_room",
+    "add_guest", "update_guest", "delete_guest", "merge_guests",
+    "create_reservation", "update_reservation", "delete_reservation", "cancel_reservation",
+    "process_payment", "delete_payment", "rebuild_daily_summary",
+)
+
+
+def _read_method(name):
+    async def method(self, *args, **kwargs):
+        return await self.storage.read(getattr(self.service, name), *args, **kwargs)
+    method.__name__ = name
+    method.__doc__ = f"ReservationService.{name}, run on a pooled read connection."
+    return method
+
+
+def _write_method(name):
+    async def method(self, *args, **kwargs):
+        return await self.storage.write(getattr(self.service, name), *args, **kwargs)
+    method.__name__ = name
+    method.__doc__ = f"ReservationService.{name}, committed by the batching writer."
+    return method
+
+
+# GRASP – Controller: Same use cases as ReservationService, awaitable from async web handlers
+# SOLID – OCP: Reuses ReservationService unchanged; only where each call runs is new
+class AsyncReservationService:
+    """
+    Async ReservationService over AsyncSQLiteStorage.
+    Each method runs the synchronous service method off the event loop: reads concurrently on the
+    read pool, writes one at a time on the writer, where writes queued together share a commit.
+    Card payments charge the gateway inside the write, so a slow gateway holds up the writer.
+    """
+
+    def __init__(self, storage=None, payment_gateway=None, read_connections=DEFAULT_READ_CONNECTIONS,
+                 max_batch=DEFAULT_MAX_BATCH):
+        self.logger = get_logger(__name__)
+        if not isinstance(storage, AsyncSQLiteStorage):
+            storage = AsyncSQLiteStorage(storage, read_connections=read_connections, max_batch=max_batch)
+        self.storage = storage
+        self.service = ReservationService(self.storage.storage, payment_gateway)
+
+    async def start(self):
+        await self.storage.start()
+        return self
+
+    async def close(self):
+        await self.storage.close()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        await self.close()
+
+
+for _name in READ_METHODS:
+    setattr(AsyncReservationService, _name, _read_method(_name))
+for _name in WRITE_METHODS:
+    setattr(AsyncReservationService, _name, _write_method(_name))
@@ -0,0 +1,200 @@
+import json
+import time
+from ..utils.logging_config import get_logger
+
+# Commands that change data; consecutive ones share a transaction
+WRITE_COMMANDS = (
+    "add_room", "update_room", "delete_room",
+    "add_guest", "update_guest", "delete_guest", "merge_guests",
+    "create_reservation", "update_reservation", "cancel_reservation", "delete_reservation",
+    "process_payment", "delete_payment",
+)
+
+READ_COMMANDS = (
+    "get_room", "get_guest", "get_reservation", "get_balance",
+    "get_reservation_details", "search_guests", "search_available_rooms", "get_daily_summary",
+)
+
+DEFAULT_GROUP_SIZE = 500
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def to_plain(value):
+    """Command results as JSON-friendly values."""
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    if hasattr(value, "_asdict"):
+        return value._asdict()
+    if isinstance(value, dict):
+        return {key: to_plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_plain(item) for item in value]
+    return value
+
+
+class _GroupFailed(Exception):
+    """Raised inside a write group to roll it back after a command fails."""
+
+
+# GRASP – Controller: Drives ReservationService from a script instead of the menus
+# SOLID – SRP: Only parses commands, groups them into transactions and times them
+class CommandRunner:
+    """
+    Runs JSON Lines commands such as
+        {"command": "add_room", "as": "r1", "number": "101", "room_type": "standard", "price_per_night": 90}
+        {"command": "create_reservation", "guest_id": "$g1", "room_id": "$r1", ...}
+    against one service. "as" names a result; "$name" in a later argument stands for that result's id.
+    Up to group_size consecutive writes commit together. If one fails, its group is rolled back and
+    replayed one command per transaction, so only the failing command is lost. Card payments that
+    go through a gateway run on their own: a charge can't be rolled back, so it is never replayed.
+    """
+
+    def __init__(self, service, group_size=DEFAULT_GROUP_SIZE):
+        self.service = service
+        self.group_size = group_size
+        self.logger = get_logger(__name__)
+        self.refs = {}
+
+    # ---- Parsing ----
+
+    @staticmethod
+    def read_commands(lines):
+        """Yield (line_number, command) pairs, skipping blank lines and # comments."""
+        for line_number, line in enumerate(lines, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                command = json.loads(line)
+            except json.JSONDecodeError as error:
+                command = {"command": None, "error": f"Invalid JSON: {error}"}
+            yield line_number, command
+
+    def _resolve(self, value):
+        if isinstance(value, str) and value.startswith("$"):
+            name = value[1:]
+            if name not in self.refs:
+                raise ValueError(f"Unknown reference: {value}")
+            result = self.refs[name]
+            return getattr(result, "id", result)
+        if isinstance(value, list):
+            return [self._resolve(item) for item in value]
+        return value
+
+    def _charges_card(self, command):
+        # PaymentFactory accepts the type in any case
+        return (command.get("command") == "process_payment"
+                and str(command.get("payment_type", "")).lower() == "card"
+                and getattr(self.service, "payment_gateway", None) is not None)
+
+    # ---- Execution ----
+
+    def _execute(self, line_number, command):
+        started = time.perf_counter()
+        name = command.get("command")
+        entry = {"line": line_number, "command": name, "ok": True, "result": None, "error": None}
+        try:
+            if "error" in command:
+                raise ValueError(command["error"])
+            if name not in WRITE_COMMANDS and name not in READ_COMMANDS:
+                raise ValueError(f"Unknown command: {name}")
+            arguments = {
+                key: self._resolve(value) for key, value in command.items()
+                if key not in ("command", "as")
+            }
+            result = getattr(self.service, name)(**arguments)
+            if command.get("as"):
+                self.refs[command["as"]] = result
+            entry["result"] = result
+        except Exception as error:
+            entry["ok"] = False
+            entry["error"] = str(error) or repr(error)
+        entry["elapsed"] = time.perf_counter() - started
+        return entry
+
+    def _run_group(self, group):
+        """Run writes in one transaction; on failure, roll back and replay each on its own."""
+        refs_before = dict(self.refs)
+        entries = []
+        try:
+            with self.service.storage.transaction():
+                for line_number, command in group:
+                    entry = self._execute(line_number, command)
+                    entries.append(entry)
+                    if not entry["ok"]:
+                        raise _GroupFailed()
+            return entries
+        except _GroupFailed:
+            pass
+
+        self.logger.warning("Write group of %s commands rolled back; replaying one by one", len(group))
+        self.refs = refs_before
+        # Payments cached during the rolled-back group were never saved
+        self.service.idempotency_cache.clear()
+        entries = []
+        for line_number, command in group:
+            entry = self._execute(line_number, command)
+            entries.append(entry)
+        return entries
+
+    def run(self, commands):
+        """Execute (line_number, command) pairs; returns per-command entries and a summary."""
+        self.logger.info("Running batch commands")
+        started = time.perf_counter()
+        entries = []
+        group = []
+
+        def flush():
+            if group:
+                entries.extend(self._run_group(group))
+                group.clear()
+
+        for line_number, command in commands:
+            if command.get("command") in WRITE_COMMANDS and not self._charges_card(command):
+                group.append((line_number, command))
+                if len(group) >= self.group_size:
+                    flush()
+                continue
+            # Reads, bad commands and card charges commit pending writes first, so they see them
+            flush()
+            entries.append(self._execute(line_number, command))
+        flush()
+
+        elapsed = time.perf_counter() - started
+        summary = self.summarize(entries, elapsed)
+        self.logger.info("Ran %s commands in %.2fs (%s failed, %.0f/s)",
+                         summary['commands'], elapsed, summary['failed'], summary['commands_per_second'])
+        return {"entries": entries, "summary": summary}
+
+    @staticmethod
+    def summarize(entries, elapsed):
+        by_command = {}
+        for entry in entries:
+            by_command.setdefault(entry["command"] or "invalid", []).append(entry["elapsed"])
+
+        latency = {}
+        for name, timings in sorted(by_command.items()):
+            timings.sort()
+            latency[name] = {
+                "count": len(timings),
+                "mean_ms": sum(timings) / len(timings) * 1000,
+                "p50_ms": percentile(timings, 0.50) * 1000,
+                "p95_ms": percentile(timings, 0.95) * 1000,
+                "p99_ms": percentile(timings, 0.99) * 1000,
+            }
+
+        failed = sum(1 for entry in entries if not entry["ok"])
+        return {
+            "commands": len(entries),
+            "succeeded": len(entries) - failed,
+            "failed": failed,
+            "elapsed": elapsed,
+            "commands_per_second": len(entries) / elapsed if elapsed > 0 else 0.0,
+            "latency": latency
+        }
@@ -0,0 +1,174 @@
+import re
+import time
+from collections import Counter
+from itertools import combinations
+from ..utils.logging_config import get_logger
+
+# Blocks larger than this are too generic to say anything (a shared switchboard number, "John Smith")
+DEFAULT_MAX_BLOCK_SIZE = 50
+
+# Phones with fewer digits than this are treated as missing
+MIN_PHONE_DIGITS = 7
+
+# Phones are compared on their trailing digits so country and trunk prefixes don't matter
+PHONE_MATCH_DIGITS = 9
+
+# Share of name tokens two guests need in common before a shared phone counts as a match
+NAME_SIMILARITY_THRESHOLD = 0.5
+
+NON_DIGITS = re.compile(r"\D+")
+NAME_TOKEN = re.compile(r"[^\W_]+")
+
+
+def normalize_email(email):
+    return (email or "").strip().lower()
+
+
+def normalize_phone(phone):
+    digits = NON_DIGITS.sub("", phone or "")
+    return digits[-PHONE_MATCH_DIGITS:] if len(digits) >= MIN_PHONE_DIGITS else ""
+
+
+def email_user(email):
+    return normalize_email(email).split("@")[0]
+
+
+def name_tokens(name):
+    return frozenset(NAME_TOKEN.findall((name or "").lower()))
+
+
+def name_similarity(first, second):
+    """Jaccard similarity of the two names' token sets."""
+    if not first or not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+
+class _DisjointSet:
+    """Union-find over guest ids, so pairwise matches collapse into groups."""
+
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, item):
+        self.parent.setdefault(item, item)
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, first, second):
+        first_root, second_root = self.find(first), self.find(second)
+        if first_root != second_root:
+            self.parent[second_root] = first_root
+
+
+# GRASP – Pure Fabrication: Batch data-quality job kept apart from the booking controller
+# SOLID – SRP: Only finds likely duplicate guests; merging is done by ReservationService
+class GuestDedupService:
+    """
+    Finds guests that are probably the same person.
+    Guests are bucketed by normalised blocking keys (lower-cased email, digits-only phone,
+    sorted name tokens) and only guests sharing a bucket are compared, so the work grows with
+    the number of guests rather than its square.
+    """
+
+    def __init__(self, storage):
+        self.storage = storage
+        self.logger = get_logger(__name__)
+
+    @staticmethod
+    def blocking_keys(guest):
+        keys = []
+        email = normalize_email(guest.get("email"))
+        if email:
+            keys.append(("email", email))
+        phone = normalize_phone(guest.get("phone"))
+        if phone:
+            keys.append(("phone", phone))
+        tokens = name_tokens(guest.get("name"))
+        if tokens:
+            keys.append(("name", " ".join(sorted(tokens))))
+        return keys
+
+    @staticmethod
+    def match_reason(first, second):
+        """Why two guests from the same block are duplicates, or None if they aren't."""
+        email = normalize_email(first["email"])
+        if email and email == normalize_email(second["email"]):
+            return "email"
+        similarity = name_similarity(name_tokens(first["name"]), name_tokens(second["name"]))
+        phone = normalize_phone(first["phone"])
+        if phone and phone == normalize_phone(second["phone"]) and similarity >= NAME_SIMILARITY_THRESHOLD:
+            return "phone and name"
+        user = email_user(first["email"])
+        if similarity == 1.0 and user and user == email_user(second["email"]):
+            return "name and email user"
+        return None
+
+    def find_duplicates(self, max_block_size=DEFAULT_MAX_BLOCK_SIZE):
+        """
+        Groups of duplicate guests, largest first. Each group suggests the guest with the most
+        reservations as the survivor to merge the others into.
+        """
+        self.logger.info("Scanning guests for duplicates")
+        started = time.perf_counter()
+
+        guests = {}
+        blocks = {}
+        for guest in self.storage.iter_collection("guests", fields=["id", "name", "email", "phone"]):
+            guests[guest["id"]] = guest
+            for key in self.blocking_keys(guest):
+                blocks.setdefault(key, []).append(guest["id"])
+
+        groups = _DisjointSet()
+        reasons = {}
+        compared = 0
+        skipped_blocks = 0
+        for (kind, _), guest_ids in blocks.items():
+            if len(guest_ids) < 2:
+                continue
+            if kind == "email":
+                # Same normalised email is always a match, so no pairwise comparison is needed
+                for guest_id in guest_ids:
+                    groups.union(guest_ids[0], guest_id)
+                    reasons.setdefault(guest_id, set()).add("email")
+                continue
+            if len(guest_ids) > max_block_size:
+                skipped_blocks += 1
+                continue
+            for first_id, second_id in combinations(guest_ids, 2):
+                compared += 1
+                reason = self.match_reason(guests[first_id], guests[second_id])
+                if reason:
+                    groups.union(first_id, second_id)
+                    reasons.setdefault(first_id, set()).add(reason)
+                    reasons.setdefault(second_id, set()).add(reason)
+
+        members = {}
+        for guest_id in reasons:
+            members.setdefault(groups.find(guest_id), []).append(guest_id)
+
+        reservation_counts = Counter(
+            row["guest_id"] for row in self.storage.iter_collection("reservations", fields=["guest_id"])
+            if row["guest_id"] in reasons
+        )
+        result = []
+        for guest_ids in members.values():
+            survivor_id = max(guest_ids, key=lambda guest_id: reservation_counts[guest_id])
+            result.append({
+                "survivor_id": survivor_id,
+                "duplicate_ids": [guest_id for guest_id in guest_ids if guest_id != survivor_id],
+                "guests": [guests[guest_id] for guest_id in guest_ids],
+                "reasons": sorted(set().union(*(reasons[guest_id] for guest_id in guest_ids)))
+            })
+        result.sort(key=lambda group: -len(group["guests"]))
+
+        elapsed = time.perf_counter() - started
+        if skipped_blocks:
+            self.logger.warning("Skipped %s blocks larger than %s guests", skipped_blocks, max_block_size)
+        self.logger.info("Found %s duplicate groups among %s guests (%s comparisons) in %.2fs",
+                         len(result), len(guests), compared, elapsed)
+        return result
@@ -0,0 +1,264 @@
+import csv
+import gzip
+import json
+import os
+import time
+from itertools import islice
+from ..models.room import Room
+from ..models.guest import Guest
+from ..models.reservation import Reservation
+from ..repositories.daily_summary_repository import DailySummaryRepository
+from ..repositories.outbox_repository import OutboxRepository
+from .export_service import FORMATS, detect_format
+from ..utils.logging_config import get_logger
+
+COLLECTIONS = ("rooms", "guests", "reservations")
+
+# Natural key each collection is deduplicated on, so rerunning a file without ids adds nothing;
+# rows whose id is already stored are duplicates too
+DEDUP_FIELDS = {
+    "rooms": ("number",),
+    "guests": ("email",),
+    "reservations": ("guest_id", "room_id", "check_in_date", "check_out_date"),
+}
+
+# Outbox event each imported row produces, the same ones ReservationService writes
+IMPORT_EVENTS = {
+    "rooms": "room_added",
+    "guests": "guest_added",
+    "reservations": "reservation_created",
+}
+
+RESERVATION_STATUSES = ("pending", "confirmed", "cancelled")
+
+# Invalid rows beyond this are counted but not listed in the result
+MAX_REPORTED_ERRORS = 100
+
+
+def _parse_bool(value):
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "yes", "y")
+
+
+# GRASP – Pure Fabrication: Import pipeline kept apart from the booking controller
+# SOLID – SRP: Only moves rows from CSV / JSON Lines files into storage
+# SOLID – DIP: Writes through the storage's insert_items and transaction, whatever the backend
+class ImportService:
+    """
+    Streams rooms, guests or reservations from CSV or JSON Lines (optionally gzip-compressed).
+    Each batch is validated with the model constructors, checked against existing keys with one
+    indexed lookup, and written in a single transaction. A checkpoint file records the last
+    committed line, so an interrupted import picks up where it stopped.
+    """
+
+    def __init__(self, storage):
+        self.storage = storage
+        self.summary_repo = DailySummaryRepository(storage)
+        self.outbox_repo = OutboxRepository(storage)
+        self.logger = get_logger(__name__)
+
+    # ---- Reading ----
+
+    @staticmethod
+    def read_records(path, file_format=None):
+        """
+        Yield (line_number, record) pairs; line numbers count data rows from 1. A JSON Lines line
+        that isn't a JSON object is yielded as a ValueError, so it's counted as an invalid row.
+        """
+        file_format = file_format or detect_format(path)
+        if file_format not in FORMATS:
+            raise ValueError(f"Unsupported import format: {file_format}")
+        opener = gzip.open if path.endswith(".gz") else open
+
+        with opener(path, "rt", encoding="utf-8", newline="") as source:
+            if file_format == "csv":
+                for line_number, record in enumerate(csv.DictReader(source), start=1):
+                    yield line_number, record
+                return
+            for line_number, line in enumerate(source, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as error:
+                    yield line_number, ValueError(f"Invalid JSON: {error}")
+                    continue
+                if not isinstance(record, dict):
+                    record = ValueError("Expected a JSON object")
+                yield line_number, record
+
+    @staticmethod
+    def batches(records, batch_size):
+        records = iter(records)
+        while True:
+            batch = list(islice(records, batch_size))
+            if not batch:
+                return
+            yield batch
+
+    # ---- Checkpoints ----
+
+    @staticmethod
+    def load_checkpoint(checkpoint_path, collection_name, path):
+        if not checkpoint_path or not os.path.exists(checkpoint_path):
+            return 0
+        with open(checkpoint_path, encoding="utf-8") as checkpoint_file:
+            checkpoint = json.load(checkpoint_file)
+        if checkpoint.get("collection") != collection_name or checkpoint.get("path") != os.path.abspath(path):
+            raise ValueError(f"Checkpoint {checkpoint_path} belongs to a different import")
+        return checkpoint["line"]
+
+    @staticmethod
+    def save_checkpoint(checkpoint_path, collection_name, path, line_number):
+        # Write then rename, so a crash never leaves a half-written checkpoint
+        temp_path = checkpoint_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as checkpoint_file:
+            json.dump({"collection": collection_name, "path": os.path.abspath(path), "line": line_number},
+                      checkpoint_file)
+        os.replace(temp_path, checkpoint_path)
+
+    # ---- Row builders: the model constructors do the validation ----
+
+    @staticmethod
+    def _keep_id(model, record):
+        if record.get("id"):
+            model.id = record["id"]
+        return model
+
+    def _build_room(self, record, lookups):
+        number = str(record.get("number") or "").strip()
+        room_type = str(record.get("room_type") or "").strip()
+        if not number or not room_type:
+            raise ValueError("Room number and type are required")
+        price = float(record["price_per_night"])
+        capacity = int(record.get("capacity") or 2)
+        if price <= 0 or capacity <= 0:
+            raise ValueError("Price and capacity must be positive")
+        room = Room(number, room_type, price, capacity)
+        if record.get("is_available") not in (None, ""):
+            room.is_available = _parse_bool(record["is_available"])
+        return self._keep_id(room, record)
+
+    def _build_guest(self, record, lookups):
+        return self._keep_id(Guest(record.get("name"), record.get("email"), str(record.get("phone") or "")), record)
+
+    def _build_reservation(self, record, lookups):
+        guest_id = record.get("guest_id") or lookups["guests"].get(record.get("guest_email"))
+        room_id = record.get("room_id") or lookups["rooms"].get(str(record.get("room_number") or ""))
+        if not guest_id:
+            raise ValueError(f"Unknown guest: {record.get('guest_email')}")
+        if not room_id:
+            raise ValueError(f"Unknown room: {record.get('room_number')}")
+        reservation = Reservation(guest_id, room_id, record["check_in_date"], record["check_out_date"])
+        status = record.get("status") or "pending"
+        if status not in RESERVATION_STATUSES:
+            raise ValueError(f"Unknown reservation status: {status}")
+        reservation.status = status
+        return self._keep_id(reservation, record)
+
+    def _reservation_lookups(self, batch):
+        """Resolve guest emails and room numbers for a whole batch with two indexed lookups."""
+        records = [record for _, record in batch if isinstance(record, dict)]
+        emails = [record["guest_email"] for record in records if record.get("guest_email")]
+        numbers = [str(record["room_number"]) for record in records if record.get("room_number")]
+        guests = self.storage.find_in("guests", "email", emails, fields=["id", "email"]) if emails else []
+        rooms = self.storage.find_in("rooms", "number", numbers, fields=["id", "number"]) if numbers else []
+        return {
+            "guests": {guest["email"]: guest["id"] for guest in guests},
+            "rooms": {room["number"]: room["id"] for room in rooms},
+        }
+
+    # ---- Batches ----
+
+    def _import_batch(self, collection_name, batch, stats):
+        build = getattr(self, f"_build_{collection_name[:-1]}")
+        lookups = self._reservation_lookups(batch) if collection_name == "reservations" else {}
+
+        built = []
+        for line_number, record in batch:
+            try:
+                if isinstance(record, Exception):
+                    raise record
+                built.append(build(record, lookups))
+            except (KeyError, TypeError, ValueError) as error:
+                stats["invalid"] += 1
+                if len(stats["errors"]) < MAX_REPORTED_ERRORS:
+                    stats["errors"].append({"line": line_number, "error": str(error) or repr(error)})
+
+        # Two indexed lookups per batch against what is already stored: ids and natural keys
+        fields = DEDUP_FIELDS[collection_name]
+        ids = [model.id for model in built]
+        existing_ids = {row["id"] for row in self.storage.find_in(collection_name, "id", ids, fields=["id"])}
+        first_values = [getattr(model, fields[0]) for model in built]
+        existing = {
+            tuple(row[field] for field in fields)
+            for row in self.storage.find_in(collection_name, fields[0], first_values, fields=list(fields))
+        }
+        fresh = []
+        for model in built:
+            key = tuple(getattr(model, field) for field in fields)
+            if key in existing or model.id in existing_ids:
+                stats["duplicates"] += 1
+                continue
+            existing.add(key)
+            existing_ids.add(model.id)
+            fresh.append(model)
+
+        with self.storage.transaction():
+            if fresh:
+                self.storage.insert_items(collection_name, [model.to_dict() for model in fresh])
+                self.outbox_repo.append_many([
+                    (IMPORT_EVENTS[collection_name], collection_name, model.id, model.to_dict()) for model in fresh
+                ])
+            if collection_name == "reservations":
+                self._record_stays(fresh)
+        stats["imported"] += len(fresh)
+
+    def _record_stays(self, reservations):
+        room_ids = [reservation.room_id for reservation in reservations]
+        rooms = {row["id"]: Room.from_dict(row) for row in self.storage.find_in("rooms", "id", room_ids)}
+        for reservation in reservations:
+            self.summary_repo.record_stay(reservation, rooms.get(reservation.room_id))
+
+    # ---- Entry point ----
+
+    def import_file(self, collection_name, path, batch_size=1000, checkpoint_path=None, file_format=None):
+        if collection_name not in COLLECTIONS:
+            raise ValueError(f"Cannot import {collection_name}; expected one of {', '.join(COLLECTIONS)}")
+        resume_after = self.load_checkpoint(checkpoint_path, collection_name, path)
+        if resume_after:
+            self.logger.info("Resuming import of %s after line %s", path, resume_after)
+        self.logger.info("Importing %s from %s", collection_name, path)
+
+        started = time.perf_counter()
+        stats = {"read": 0, "imported": 0, "duplicates": 0, "invalid": 0, "skipped": resume_after, "errors": []}
+        records = (
+            (line_number, record) for line_number, record in self.read_records(path, file_format)
+            if line_number > resume_after
+        )
+
+        try:
+            for batch in self.batches(records, batch_size):
+                self._import_batch(collection_name, batch, stats)
+                stats["read"] += len(batch)
+                if checkpoint_path:
+                    self.save_checkpoint(checkpoint_path, collection_name, path, batch[-1][0])
+                elapsed = time.perf_counter() - started
+                self.logger.debug("Imported %s %s (%.0f rows/s)",
+                                  stats['imported'], collection_name, stats['read'] / elapsed if elapsed > 0 else 0.0)
+        except Exception as error:
+            self.logger.error("Import of %s failed after %s rows: %s", collection_name, stats['read'], error,
+                              exc_info=True)
+            raise
+
+        elapsed = time.perf_counter() - started
+        self.logger.info("Imported %s %s in %.2fs (%s duplicates, %s invalid)",
+                         stats['imported'], collection_name, elapsed, stats['duplicates'], stats['invalid'])
+        stats.update({
+            "collection": collection_name,
+            "path": path,
+            "elapsed": elapsed,
+            "rows_per_second": stats["read"] / elapsed if elapsed > 0 else 0.0
+        })
+        return stats
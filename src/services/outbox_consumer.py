@@ -0,0 +1,61 @@
+import time
+from ..repositories.outbox_repository import OutboxRepository
+from ..utils.logging_config import get_logger
+
+DEFAULT_BATCH_SIZE = 100
+
+
+# GRASP – Controller: Feeds a downstream system (housekeeping, accounting) the changes it hasn't seen
+# SOLID – SRP: Only reads outbox batches and moves the consumer's offset; handling is up to the caller
+class OutboxConsumer:
+    """
+    Reads the outbox from a named consumer's saved offset.
+    The offset only moves after the handler returns, so a crash replays the unfinished batch:
+    delivery is at least once and handlers should tolerate seeing an event twice.
+    """
+
+    def __init__(self, storage, name, batch_size=DEFAULT_BATCH_SIZE):
+        self.name = name
+        self.batch_size = batch_size
+        self.outbox_repo = OutboxRepository(storage)
+        self.logger = get_logger(__name__)
+        self.position = self.outbox_repo.get_offset(name)
+
+    def poll(self):
+        """The next batch after the current position, without moving it."""
+        return self.outbox_repo.read_after(self.position, self.batch_size)
+
+    def commit(self, position):
+        self.outbox_repo.save_offset(self.name, position)
+        self.position = position
+
+    def lag(self):
+        """How many events the consumer is behind."""
+        return self.outbox_repo.latest_position() - self.position
+
+    def consume(self, handler):
+        """Pass one batch to handler and commit it; returns the number of events handled."""
+        events = self.poll()
+        if not events:
+            return 0
+        try:
+            handler(events)
+        except Exception as error:
+            self.logger.error("Consumer %s failed on events %s-%s: %s",
+                              self.name, events[0]['seq'], events[-1]['seq'], error, exc_info=True)
+            raise
+        self.commit(events[-1]["seq"])
+        return len(events)
+
+    def drain(self, handler):
+        """Consume batches until caught up; returns the total handled."""
+        started = time.perf_counter()
+        total = 0
+        while True:
+            handled = self.consume(handler)
+            if not handled:
+                break
+            total += handled
+        self.logger.info("Consumer %s handled %s events in %.2fs, now at %s",
+                         self.name, total, time.perf_counter() - started, self.position)
+        return total
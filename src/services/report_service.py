@@ -0,0 +1,252 @@
+from datetime import date, timedelta
+from ..repositories.daily_summary_repository import PAID_STATUSES, STAY_NIGHTS_CTE
+from ..utils.logging_config import get_logger
+
+# Open-ended ranges compare as plain ISO strings, so these bound every real date
+EARLIEST_DATE = "0001-01-01"
+LATEST_DATE = "9999-12-31"
+
+
+# GRASP – Pure Fabrication: Reporting is kept out of the booking controller
+# SOLID – SRP: Only aggregates revenue and occupancy figures
+# SOLID – DIP: Works with any storage; SQL storages get the aggregation pushed down
+class ReportService:
+    """
+    Revenue and occupancy reports.
+    Date ranges follow check-out semantics: start is included, end is not.
+    """
+
+    def __init__(self, storage):
+        self.storage = storage
+        self.logger = get_logger(__name__)
+
+    def _uses_sql(self):
+        return getattr(self.storage, "supports_sql", False)
+
+    @staticmethod
+    def _day_count(start_date, end_date):
+        days = (date.fromisoformat(end_date) - date.fromisoformat(start_date)).days
+        if days <= 0:
+            raise ValueError("End date must be after start date")
+        return days
+
+    # ---- JSON path: one pass over the collections already in memory ----
+
+    def _scan_nights(self, start_date, end_date, per_night):
+        """Call per_night(day, room) for every night sold in range."""
+        data = self.storage.read_all()
+        rooms = {room["id"]: room for room in data.get("rooms", [])}
+
+        for reservation in data.get("reservations", []):
+            if reservation.get("status") == "cancelled":
+                continue
+            first = max(reservation["check_in_date"], start_date)
+            last = min(reservation["check_out_date"], end_date)
+            if first >= last:
+                continue
+            room = rooms.get(reservation["room_id"])
+            if room is None:
+                continue
+
+            day = date.fromisoformat(first)
+            stop = date.fromisoformat(last)
+            while day < stop:
+                per_night(day.isoformat(), room)
+                day += timedelta(days=1)
+
+    def _room_count(self):
+        if self._uses_sql():
+            return self.storage.query("SELECT COUNT(*) FROM rooms")[0][0]
+        return len(self.storage.read_collection("rooms"))
+
+    # ---- Reports ----
+
+    def revenue_by_day(self, start_date, end_date):
+        self.logger.debug("Revenue by day %s to %s", start_date, end_date)
+        self._day_count(start_date, end_date)
+        room_count = self._room_count()
+        params = {"start": start_date, "end": end_date}
+
+        if self._uses_sql():
+            rows = self.storage.query(STAY_NIGHTS_CTE + """
+                SELECT stay.day, SUM(rooms.price_per_night), COUNT(*)
+                FROM stay JOIN rooms ON rooms.id = stay.room_id
+                GROUP BY stay.day
+                ORDER BY stay.day
+            """, params)
+        else:
+            totals = {}
+
+            def add_night(day, room):
+                entry = totals.setdefault(day, [0.0, 0])
+                entry[0] += room["price_per_night"]
+                entry[1] += 1
+
+            self._scan_nights(start_date, end_date, add_night)
+            rows = [(day, revenue, nights) for day, (revenue, nights) in sorted(totals.items())]
+
+        return [
+            {
+                "date": day,
+                "revenue": revenue,
+                "nights_sold": nights,
+                "occupancy_rate": nights / room_count if room_count else 0.0
+            }
+            for day, revenue, nights in rows
+        ]
+
+    def revenue_by_room_type(self, start_date=None, end_date=None):
+        self.logger.debug("Revenue by room type %s to %s", start_date, end_date)
+        start_date = start_date or EARLIEST_DATE
+        end_date = end_date or LATEST_DATE
+
+        if self._uses_sql():
+            # Nights are clipped to the range with date arithmetic, no per-night expansion needed
+            rows = self.storage.query("""
+                SELECT rooms.room_type,
+                       SUM(nights * rooms.price_per_night),
+                       SUM(nights)
+                FROM (
+                    SELECT room_id,
+                           CAST(julianday(MIN(check_out_date, :end)) -
+                                julianday(MAX(check_in_date, :start)) AS INTEGER) AS nights
+                    FROM reservations
+                    WHERE status != 'cancelled'
+                      AND check_in_date < :end
+                      AND check_out_date > :start
+                ) AS sold
+                JOIN rooms ON rooms.id = sold.room_id
+                GROUP BY rooms.room_type
+                ORDER BY rooms.room_type
+            """, {"start": start_date, "end": end_date})
+        else:
+            data = self.storage.read_all()
+            rooms = {room["id"]: room for room in data.get("rooms", [])}
+            totals = {}
+            for reservation in data.get("reservations", []):
+                if reservation.get("status") == "cancelled":
+                    continue
+                first = max(reservation["check_in_date"], start_date)
+                last = min(reservation["check_out_date"], end_date)
+                room = rooms.get(reservation["room_id"])
+                if first >= last or room is None:
+                    continue
+                nights = (date.fromisoformat(last) - date.fromisoformat(first)).days
+                entry = totals.setdefault(room["room_type"], [0.0, 0])
+                entry[0] += nights * room["price_per_night"]
+                entry[1] += nights
+            rows = [(room_type, revenue, nights) for room_type, (revenue, nights) in sorted(totals.items())]
+
+        return [
+            {"room_type": room_type, "revenue": revenue, "nights_sold": nights}
+            for room_type, revenue, nights in rows
+        ]
+
+    def revenue_by_payment_type(self, start_date=None, end_date=None):
+        """Money received, grouped by payment type. Dates filter on when the payment was taken."""
+        self.logger.debug("Revenue by payment type %s to %s", start_date, end_date)
+        dated = start_date is not None or end_date is not None
+        start_date = start_date or EARLIEST_DATE
+        end_date = end_date or LATEST_DATE
+
+        if self._uses_sql():
+            date_filter = "AND substr(created_at, 1, 10) >= :start AND substr(created_at, 1, 10) < :end" if dated else ""
+            rows = self.storage.query(f"""
+                SELECT payment_type, SUM(amount), COUNT(*)
+                FROM payments
+                WHERE status IN ('completed', 'partial') {date_filter}
+                GROUP BY payment_type
+                ORDER BY payment_type
+            """, {"start": start_date, "end": end_date})
+        else:
+            totals = {}
+            for payment in self.storage.read_collection("payments"):
+                if payment.get("status") not in PAID_STATUSES:
+                    continue
+                if dated:
+                    taken = (payment.get("created_at") or "")[:10]
+                    if not taken or not start_date <= taken < end_date:
+                        continue
+                entry = totals.setdefault(payment.get("payment_type", "generic"), [0.0, 0])
+                entry[0] += payment["amount"]
+                entry[1] += 1
+            rows = [(payment_type, amount, count) for payment_type, (amount, count) in sorted(totals.items())]
+
+        return [
+            {"payment_type": payment_type, "amount": amount, "payments": count}
+            for payment_type, amount, count in rows
+        ]
+
+    # GRASP – Information Expert: Derives hotel KPIs from nights sold and rooms available
+    def occupancy_summary(self, start_date, end_date):
+        """Occupancy rate, ADR (revenue per night sold) and RevPAR (revenue per night available)."""
+        self.logger.debug("Occupancy summary %s to %s", start_date, end_date)
+        days = self._day_count(start_date, end_date)
+        room_count = self._room_count()
+
+        by_type = self.revenue_by_room_type(start_date, end_date)
+        room_revenue = sum(row["revenue"] for row in by_type)
+        nights_sold = sum(row["nights_sold"] for row in by_type)
+        nights_available = room_count * days
+
+        return {
+            "start_date": start_date,
+            "end_date": end_date,
+            "rooms": room_count,
+            "nights_available": nights_available,
+            "nights_sold": nights_sold,
+            "room_revenue": room_revenue,
+            "occupancy_rate": nights_sold / nights_available if nights_available else 0.0,
+            "adr": room_revenue / nights_sold if nights_sold else 0.0,
+            "revpar": room_revenue / nights_available if nights_available else 0.0
+        }
+
+
+# GRASP – Controller: Chain-wide figures built from each property's own report
+# SOLID – OCP: Reuses ReportService per shard instead of querying across databases
+class ChainReportService:
+    """Reports over every property of a ShardedSQLiteStorage, computed on all shards in parallel."""
+
+    def __init__(self, sharded_storage):
+        self.sharded_storage = sharded_storage
+        self.logger = get_logger(__name__)
+
+    def occupancy_by_property(self, start_date, end_date, property_ids=None):
+        return self.sharded_storage.fan_out(
+            lambda storage: ReportService(storage).occupancy_summary(start_date, end_date), property_ids
+        )
+
+    def occupancy_summary(self, start_date, end_date, property_ids=None):
+        """Occupancy, ADR and RevPAR for the whole chain, plus the per-property summaries."""
+        self.logger.debug("Chain occupancy summary %s to %s", start_date, end_date)
+        by_property = self.occupancy_by_property(start_date, end_date, property_ids)
+        rooms = sum(summary["rooms"] for summary in by_property.values())
+        nights_available = sum(summary["nights_available"] for summary in by_property.values())
+        nights_sold = sum(summary["nights_sold"] for summary in by_property.values())
+        room_revenue = sum(summary["room_revenue"] for summary in by_property.values())
+
+        return {
+            "start_date": start_date,
+            "end_date": end_date,
+            "properties": len(by_property),
+            "rooms": rooms,
+            "nights_available": nights_available,
+            "nights_sold": nights_sold,
+            "room_revenue": room_revenue,
+            "occupancy_rate": nights_sold / nights_available if nights_available else 0.0,
+            "adr": room_revenue / nights_sold if nights_sold else 0.0,
+            "revpar": room_revenue / nights_available if nights_available else 0.0,
+            "by_property": by_property
+        }
+
+    def revenue_by_room_type(self, start_date=None, end_date=None, property_ids=None):
+        by_property = self.sharded_storage.fan_out(
+            lambda storage: ReportService(storage).revenue_by_room_type(start_date, end_date), property_ids
+        )
+        totals = {}
+        for rows in by_property.values():
+            for row in rows:
+                entry = totals.setdefault(row["room_type"], {"room_type": row["room_type"], "revenue": 0.0, "nights_sold": 0})
+                entry["revenue"] += row["revenue"]
+                entry["nights_sold"] += row["nights_sold"]
+        return [totals[room_type] for room_type in sorted(totals)]
@@ -1,3 +1,7 @@
+import threading
+import time
+from datetime import datetime
+
 from ..models.room import Room
 from ..models.guest import Guest
 from ..models.reservation import Reservation
@@ -6,78 +10,154 @@ from ..repositories.room_repository import RoomRepository
 from ..repositories.guest_repository import GuestRepository
 from ..repositories.reservation_repository import ReservationRepository
 from ..repositories.payment_repository import PaymentRepository
+from ..repositories.daily_summary_repository import DailySummaryRepository
+from ..repositories.outbox_repository import OutboxRepository
 from ..factories.payment_factory import PaymentFactory
 from ..utils.logging_config import get_logger
+from ..utils.lru_cache import LRUCache
+from ..utils.query_cache import QueryCache, ALL
+from ..utils.event_bus import EventBus
+
+# Published after a write commits, with the collection and the changed ids (None for "many")
+COLLECTION_CHANGED = "collection_changed"
+
+# Seconds after which a pending idempotency claim counts as abandoned and may be claimed again
+IDEMPOTENCY_CLAIM_TIMEOUT = 300
 
 # GRASP – Controller: Service coordinates operations between repositories and models
 # SOLID – SRP: Service only handles business logic, not persistence or presentation
 # SOLID – DIP: Depends on repository abstractions, not concrete implementations
 class ReservationService:
     
-    def __init__(self):
+    def __init__(self, storage=None, payment_gateway=None, cache_size=1024, track_external_writes=False):
         self.logger = get_logger(__name__)
         self.logger.info("Setting up hotel reservation service...")
         
-        self.storage = SQLiteStorage()
+        # SOLID – DIP: Any storage with the read/write collection interface works
+        self.storage = storage if storage is not None else SQLiteStorage()
         self.room_repo = RoomRepository(self.storage)
         self.guest_repo = GuestRepository(self.storage)
         self.reservation_repo = ReservationRepository(self.storage)
         self.payment_repo = PaymentRepository(self.storage)
+        self.summary_repo = DailySummaryRepository(self.storage)
+        self.outbox_repo = OutboxRepository(self.storage)
+        self.payment_gateway = payment_gateway
+        # Recent idempotency keys -> saved Payment, so POS retries skip storage entirely
+        self.idempotency_cache = LRUCache(max_size=4096)
+        # Serialises claiming a key in this process; the unique index covers other processes
+        self._idempotency_lock = threading.Lock()
+        # Read-through cache for lookups and listings, emptied precisely by change events;
+        # reads inside an open transaction go straight to storage
+        self.query_cache = QueryCache(max_size=cache_size, bypass=self.storage.in_transaction)
+        # Other processes writing the same database don't publish events here; probe for their commits
+        self.change_tracker = None
+        if track_external_writes and cache_size > 0:
+            self.change_tracker = self.storage.change_tracker()
+            self.query_cache.change_source = self.change_tracker.changed_collections
+        self.events = EventBus()
+        self.events.subscribe(COLLECTION_CHANGED, self.query_cache.invalidate)
         
         self.logger.info("Hotel reservation service ready")
     
+    # GRASP – Indirection: Writes announce what changed instead of knowing which caches to clear
+    def _changed(self, collection, ids=None):
+        """Publish COLLECTION_CHANGED once the current write commits (right away outside a transaction)."""
+        self.storage.on_commit(lambda: self.events.publish(COLLECTION_CHANGED, collection=collection, ids=ids))
+    
+    @staticmethod
+    def _payment_event(payment):
+        """Outbox payload for a payment; card numbers stay out of the change log."""
+        payload = payment.to_dict()
+        payload.pop("card_number", None)
+        return payload
+    
+    def cache_stats(self):
+        """Query cache hit ratio and invalidation counts."""
+        return self.query_cache.stats()
+    
     # GRASP – Creator: Service creates Room objects
     # GRASP – Controller: Orchestrates room creation between model and repository
     def add_room(self, number, room_type, price_per_night, capacity=2):
-        self.logger.info(f"Adding new room #{number} ({room_type}) - ${price_per_night}/night for {capacity} guests")
+        self.logger.info("Adding new room #%s (%s) - $%s/night for %s guests",
+                         number, room_type, price_per_night, capacity)
         try:
-            existing_rooms = self.room_repo.get_all()
-            for existing_room in existing_rooms:
-                if existing_room.number == number:
-                    error_msg = f"Room number {number} already exists"
-                    self.logger.warning(error_msg)
-                    raise ValueError(error_msg)
+            if self.room_repo.get_by_number(number):
+                error_msg = f"Room number {number} already exists"
+                self.logger.warning(error_msg)
+                raise ValueError(error_msg)
             
             room = Room(number, room_type, price_per_night, capacity)
-            result = self.room_repo.create(room)
-            self.logger.info(f"Room #{number} added successfully")
+            with self.storage.transaction():
+                result = self.room_repo.create(room)
+                self.outbox_repo.append("room_added", "rooms", room.id, room.to_dict())
+                self._changed("rooms", [room.id])
+            self.logger.info("Room #%s added successfully", number)
             return result
         except Exception as error:
-            self.logger.error(f"Failed to add room #{number}: {error}", exc_info=True)
+            self.logger.error("Failed to add room #%s: %s", number, error, exc_info=True)
             raise
     
     # GRASP – Information Expert: Service delegates to repository
-    def get_all_rooms(self):
+    def get_all_rooms(self, fields=None):
+        """All rooms as models, or as named rows with only `fields` for menus and lookups."""
         self.logger.debug("Loading all rooms...")
         try:
-            rooms = self.room_repo.get_all()
-            self.logger.info(f"Found {len(rooms)} rooms in the system")
+            rooms = self.query_cache.get_or_load(
+                ("get_all_rooms", tuple(fields or ())), [("rooms", ALL)], lambda: self.room_repo.get_all(fields)
+            )
+            self.logger.info("Found %s rooms in the system", len(rooms))
             return rooms
         except Exception as error:
-            self.logger.error(f"Error loading rooms: {error}", exc_info=True)
+            self.logger.error("Error loading rooms: %s", error, exc_info=True)
             raise
     
     def get_room(self, room_id):
-        self.logger.debug(f"Searching for room: {room_id}")
+        self.logger.debug("Searching for room: %s", room_id)
         try:
-            room = self.room_repo.get_by_id(room_id)
+            room = self.query_cache.get_or_load(
+                ("get_room", room_id), [("rooms", room_id)], lambda: self.room_repo.get_by_id(room_id)
+            )
             if room:
-                self.logger.info(f"Room found: {room_id}")
+                self.logger.info("Room found: %s", room_id)
             else:
-                self.logger.warning(f"Room not found: {room_id}")
+                self.logger.warning("Room not found: %s", room_id)
             return room
         except Exception as error:
-            self.logger.error(f"Error searching for room: {error}", exc_info=True)
+            self.logger.error("Error searching for room: %s", error, exc_info=True)
             raise
-    
+
+    # GRASP – Information Expert: Service delegates the availability search to the repository
+    def search_available_rooms(self, room_type=None, min_capacity=None, max_price=None):
+        """Bookable rooms matching the filters, cheapest first."""
+        self.logger.debug("Searching available rooms: type=%s, capacity>=%s, price<=%s",
+                          room_type, min_capacity, max_price)
+        try:
+            rooms = self.query_cache.get_or_load(
+                ("search_available_rooms", room_type, min_capacity, max_price), [("rooms", ALL)],
+                lambda: self.room_repo.find_available(room_type, min_capacity, max_price)
+            )
+            self.logger.info("Found %s available rooms", len(rooms))
+            return rooms
+        except Exception as error:
+            self.logger.error("Error searching available rooms: %s", error, exc_info=True)
+            raise
+
     def update_room(self, room_id, number=None, room_type=None, price_per_night=None, capacity=None, is_available=None):
-        self.logger.info(f"Updating room: {room_id}")
+        self.logger.info("Updating room: %s", room_id)
         try:
             room = self.room_repo.get_by_id(room_id)
             if not room:
-                self.logger.warning(f"Room {room_id} not found")
+                self.logger.warning("Room %s not found", room_id)
                 raise ValueError("Room not found")
             
+            # Summary rows are priced and typed by the room, so re-file them if either changes
+            affects_summary = (
+                (room_type is not None and room_type != room.room_type) or
+                (price_per_night is not None and price_per_night != room.price_per_night)
+            )
+            if affects_summary:
+                old_room = Room.from_dict(room.to_dict())
+            
             if number is not None:
                 room.number = number
             if room_type is not None:
@@ -89,72 +169,100 @@ class ReservationService:
             if is_available is not None:
                 room.is_available = is_available
             
-            result = self.room_repo.update(room)
-            self.logger.info(f"Room {room_id} updated successfully")
+            with self.storage.transaction():
+                result = self.room_repo.update(room)
+                if affects_summary:
+                    self._record_room_history(old_room, -1)
+                    self._record_room_history(room, 1)
+                self.outbox_repo.append("room_updated", "rooms", room_id, room.to_dict())
+                self._changed("rooms", [room_id])
+            self.logger.info("Room %s updated successfully", room_id)
             return result
         except Exception as error:
-            self.logger.error(f"Failed to update room: {error}", exc_info=True)
+            self.logger.error("Failed to update room: %s", error, exc_info=True)
             raise
     
     def delete_room(self, room_id):
-        self.logger.info(f"Deleting room: {room_id}")
+        self.logger.info("Deleting room: %s", room_id)
         try:
-            result = self.room_repo.delete(room_id)
-            self.logger.info(f"Room {room_id} deleted successfully")
+            room = self.room_repo.get_by_id(room_id)
+            with self.storage.transaction():
+                result = self.room_repo.delete(room_id)
+                if room:
+                    self._record_room_history(room, -1)
+                self.outbox_repo.append("room_deleted", "rooms", room_id, {"id": room_id})
+                self._changed("rooms", [room_id])
+            self.logger.info("Room %s deleted successfully", room_id)
             return result
         except Exception as error:
-            self.logger.error(f"Failed to delete room: {error}", exc_info=True)
+            self.logger.error("Failed to delete room: %s", error, exc_info=True)
             raise
     
     # GRASP – Creator: Service creates Guest objects
     def add_guest(self, name, email, phone):
-        self.logger.info(f"Registering new guest: {name} ({email})")
+        self.logger.info("Registering new guest: %s (%s)", name, email)
         try:
             # Check for duplicate email
-            all_guests = self.guest_repo.get_all()
-            for existing_guest in all_guests:
-                if existing_guest.email == email:
-                    error_msg = f"Guest with email {email} already exists"
-                    self.logger.warning(error_msg)
-                    raise ValueError(error_msg)
+            if self.guest_repo.get_by_email(email):
+                error_msg = f"Guest with email {email} already exists"
+                self.logger.warning(error_msg)
+                raise ValueError(error_msg)
             
             guest = Guest(name, email, phone)
-            result = self.guest_repo.create(guest)
-            self.logger.info(f"Guest {name} registered successfully")
+            with self.storage.transaction():
+                result = self.guest_repo.create(guest)
+                self.outbox_repo.append("guest_added", "guests", guest.id, guest.to_dict())
+                self._changed("guests", [guest.id])
+            self.logger.info("Guest %s registered successfully", name)
             return result
         except Exception as error:
-            self.logger.error(f"Failed to register guest {name}: {error}", exc_info=True)
+            self.logger.error("Failed to register guest %s: %s", name, error, exc_info=True)
             raise
     
-    def get_all_guests(self):
+    def get_all_guests(self, fields=None):
         self.logger.debug("Loading all guests...")
         try:
-            guests = self.guest_repo.get_all()
-            self.logger.info(f"Found {len(guests)} guests in the system")
+            guests = self.query_cache.get_or_load(
+                ("get_all_guests", tuple(fields or ())), [("guests", ALL)], lambda: self.guest_repo.get_all(fields)
+            )
+            self.logger.info("Found %s guests in the system", len(guests))
             return guests
         except Exception as error:
-            self.logger.error(f"Error loading guests: {error}", exc_info=True)
+            self.logger.error("Error loading guests: %s", error, exc_info=True)
             raise
     
     def get_guest(self, guest_id):
-        self.logger.debug(f"Searching for guest: {guest_id}")
+        self.logger.debug("Searching for guest: %s", guest_id)
         try:
-            guest = self.guest_repo.get_by_id(guest_id)
+            guest = self.query_cache.get_or_load(
+                ("get_guest", guest_id), [("guests", guest_id)], lambda: self.guest_repo.get_by_id(guest_id)
+            )
             if guest:
-                self.logger.info(f"Guest found: {guest_id}")
+                self.logger.info("Guest found: %s", guest_id)
             else:
-                self.logger.warning(f"Guest not found: {guest_id}")
+                self.logger.warning("Guest not found: %s", guest_id)
             return guest
         except Exception as error:
-            self.logger.error(f"Error searching for guest: {error}", exc_info=True)
+            self.logger.error("Error searching for guest: %s", error, exc_info=True)
+            raise
+    
+    def search_guests(self, query, limit=20):
+        """Guests whose name, email or phone contain every word of the query, best matches first."""
+        self.logger.debug("Searching guests for: %s", query)
+        try:
+            guests = self.guest_repo.search(query, limit)
+            self.logger.info("Found %s guests matching '%s'", len(guests), query)
+            return guests
+        except Exception as error:
+            self.logger.error("Guest search failed: %s", error, exc_info=True)
             raise
     
     def update_guest(self, guest_id, name=None, email=None, phone=None):
-        self.logger.info(f"Updating guest: {guest_id}")
+        self.logger.info("Updating guest: %s", guest_id)
         try:
             guest = self.guest_repo.get_by_id(guest_id)
             if not guest:
-                self.logger.warning(f"Guest {guest_id} not found")
+                self.logger.warning("Guest %s not found", guest_id)
                 raise ValueError("Guest not found")
             
             if name is not None:
@@ -164,142 +272,262 @@ class ReservationService:
             if phone is not None:
                 guest.phone = phone
             
-            result = self.guest_repo.update(guest)
-            self.logger.info(f"Guest {guest_id} updated successfully")
+            with self.storage.transaction():
+                result = self.guest_repo.update(guest)
+                self.outbox_repo.append("guest_updated", "guests", guest_id, guest.to_dict())
+                self._changed("guests", [guest_id])
+            self.logger.info("Guest %s updated successfully", guest_id)
             return result
         except Exception as error:
-            self.logger.error(f"Failed to update guest: {error}", exc_info=True)
+            self.logger.error("Failed to update guest: %s", error, exc_info=True)
             raise
     
     def delete_guest(self, guest_id):
-        self.logger.info(f"Deleting guest: {guest_id}")
+        self.logger.info("Deleting guest: %s", guest_id)
         try:
-            result = self.guest_repo.delete(guest_id)
-            self.logger.info(f"Guest {guest_id} deleted successfully")
+            with self.storage.transaction():
+                result = self.guest_repo.delete(guest_id)
+                self.outbox_repo.append("guest_deleted", "guests", guest_id, {"id": guest_id})
+                self._changed("guests", [guest_id])
+            self.logger.info("Guest %s deleted successfully", guest_id)
             return result
         except Exception as error:
-            self.logger.error(f"Failed to delete guest: {error}", exc_info=True)
+            self.logger.error("Failed to delete guest: %s", error, exc_info=True)
+            raise
+    
+    # GRASP – Controller: Folds duplicate guest records into one, keeping their bookings
+    def merge_guests(self, survivor_id, duplicate_ids):
+        """Repoint the duplicates' reservations to the survivor and delete the duplicates, atomically."""
+        self.logger.info("Merging guests %s into %s", ', '.join(duplicate_ids), survivor_id)
+        try:
+            if survivor_id in duplicate_ids:
+                raise ValueError("A guest cannot be merged into itself")
+            
+            with self.storage.transaction():
+                survivor = self.guest_repo.get_by_id(survivor_id)
+                if not survivor:
+                    raise ValueError("Guest not found")
+                
+                moved = 0
+                for duplicate_id in duplicate_ids:
+                    if not self.guest_repo.get_by_id(duplicate_id):
+                        raise ValueError(f"Guest not found: {duplicate_id}")
+                    for reservation in self.reservation_repo.get_by_guest(duplicate_id):
+                        reservation.guest_id = survivor_id
+                        self.reservation_repo.update(reservation)
+                        moved += 1
+                    self.guest_repo.delete(duplicate_id)
+                
+                self.outbox_repo.append("guests_merged", "guests", survivor_id, {
+                    "survivor_id": survivor_id, "duplicate_ids": list(duplicate_ids), "moved_reservations": moved
+                })
+                self._changed("guests", [survivor_id] + list(duplicate_ids))
+                if moved:
+                    self._changed("reservations")
+            
+            self.logger.info("Merged %s guests into %s, moved %s reservations",
+                             len(duplicate_ids), survivor_id, moved)
+            return survivor
+        except Exception as error:
+            self.logger.error("Failed to merge guests: %s", error, exc_info=True)
             raise
     
     # GRASP – Controller: Coordinates reservation creation across multiple objects
     # CUPID – Predictable: Validates room availability before creating reservation
     def create_reservation(self, guest_id, room_id, check_in_date, check_out_date):
-        self.logger.info(f"Creating reservation: Guest {guest_id} → Room {room_id} ({check_in_date} to {check_out_date})")
+        self.logger.info("Creating reservation: Guest %s → Room %s (%s to %s)",
+                         guest_id, room_id, check_in_date, check_out_date)
         try:
             room = self.room_repo.get_by_id(room_id)
             if not room:
-                self.logger.warning(f"Room {room_id} doesn't exist")
+                self.logger.warning("Room %s doesn't exist", room_id)
                 raise ValueError("Room not found")
             if not room.is_available:
-                self.logger.warning(f"Room {room_id} is already booked")
+                self.logger.warning("Room %s is already booked", room_id)
                 raise ValueError("Room is not available")
             
             # GRASP – Creator: Service creates Reservation
             reservation = Reservation(guest_id, room_id, check_in_date, check_out_date)
-            saved_reservation = self.reservation_repo.create(reservation)
-            
-            # GRASP – Controller: Service coordinates room status update
-            room.is_available = False
-            self.room_repo.update(room)
+            with self.storage.transaction():
+                saved_reservation = self.reservation_repo.create(reservation)
+                
+                # GRASP – Controller: Service coordinates room status update
+                room.is_available = False
+                self.room_repo.update(room)
+                self.summary_repo.record_stay(saved_reservation, room)
+                self.outbox_repo.append(
+                    "reservation_created", "reservations", saved_reservation.id, saved_reservation.to_dict()
+                )
+                self._changed("reservations", [saved_reservation.id])
+                self._changed("rooms", [room_id])
             
-            self.logger.info(f"Reservation confirmed! Booking ID: {saved_reservation.id}")
+            self.logger.info("Reservation confirmed! Booking ID: %s", saved_reservation.id)
             return saved_reservation
         except Exception as error:
-            self.logger.error(f"Reservation failed: {error}", exc_info=True)
+            self.logger.error("Reservation failed: %s", error, exc_info=True)
             raise
     
-    def get_all_reservations(self):
+    def get_all_reservations(self, fields=None):
         self.logger.debug("Loading all reservations...")
         try:
-            reservations = self.reservation_repo.get_all()
-            self.logger.info(f"Found {len(reservations)} active reservations")
+            reservations = self.query_cache.get_or_load(
+                ("get_all_reservations", tuple(fields or ())), [("reservations", ALL)],
+                lambda: self.reservation_repo.get_all(fields)
+            )
+            self.logger.info("Found %s active reservations", len(reservations))
             return reservations
         except Exception as error:
-            self.logger.error(f"Error loading reservations: {error}", exc_info=True)
+            self.logger.error("Error loading reservations: %s", error, exc_info=True)
+            raise
+    
+    # GRASP – Controller: Dataloader-style batch loading of a reservation list's relations
+    def prefetch_related(self, reservations, include=("guests", "rooms", "payments")):
+        """
+        Load the guests, rooms and payments of many reservations with one query per relation.
+        Returns {"guests": {id: Guest}, "rooms": {id: Room}, "payments": {reservation_id: [Payment]}}
+        for the relations asked for.
+        """
+        reservations = list(reservations)
+        self.logger.debug("Prefetching %s for %s reservations", ', '.join(include), len(reservations))
+        try:
+            related = {}
+            if "guests" in include:
+                guests = self.guest_repo.get_many([reservation.guest_id for reservation in reservations])
+                related["guests"] = {guest.id: guest for guest in guests}
+            if "rooms" in include:
+                rooms = self.room_repo.get_many([reservation.room_id for reservation in reservations])
+                related["rooms"] = {room.id: room for room in rooms}
+            if "payments" in include:
+                related["payments"] = self.payment_repo.get_by_reservations(
+                    [reservation.id for reservation in reservations]
+                )
+            return related
+        except Exception as error:
+            self.logger.error("Error prefetching reservation relations: %s", error, exc_info=True)
             raise
     
     def get_reservation(self, reservation_id):
-        self.logger.debug(f"Searching for reservation: {reservation_id}")
+        self.logger.debug("Searching for reservation: %s", reservation_id)
         try:
-            reservation = self.reservation_repo.get_by_id(reservation_id)
+            reservation = self.query_cache.get_or_load(
+                ("get_reservation", reservation_id), [("reservations", reservation_id)],
+                lambda: self.reservation_repo.get_by_id(reservation_id)
+            )
             if reservation:
-                self.logger.info(f"Reservation found: {reservation_id}")
+                self.logger.info("Reservation found: %s", reservation_id)
             else:
-                self.logger.warning(f"Reservation not found: {reservation_id}")
+                self.logger.warning("Reservation not found: %s", reservation_id)
             return reservation
         except Exception as error:
-            self.logger.error(f"Error searching for reservation: {error}", exc_info=True)
+            self.logger.error("Error searching for reservation: %s", error, exc_info=True)
             raise
     
     def update_reservation(self, reservation_id, check_in_date=None, check_out_date=None):
-        self.logger.info(f"Updating reservation: {reservation_id}")
+        self.logger.info("Updating reservation: %s", reservation_id)
         try:
             reservation = self.reservation_repo.get_by_id(reservation_id)
             if not reservation:
-                self.logger.warning(f"Reservation {reservation_id} not found")
+                self.logger.warning("Reservation %s not found", reservation_id)
                 raise ValueError("Reservation not found")
             
-            if check_in_date is not None:
-                reservation.check_in_date = check_in_date
-            if check_out_date is not None:
-                reservation.check_out_date = check_out_date
-            
-            result = self.reservation_repo.update(reservation)
-            self.logger.info(f"Reservation {reservation_id} updated successfully")
+            room = self.room_repo.get_by_id(reservation.room_id)
+            with self.storage.transaction():
+                self.summary_repo.record_stay(reservation, room, -1)
+                
+                if check_in_date is not None:
+                    reservation.check_in_date = check_in_date
+                if check_out_date is not None:
+                    reservation.check_out_date = check_out_date
+                
+                result = self.reservation_repo.update(reservation)
+                self.summary_repo.record_stay(reservation, room)
+                self.outbox_repo.append("reservation_updated", "reservations", reservation_id, reservation.to_dict())
+                self._changed("reservations", [reservation_id])
+            self.logger.info("Reservation %s updated successfully", reservation_id)
             return result
         except Exception as error:
-            self.logger.error(f"Failed to update reservation: {error}", exc_info=True)
+            self.logger.error("Failed to update reservation: %s", error, exc_info=True)
             raise
     
     def delete_reservation(self, reservation_id):
-        self.logger.info(f"Deleting reservation: {reservation_id}")
+        self.logger.info("Deleting reservation: %s", reservation_id)
         try:
             reservation = self.reservation_repo.get_by_id(reservation_id)
             if not reservation:
-                self.logger.warning(f"Reservation {reservation_id} not found")
+                self.logger.warning("Reservation %s not found", reservation_id)
                 raise ValueError("Reservation not found")
             
             room = self.room_repo.get_by_id(reservation.room_id)
-            if room:
-                room.is_available = True
-                self.room_repo.update(room)
-            
-            result = self.reservation_repo.delete(reservation_id)
-            self.logger.info(f"Reservation {reservation_id} deleted successfully")
+            # Its payments go with it, or they'd be left pointing at nothing
+            payments = self.payment_repo.get_by_reservation(reservation_id)
+            with self.storage.transaction():
+                if room:
+                    room.is_available = True
+                    self.room_repo.update(room)
+                
+                for payment in payments:
+                    self.payment_repo.delete(payment.id)
+                    self.outbox_repo.append("payment_deleted", "payments", payment.id, {"id": payment.id})
+                if payments:
+                    self.summary_repo.record_payments(
+                        [(payment, room.room_type if room else None) for payment in payments], -1
+                    )
+                    self._changed("payments", [payment.id for payment in payments])
+                
+                result = self.reservation_repo.delete(reservation_id)
+                self.summary_repo.record_stay(reservation, room, -1)
+                self.outbox_repo.append("reservation_deleted", "reservations", reservation_id, reservation.to_dict())
+                self._changed("reservations", [reservation_id])
+                self._changed("rooms", [reservation.room_id])
+            for payment in payments:
+                if payment.idempotency_key:
+                    self.idempotency_cache.pop(payment.idempotency_key)
+            self.logger.info("Reservation %s deleted successfully", reservation_id)
             return result
         except Exception as error:
-            self.logger.error(f"Failed to delete reservation: {error}", exc_info=True)
+            self.logger.error("Failed to delete reservation: %s", error, exc_info=True)
             raise
     
     # GRASP – Controller: Orchestrates cancellation across reservation and room
     def cancel_reservation(self, reservation_id):
-        self.logger.info(f"Cancelling reservation: {reservation_id}")
+        self.logger.info("Cancelling reservation: %s", reservation_id)
         try:
             reservation = self.reservation_repo.get_by_id(reservation_id)
             if not reservation:
-                self.logger.warning(f"Reservation {reservation_id} not found")
+                self.logger.warning("Reservation %s not found", reservation_id)
                 raise ValueError("Reservation not found")
             
-            reservation.cancel()
-            self.reservation_repo.update(reservation)
-            
-            # GRASP – Controller: Service updates room availability
             room = self.room_repo.get_by_id(reservation.room_id)
-            if room:
-                room.is_available = True
-                self.room_repo.update(room)
+            with self.storage.transaction():
+                # Remove the nights before the status flips, since cancelled stays aren't counted
+                self.summary_repo.record_stay(reservation, room, -1)
+                reservation.cancel()
+                self.reservation_repo.update(reservation)
+                
+                # GRASP – Controller: Service updates room availability
+                if room:
+                    room.is_available = True
+                    self.room_repo.update(room)
+                self.outbox_repo.append("reservation_cancelled", "reservations", reservation_id, reservation.to_dict())
+                self._changed("reservations", [reservation_id])
+                self._changed("rooms", [reservation.room_id])
             
-            self.logger.info(f"Reservation {reservation_id} cancelled successfully")
+            self.logger.info("Reservation %s cancelled successfully", reservation_id)
             return reservation
         except Exception as error:
-            self.logger.error(f"Cancellation failed: {error}", exc_info=True)
+            self.logger.error("Cancellation failed: %s", error, exc_info=True)
             raise
     
     # GRASP – Controller: Coordinates payment processing via factory
     # SOLID – OCP: Uses factory to create payment types without modifying service
-    def process_payment(self, reservation_id, amount, payment_type, card_number=""):
-        self.logger.info(f"Processing ${amount:.2f} {payment_type} payment for reservation {reservation_id}")
+    def process_payment(self, reservation_id, amount, payment_type, card_number="", idempotency_key=None):
+        self.logger.info("Processing $%.2f %s payment for reservation %s", amount, payment_type, reservation_id)
         try:
+            if idempotency_key is not None:
+                existing = self._find_idempotent_payment(idempotency_key)
+                if existing is not None and not self._claim_expired(existing):
+                    return self._repeated_payment(existing, idempotency_key, reservation_id, amount)
+            
             # Get reservation to calculate total cost
             reservation = self.reservation_repo.get_by_id(reservation_id)
             if not reservation:
@@ -309,67 +537,361 @@ class ReservationService:
             if not room:
                 raise ValueError("Room not found")
             
-            # Calculate total cost
-            from datetime import datetime
-            check_in = datetime.strptime(reservation.check_in_date, "%Y-%m-%d")
-            check_out = datetime.strptime(reservation.check_out_date, "%Y-%m-%d")
-            nights = (check_out - check_in).days
-            total_cost = room.price_per_night * nights
+            total_cost = room.price_per_night * reservation.nights()
             
             # Calculate total paid amount (including this payment)
-            all_payments = self.payment_repo.get_all()
-            paid_amount = sum(p.amount for p in all_payments if p.reservation_id == reservation_id)
+            paid_amount = self.payment_repo.get_total_paid(reservation_id)
             total_paid = paid_amount + amount
             
             # GRASP – Creator: Delegates payment creation to factory
-            payment = PaymentFactory.create_payment(payment_type, reservation_id, amount, card_number)
+            payment = PaymentFactory.create_payment(
+                payment_type, reservation_id, amount, card_number, self.payment_gateway
+            )
+            payment.idempotency_key = idempotency_key
             
-            # Set status based on whether reservation is fully paid
-            if total_paid >= total_cost:
-                payment.status = "completed"
-                self.logger.info(f"Reservation fully paid: ${total_paid:.2f} of ${total_cost:.2f}")
-            else:
-                payment.status = "partial"
-                self.logger.info(f"Partial payment: ${total_paid:.2f} of ${total_cost:.2f}")
+            # The key is claimed before the card is charged, so a concurrent submission can't charge it too
+            if idempotency_key is not None:
+                existing = self._claim_idempotency_key(payment)
+                if existing is not None:
+                    return self._repeated_payment(existing, idempotency_key, reservation_id, amount)
             
-            saved_payment = self.payment_repo.create(payment)
+            declined = False
+            try:
+                # Card payments are charged through the gateway when one is configured
+                if self.payment_gateway is not None and payment.payment_type == "card":
+                    if not payment.process():
+                        declined = payment.status == "failed"
+                        if declined:
+                            raise ValueError("Card payment was declined")
+                        raise ValueError("Card payment outcome is unknown; retry with the same idempotency key")
+                
+                # Set status based on whether reservation is fully paid
+                if total_paid >= total_cost:
+                    payment.status = "completed"
+                    self.logger.info("Reservation fully paid: $%.2f of $%.2f", total_paid, total_cost)
+                else:
+                    payment.status = "partial"
+                    self.logger.info("Partial payment: $%.2f of $%.2f", total_paid, total_cost)
+                
+                with self.storage.transaction():
+                    if idempotency_key is None:
+                        saved_payment = self.payment_repo.create(payment)
+                    else:
+                        self.payment_repo.update(payment)
+                        saved_payment = payment
+                    self.summary_repo.record_payment(saved_payment, room.room_type)
+                    self.outbox_repo.append(
+                        "payment_processed", "payments", saved_payment.id, self._payment_event(saved_payment)
+                    )
+                    self._changed("payments", [saved_payment.id])
+            except Exception:
+                if idempotency_key is not None:
+                    self._release_idempotency_key(payment, declined)
+                raise
             
-            self.logger.info(f"Payment ${amount:.2f} processed successfully")
+            if idempotency_key is not None:
+                self.idempotency_cache.put(idempotency_key, saved_payment)
+            self.logger.info("Payment $%.2f processed successfully", amount)
             return saved_payment
         except Exception as error:
-            self.logger.error(f"Payment failed: {error}", exc_info=True)
+            self.logger.error("Payment failed: %s", error, exc_info=True)
+            raise
+    
+    def _find_idempotent_payment(self, idempotency_key):
+        payment = self.idempotency_cache.get(idempotency_key)
+        if payment is not None:
+            return payment
+        
+        payment = self.payment_repo.get_by_idempotency_key(idempotency_key)
+        # A pending or unknown payment may yet be released or reclaimed
+        if payment is not None and payment.status not in ("pending", "unknown"):
+            self.idempotency_cache.put(idempotency_key, payment)
+        return payment
+    
+    @staticmethod
+    def _claim_expired(payment):
+        """True if payment's key may be claimed again: its charge outcome is unknown or its claim went stale."""
+        if payment.status == "unknown":
+            return True
+        if payment.status != "pending":
+            return False
+        # A claim left behind by a process that died before finishing the payment
+        if not payment.created_at:
+            return True
+        claimed = datetime.fromisoformat(payment.created_at)
+        return (datetime.now() - claimed).total_seconds() > IDEMPOTENCY_CLAIM_TIMEOUT
+    
+    def _claim_idempotency_key(self, payment):
+        """Save payment as pending under its key; returns the payment already holding the key instead, if any."""
+        with self._idempotency_lock:
+            existing = self.payment_repo.get_by_idempotency_key(payment.idempotency_key)
+            if existing is not None:
+                if not self._claim_expired(existing) or not self._same_payment(existing, payment):
+                    return existing
+                # Retried under the same key, so the gateway replays the earlier charge if it went through
+                self.logger.warning("Reclaiming %s payment %s for idempotency key %s",
+                                    existing.status, existing.id, payment.idempotency_key)
+                payment.id = existing.id
+                self.payment_repo.update(payment)
+                return None
+            try:
+                self.payment_repo.create(payment)
+            except Exception:
+                # Another process won the race for the unique index
+                existing = self.payment_repo.get_by_idempotency_key(payment.idempotency_key)
+                if existing is None:
+                    raise
+                return existing
+        return None
+    
+    def _release_idempotency_key(self, payment, declined):
+        """Free the key after a decline; otherwise the card may have been charged, so keep the claim as unknown."""
+        try:
+            if declined:
+                # Nothing was charged, so the submission may be retried with the same key
+                self.payment_repo.delete(payment.id)
+            else:
+                payment.status = "unknown"
+                self.payment_repo.update(payment)
+        except Exception as error:
+            # The claim goes stale after IDEMPOTENCY_CLAIM_TIMEOUT and is reclaimed then
+            self.logger.error("Could not release idempotency key %s: %s", payment.idempotency_key, error)
+    
+    @staticmethod
+    def _same_payment(existing, payment):
+        return (existing.reservation_id == payment.reservation_id
+                and float(existing.amount) == float(payment.amount))
+    
+    def _repeated_payment(self, existing, idempotency_key, reservation_id, amount):
+        if existing.reservation_id != reservation_id or float(existing.amount) != float(amount):
+            self.logger.warning("Idempotency key %s reused for a different payment", idempotency_key)
+            raise ValueError(f"Idempotency key {idempotency_key} was already used for a different payment")
+        if existing.status in ("pending", "unknown"):
+            self.logger.warning("Duplicate submission %s while payment %s is in progress", idempotency_key, existing.id)
+            raise ValueError(f"Payment for idempotency key {idempotency_key} is still being processed")
+        self.logger.info("Duplicate submission %s, returning payment %s", idempotency_key, existing.id)
+        return existing
+    
+    # GRASP – Controller: Settles many payments at once
+    # SOLID – SRP: Each worker only processes one payment; persistence happens once at the end
+    def process_payments_batch(self, items, workers=4):
+        self.logger.info("Processing batch of %s payments with %s workers", len(items), workers)
+        started = time.perf_counter()
+        results = [{"index": i, "payment": None, "error": None, "elapsed": 0.0} for i in range(len(items))]
+        
+        def run_item(index):
+            item = items[index]
+            item_started = time.perf_counter()
+            try:
+                payment = PaymentFactory.create_payment(
+                    item["payment_type"],
+                    item["reservation_id"],
+                    item["amount"],
+                    item.get("card_number", ""),
+                    self.payment_gateway
+                )
+                if not payment.process():
+                    raise ValueError("Payment processing failed")
+                results[index]["payment"] = payment
+            except Exception as error:
+                results[index]["error"] = str(error)
+            results[index]["elapsed"] = time.perf_counter() - item_started
+        
+        # Imported here so every CLI start doesn't pay for the thread pool machinery
+        from concurrent.futures import ThreadPoolExecutor
+        
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(run_item, range(len(items))))
+            
+            # Ledger status is decided in submission order, one balance lookup per reservation
+            balances = {}
+            to_save = []
+            room_types = []
+            for result in results:
+                payment = result["payment"]
+                if payment is None:
+                    continue
+                
+                reservation_id = payment.reservation_id
+                if reservation_id not in balances:
+                    reservation = self.reservation_repo.get_by_id(reservation_id)
+                    if reservation is None:
+                        balances[reservation_id] = ValueError("Reservation not found")
+                    else:
+                        room = self.room_repo.get_by_id(reservation.room_id)
+                        balance = self._build_balance(reservation, room)
+                        room_type = room.room_type if room else None
+                        balances[reservation_id] = [balance["amount_due"], balance["amount_paid"], room_type]
+                
+                ledger = balances[reservation_id]
+                if isinstance(ledger, Exception):
+                    result["payment"] = None
+                    result["error"] = str(ledger)
+                    continue
+                
+                ledger[1] += payment.amount
+                payment.status = "completed" if ledger[1] >= ledger[0] else "partial"
+                to_save.append(payment)
+                room_types.append((payment, ledger[2]))
+            
+            if to_save:
+                with self.storage.transaction():
+                    self.payment_repo.create_many(to_save)
+                    self.summary_repo.record_payments(room_types)
+                    self.outbox_repo.append_many([
+                        ("payment_processed", "payments", payment.id, self._payment_event(payment))
+                        for payment in to_save
+                    ])
+                    self._changed("payments", [payment.id for payment in to_save])
+            
+            elapsed = time.perf_counter() - started
+            failed = len(items) - len(to_save)
+            summary = {
+                "results": results,
+                "succeeded": len(to_save),
+                "failed": failed,
+                "elapsed": elapsed,
+                "throughput": len(items) / elapsed if elapsed > 0 else 0.0
+            }
+            self.logger.info("Batch finished: %s saved, %s failed, %.1f payments/s",
+                             len(to_save), failed, summary['throughput'])
+            return summary
+        except Exception as error:
+            self.logger.error("Batch payment failed: %s", error, exc_info=True)
+            raise
+    
+    # GRASP – Information Expert: Service combines room price, stay length and payments
+    def get_balance(self, reservation_id):
+        self.logger.debug("Calculating balance for reservation: %s", reservation_id)
+        try:
+            reservation = self.reservation_repo.get_by_id(reservation_id)
+            if not reservation:
+                raise ValueError("Reservation not found")
+            
+            room = self.room_repo.get_by_id(reservation.room_id)
+            return self._build_balance(reservation, room)
+        except Exception as error:
+            self.logger.error("Error calculating balance: %s", error, exc_info=True)
+            raise
+    
+    def _build_balance(self, reservation, room):
+        nights = reservation.nights()
+        amount_due = room.price_per_night * nights if room else 0
+        amount_paid = self.payment_repo.get_total_paid(reservation.id)
+        remaining = amount_due - amount_paid
+        
+        return {
+            "reservation_id": reservation.id,
+            "nights": nights,
+            "amount_due": amount_due,
+            "amount_paid": amount_paid,
+            "remaining": remaining,
+            "status": self._balance_status(amount_paid, remaining)
+        }
+    
+    @staticmethod
+    def _balance_status(amount_paid, remaining):
+        if amount_paid == 0:
+            return "unpaid"
+        if remaining > 0:
+            return "partial"
+        if remaining == 0:
+            return "paid"
+        return "overpaid"
+    
+    # GRASP – Controller: One joined read for screens that list reservations with names and balances
+    def get_reservation_details(self, reservation_id=None):
+        """
+        Denormalised reservation rows: reservation fields plus guest name, room number/type,
+        nights, amount due, amount paid, remaining and balance_status. Pass an id for a single row.
+        """
+        self.logger.debug("Loading reservation details: %s", reservation_id or 'all')
+        try:
+            details = self.reservation_repo.get_details(reservation_id)
+            for row in details:
+                nights = Reservation.count_nights(row["check_in_date"], row["check_out_date"])
+                row["nights"] = nights
+                row["amount_due"] = (row["price_per_night"] or 0) * nights
+                row["remaining"] = row["amount_due"] - row["amount_paid"]
+                row["balance_status"] = self._balance_status(row["amount_paid"], row["remaining"])
+            self.logger.info("Loaded details for %s reservations", len(details))
+            return details
+        except Exception as error:
+            self.logger.error("Error loading reservation details: %s", error, exc_info=True)
             raise
     
-    def get_all_payments(self):
+    def get_all_payments(self, fields=None):
         self.logger.debug("Loading payment history...")
         try:
-            payments = self.payment_repo.get_all()
-            self.logger.info(f"Found {len(payments)} payment records")
+            payments = self.query_cache.get_or_load(
+                ("get_all_payments", tuple(fields or ())), [("payments", ALL)], lambda: self.payment_repo.get_all(fields)
+            )
+            self.logger.info("Found %s payment records", len(payments))
             return payments
         except Exception as error:
-            self.logger.error(f"Error loading payments: {error}", exc_info=True)
+            self.logger.error("Error loading payments: %s", error, exc_info=True)
             raise
     
     def get_payment(self, payment_id):
-        self.logger.debug(f"Searching for payment: {payment_id}")
+        self.logger.debug("Searching for payment: %s", payment_id)
         try:
-            payment = self.payment_repo.get_by_id(payment_id)
+            payment = self.query_cache.get_or_load(
+                ("get_payment", payment_id), [("payments", payment_id)], lambda: self.payment_repo.get_by_id(payment_id)
+            )
             if payment:
-                self.logger.info(f"Payment found: {payment_id}")
+                self.logger.info("Payment found: %s", payment_id)
             else:
-                self.logger.warning(f"Payment not found: {payment_id}")
+                self.logger.warning("Payment not found: %s", payment_id)
             return payment
         except Exception as error:
-            self.logger.error(f"Error searching for payment: {error}", exc_info=True)
+            self.logger.error("Error searching for payment: %s", error, exc_info=True)
             raise
     
     def delete_payment(self, payment_id):
-        self.logger.info(f"Deleting payment: {payment_id}")
+        self.logger.info("Deleting payment: %s", payment_id)
         try:
-            result = self.payment_repo.delete(payment_id)
-            self.logger.info(f"Payment {payment_id} deleted successfully")
+            payment = self.payment_repo.get_by_id(payment_id)
+            if payment and payment.idempotency_key:
+                self.idempotency_cache.pop(payment.idempotency_key)
+            
+            with self.storage.transaction():
+                result = self.payment_repo.delete(payment_id)
+                if payment:
+                    self.summary_repo.record_payment(payment, self._room_type_for(payment.reservation_id), -1)
+                self.outbox_repo.append("payment_deleted", "payments", payment_id, {"id": payment_id})
+                self._changed("payments", [payment_id])
+            self.logger.info("Payment %s deleted successfully", payment_id)
             return result
         except Exception as error:
-            self.logger.error(f"Failed to delete payment: {error}", exc_info=True)
+            self.logger.error("Failed to delete payment: %s", error, exc_info=True)
+            raise
+    
+    def _room_type_for(self, reservation_id):
+        reservation = self.reservation_repo.get_by_id(reservation_id)
+        room = self.room_repo.get_by_id(reservation.room_id) if reservation else None
+        return room.room_type if room else None
+    
+    # SOLID – SRP: Adds or removes everything a room contributes to the daily summary
+    def _record_room_history(self, room, sign):
+        for reservation in self.reservation_repo.get_by_room(room.id):
+            self.summary_repo.record_stay(reservation, room, sign)
+            payments = self.payment_repo.get_by_reservation(reservation.id)
+            self.summary_repo.record_payments([(payment, room.room_type) for payment in payments], sign)
+    
+    # GRASP – Information Expert: Dashboards read the pre-aggregated rows only
+    def get_daily_summary(self, start_date, end_date, room_type=None):
+        self.logger.debug("Loading daily summary %s to %s", start_date, end_date)
+        try:
+            return self.summary_repo.get_range(start_date, end_date, room_type)
+        except Exception as error:
+            self.logger.error("Error loading daily summary: %s", error, exc_info=True)
+            raise
+    
+    def rebuild_daily_summary(self):
+        self.logger.info("Rebuilding daily summary...")
+        try:
+            self.summary_repo.rebuild()
+        except Exception as error:
+            self.logger.error("Failed to rebuild daily summary: %s", error, exc_info=True)
             raise
-
@@ -0,0 +1,34 @@
+# SOLID – SRP: This module only delivers in-process notifications
+import threading
+from .logging_config import get_logger
+
+
+# GRASP – Indirection: Write paths announce changes without knowing who reacts to them
+# SOLID – DIP: Publishers and subscribers only share event names
+class EventBus:
+    """Synchronous publish/subscribe: handlers run in the publisher's thread, in subscription order."""
+
+    def __init__(self):
+        self._handlers = {}
+        self._lock = threading.Lock()
+        self.logger = get_logger(self.__class__.__name__)
+
+    def subscribe(self, event, handler):
+        with self._lock:
+            self._handlers.setdefault(event, []).append(handler)
+
+    def unsubscribe(self, event, handler):
+        with self._lock:
+            handlers = self._handlers.get(event, [])
+            if handler in handlers:
+                handlers.remove(handler)
+
+    def publish(self, event, **payload):
+        with self._lock:
+            handlers = list(self._handlers.get(event, []))
+        for handler in handlers:
+            try:
+                handler(**payload)
+            except Exception as error:
+                # One broken subscriber must not fail the write that published the event
+                self.logger.error("Handler for %s failed: %s", event, error, exc_info=True)
@@ -0,0 +1,153 @@
+# SOLID – SRP: This module only times calls and counts their rows; the registry keeps the numbers
+import time
+from .metrics import METRICS
+
+
+def _result_rows(args, result):
+    return len(result) if isinstance(result, list) else 0
+
+
+def _argument_rows(position):
+    def count(args, result):
+        return len(args[position]) if len(args) > position else 0
+    return count
+
+
+def _changed_rows(args, result):
+    if isinstance(result, bool):
+        return int(result)
+    return result if isinstance(result, int) and result > 0 else 0
+
+
+# Storage operation -> (counts rows read, counts rows written)
+STORAGE_OPERATIONS = {
+    "read_collection": (_result_rows, None),
+    "find_by": (_result_rows, None),
+    "find_in": (_result_rows, None),
+    "search": (_result_rows, None),
+    "query": (_result_rows, None),
+    "sum_column": (None, None),
+    "insert_items": (None, _argument_rows(1)),
+    "update_item": (None, _changed_rows),
+    "delete_item": (None, _changed_rows),
+    "increment_counters": (None, _argument_rows(2)),
+    "write_collection": (None, _argument_rows(1)),
+    "execute": (None, _changed_rows),
+}
+
+# Operations whose first argument is SQL rather than a collection name
+SQL_OPERATIONS = ("query", "execute")
+
+
+# SOLID – OCP: Adds timing around an existing storage without changing it
+# GRASP – Indirection: Sits between repositories and the storage only while metrics are on
+class InstrumentedStorage:
+    """
+    Storage middleware recording latency, rows read and rows written per operation and collection.
+    Everything else (transaction, on_commit, supports_sql, ...) passes straight through.
+    Only built when metrics are enabled, so an uninstrumented storage pays nothing.
+    """
+
+    def __init__(self, storage, metrics=METRICS):
+        self._storage = storage
+        self._metrics = metrics
+
+    def __getattr__(self, name):
+        attribute = getattr(self._storage, name)
+        if name in STORAGE_OPERATIONS:
+            attribute = self._timed(name, attribute, *STORAGE_OPERATIONS[name])
+        elif name == "iter_collection":
+            attribute = self._timed_iterator(attribute)
+        else:
+            return attribute
+        # Cache the wrapper so later lookups skip __getattr__
+        self.__dict__[name] = attribute
+        return attribute
+
+    def _timed(self, name, method, rows_read, rows_written):
+        metrics = self._metrics
+
+        def call(*args, **kwargs):
+            collection = "" if name in SQL_OPERATIONS or not args else args[0]
+            started = time.perf_counter()
+            try:
+                result = method(*args, **kwargs)
+            except Exception:
+                metrics.record("storage", name, time.perf_counter() - started, collection, error=True)
+                raise
+            metrics.record(
+                "storage", name, time.perf_counter() - started, collection,
+                rows_read=rows_read(args, result) if rows_read else 0,
+                rows_written=rows_written(args, result) if rows_written else 0
+            )
+            return result
+        call.__name__ = name
+        return call
+
+    def _timed_iterator(self, method):
+        metrics = self._metrics
+
+        def call(collection_name, *args, **kwargs):
+            # Time spent inside the storage only, not in the caller's loop body
+            rows = 0
+            elapsed = 0.0
+            iterator = iter(method(collection_name, *args, **kwargs))
+            try:
+                while True:
+                    started = time.perf_counter()
+                    try:
+                        row = next(iterator)
+                    except StopIteration:
+                        elapsed += time.perf_counter() - started
+                        break
+                    elapsed += time.perf_counter() - started
+                    rows += 1
+                    yield row
+            finally:
+                metrics.record("storage", "iter_collection", elapsed, collection_name, rows_read=rows)
+        call.__name__ = "iter_collection"
+        return call
+
+
+# SOLID – OCP: Same idea one layer up, around the service's public methods
+class InstrumentedService:
+    """
+    Service middleware timing every public method call made through it (calls the service makes
+    to itself are not counted twice). List results count as rows read.
+    """
+
+    def __init__(self, service, metrics=METRICS):
+        self._service = service
+        self._metrics = metrics
+
+    def __getattr__(self, name):
+        attribute = getattr(self._service, name)
+        if name.startswith("_") or not callable(attribute):
+            return attribute
+        metrics = self._metrics
+
+        def call(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                result = attribute(*args, **kwargs)
+            except Exception:
+                metrics.record("service", name, time.perf_counter() - started, error=True)
+                raise
+            metrics.record("service", name, time.perf_counter() - started, rows_read=_result_rows(args, result))
+            return result
+        call.__name__ = name
+        self.__dict__[name] = call
+        return call
+
+
+def instrument(service, metrics=METRICS):
+    """Enable metrics and wrap service (and the storage its repositories use) in the middleware."""
+    metrics.enable()
+    storage = InstrumentedStorage(service.storage, metrics)
+    for value in vars(service).values():
+        if value is service.storage:
+            continue
+        if getattr(value, "storage", None) is service.storage:
+            value.storage = storage
+    service.storage = storage
+    return InstrumentedService(service, metrics)
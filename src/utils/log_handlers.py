@@ -0,0 +1,66 @@
+# SOLID – SRP: Handlers tuned for the queued logging pipeline in logging_config
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+
+# SOLID – OCP: Extends QueueHandler, only changing what it does before enqueueing
+class InProcessQueueHandler(QueueHandler):
+    """
+    The listener lives in this process, so records don't need to be picklable copies:
+    the message is rendered now (later changes to the arguments can't alter it) and the
+    record itself is enqueued. Formatting with the timestamp happens on the listener thread.
+    """
+
+    def prepare(self, record):
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        return record
+
+
+# SOLID – OCP: Extends QueueListener to flush once per burst instead of once per record
+class FlushingQueueListener(QueueListener):
+    """Flushes its handlers whenever the queue runs dry, so a burst of records costs one write."""
+
+    def dequeue(self, block):
+        try:
+            return self.queue.get(block=False)
+        except queue.Empty:
+            if not block:
+                raise
+        for handler in self.handlers:
+            handler.flush()
+        return self.queue.get(block=True)
+
+
+# SOLID – OCP: Same rotation as RotatingFileHandler with less work per record
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """
+    Formats each record once and tracks the file size itself, where RotatingFileHandler formats
+    twice and stats the file for every record. Writes stay buffered until flush(), which the
+    FlushingQueueListener calls when the queue is empty.
+    """
+
+    def _open(self):
+        stream = super()._open()
+        self._size = os.path.getsize(self.baseFilename)
+        return stream
+
+    def emit(self, record):
+        try:
+            message = self.format(record) + self.terminator
+            # maxBytes counts bytes on disk; log lines carry emoji and other multi-byte characters
+            size = len(message) if message.isascii() else len(message.encode(self.encoding or "utf-8"))
+            if self.stream is None:
+                self.stream = self._open()
+            if self.maxBytes > 0 and self._size and self._size + size >= self.maxBytes:
+                self.doRollover()
+                if self.stream is None:
+                    self.stream = self._open()
+            self.stream.write(message)
+            self._size += size
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
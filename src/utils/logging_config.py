@@ -1,46 +1,119 @@
 # SOLID – SRP: This module handles only logging configuration
+import atexit
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
 
+LOG_FORMAT = '%(asctime)s - %(levelname)s - [%(name)s] - %(message)s'
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# "LEVEL" or "LEVEL,logger=LEVEL,..." e.g. "INFO,src.repositories=DEBUG,SQLiteStorage=WARNING"
+LOG_LEVEL_ENV = "HOTEL_LOG_LEVEL"
+DEFAULT_LOG_LEVEL = "INFO"
+
+# Background thread writing queued records to the file and console
+_listener = None
+
+# Record attributes the format never shows; collecting them is skipped while logging is set up
+_RECORD_GLOBALS = ("_srcfile", "logThreads", "logProcesses", "logMultiprocessing")
+_saved_globals = None
+
+
+def parse_log_levels(spec):
+    """Split a level spec into the root level (None if not given) and {logger name: level}."""
+    root_level = None
+    module_levels = {}
+    for part in (spec or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, level = part.rpartition("=")
+        level = level.strip().upper()
+        if not isinstance(logging.getLevelName(level), int):
+            raise ValueError(f"Unknown log level: {level}")
+        if name:
+            module_levels[name.strip()] = level
+        else:
+            root_level = level
+    return root_level, module_levels
+
+
+def setup_logging(level=None, module_levels=None, logs_dir="logs"):
+    """
+    Log to logs/app.log and the console through a queue: the calling thread only creates the record
+    and enqueues it, while a listener thread formats and writes it, flushing once per burst.
+    level is the root level (default from HOTEL_LOG_LEVEL, else INFO); module_levels maps
+    logger names (e.g. "src.repositories", "SQLiteStorage") to their own levels.
+    """
+    global _listener, _saved_globals
+    # logging.handlers pulls in socket and pickle; only entry points that log to file pay for it
+    from .log_handlers import BufferedRotatingFileHandler, FlushingQueueListener, InProcessQueueHandler
+
+    env_level, env_module_levels = parse_log_levels(os.environ.get(LOG_LEVEL_ENV))
+    level = level or env_level or DEFAULT_LOG_LEVEL
+    module_levels = {**env_module_levels, **(module_levels or {})}
+
+    # Restores the previous setup's globals before saving them again
+    stop_logging()
+    # The format never shows caller, thread or process, so skip collecting them for every record;
+    # stop_logging puts the originals back
+    _saved_globals = {name: getattr(logging, name) for name in _RECORD_GLOBALS}
+    for name in _RECORD_GLOBALS:
+        setattr(logging, name, None if name == "_srcfile" else False)
 
-def setup_logging():
     # CUPID – Idiomatic: Uses Python's built-in logging module idiomatically
-    logs_dir = "logs"
     if not os.path.exists(logs_dir):
         os.makedirs(logs_dir)
-    
-    log_format = '%(asctime)s - %(levelname)s - [%(name)s] - %(message)s'
-    date_format = '%Y-%m-%d %H:%M:%S'
-    
-    formatter = logging.Formatter(log_format, datefmt=date_format)
-    
+
+    formatter = logging.Formatter(LOG_FORMAT, datefmt=DATE_FORMAT)
+
     # SOLID – OCP: RotatingFileHandler extends base handler without modifying it
-    file_handler = RotatingFileHandler(
+    file_handler = BufferedRotatingFileHandler(
         filename=os.path.join(logs_dir, 'app.log'),
         maxBytes=1048576,  # 1MB
         backupCount=3,
-        encoding='utf-8'
+        encoding='utf-8',
+        delay=True  # Open the file on the first record, not at startup
     )
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(formatter)
-    
+
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(formatter)
-    
+
+    records = queue.SimpleQueue()
+    _listener = FlushingQueueListener(records, file_handler, console_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.unregister(stop_logging)
+    atexit.register(stop_logging)
+
     root_logger = logging.getLogger()
-    root_logger.setLevel(logging.DEBUG)
+    root_logger.setLevel(level)
     root_logger.handlers.clear()
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
-    
+    root_logger.addHandler(InProcessQueueHandler(records))
+    for name, module_level in module_levels.items():
+        logging.getLogger(name).setLevel(module_level)
+
     root_logger.info("="*60)
     root_logger.info("Hotel Reservation System logging initialized")
-    root_logger.info(f"Logs saved to: {os.path.join(logs_dir, 'app.log')}")
+    root_logger.info("Logs saved to: %s (level %s)", os.path.join(logs_dir, 'app.log'), level)
     root_logger.info("="*60)
 
 
+def stop_logging():
+    """Write out everything still queued, stop the listener thread and restore the logging globals."""
+    global _listener, _saved_globals
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+    if _saved_globals is not None:
+        for name, value in _saved_globals.items():
+            setattr(logging, name, value)
+        _saved_globals = None
+
+
 def get_logger(name):
     return logging.getLogger(name)
-
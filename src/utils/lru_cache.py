@@ -0,0 +1,43 @@
+# SOLID – SRP: This module only provides a small bounded cache
+import threading
+from collections import OrderedDict
+
+
+# GRASP – Pure Fabrication: Bounded key/value cache that evicts the least recently used entry
+class LRUCache:
+
+    def __init__(self, max_size=1024):
+        if max_size <= 0:
+            raise ValueError("Cache size must be positive")
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._items:
+                return default
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            if len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            return self._items.pop(key, default)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._items
+
+    def __len__(self):
+        return len(self._items)
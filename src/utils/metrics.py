@@ -0,0 +1,161 @@
+# SOLID – SRP: This module only collects and reports operation metrics
+import threading
+from bisect import bisect_left
+
+# Upper bounds (seconds) of the latency histogram buckets; anything slower lands in +Inf
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+METRIC_PREFIX = "hotel"
+
+
+class Histogram:
+    """Fixed-bucket latency histogram; quantiles are read off the bucket bounds."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of observations (capped at the max seen)."""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                bound = LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else self.max
+                return min(bound, self.max)
+        return self.max
+
+
+class OperationStats:
+    __slots__ = ("latency", "errors", "rows_read", "rows_written", "bytes")
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.errors = 0
+        self.rows_read = 0
+        self.rows_written = 0
+        self.bytes = 0
+
+
+def _labels(key):
+    layer, operation, collection = key
+    return f'layer="{layer}",operation="{operation}",collection="{collection}"'
+
+
+# GRASP – Pure Fabrication: One place every instrumented layer reports to
+class MetricsRegistry:
+    """
+    Per (layer, operation, collection) latency histograms, call and error counts, rows read and
+    written, and bytes serialised. Recording is only wired in while enabled: the instrumented
+    proxies are installed by whoever enables it, and the byte hooks check `enabled` first.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._operations = {}
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self._operations = {}
+
+    def _stats(self, layer, operation, collection):
+        key = (layer, operation, collection or "")
+        stats = self._operations.get(key)
+        if stats is None:
+            stats = self._operations.setdefault(key, OperationStats())
+        return stats
+
+    def record(self, layer, operation, seconds, collection="", rows_read=0, rows_written=0, error=False):
+        with self._lock:
+            stats = self._stats(layer, operation, collection)
+            stats.latency.observe(seconds)
+            stats.rows_read += rows_read
+            stats.rows_written += rows_written
+            if error:
+                stats.errors += 1
+
+    def add_bytes(self, layer, operation, count, collection=""):
+        with self._lock:
+            self._stats(layer, operation, collection).bytes += count
+
+    # GRASP – Information Expert: Summarises what it recorded
+    def snapshot(self):
+        """One dict per (layer, operation, collection), slowest total time first."""
+        with self._lock:
+            rows = []
+            for (layer, operation, collection), stats in self._operations.items():
+                latency = stats.latency
+                rows.append({
+                    "layer": layer,
+                    "operation": operation,
+                    "collection": collection,
+                    "calls": latency.count,
+                    "errors": stats.errors,
+                    "total_ms": latency.total * 1000,
+                    "mean_ms": latency.total / latency.count * 1000 if latency.count else 0.0,
+                    "p50_ms": latency.quantile(0.50) * 1000,
+                    "p95_ms": latency.quantile(0.95) * 1000,
+                    "p99_ms": latency.quantile(0.99) * 1000,
+                    "max_ms": latency.max * 1000,
+                    "rows_read": stats.rows_read,
+                    "rows_written": stats.rows_written,
+                    "bytes": stats.bytes
+                })
+        rows.sort(key=lambda row: row["total_ms"], reverse=True)
+        return rows
+
+    def to_prometheus(self):
+        """The metrics in Prometheus text exposition format."""
+        name = f"{METRIC_PREFIX}_operation_duration_seconds"
+        lines = [f"# HELP {name} Time spent per service or storage operation.", f"# TYPE {name} histogram"]
+        counters = {
+            "errors": ("operation_errors_total", "Operations that raised."),
+            "rows_read": ("rows_read_total", "Rows returned by read operations."),
+            "rows_written": ("rows_written_total", "Rows inserted, updated or deleted."),
+            "bytes": ("serialized_bytes_total", "Bytes serialised to files, payloads and responses."),
+        }
+        with self._lock:
+            items = sorted(self._operations.items())
+            for key, stats in items:
+                if not stats.latency.count:
+                    continue
+                labels = _labels(key)
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), stats.latency.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f"{name}_sum{{{labels}}} {stats.latency.total:.6f}")
+                lines.append(f"{name}_count{{{labels}}} {stats.latency.count}")
+            for attribute, (suffix, help_text) in counters.items():
+                counter = f"{METRIC_PREFIX}_{suffix}"
+                lines += [f"# HELP {counter} {help_text}", f"# TYPE {counter} counter"]
+                for key, stats in items:
+                    value = getattr(stats, attribute)
+                    if value:
+                        lines.append(f"{counter}{{{_labels(key)}}} {value}")
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry shared by the instrumented proxies, storages and the API server
+METRICS = MetricsRegistry()
@@ -0,0 +1,239 @@
+"""
+Profiling mode - runs cProfile and tracemalloc around CLI actions and service calls and reports
+the hot spots per operation.
+"""
+
+import cProfile
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+DEFAULT_TOP = 15
+
+# Calls per operation whose allocations are traced; a tracemalloc snapshot costs milliseconds,
+# so later calls are only run under cProfile
+DEFAULT_ALLOCATION_SAMPLES = 20
+
+# Frames recorded per allocation; 1 keeps the allocation site and the tracing overhead low
+ALLOCATION_FRAMES = 1
+
+# The profiler's own bookkeeping, left out of the report
+_OWN_FUNCTIONS = ("<method 'disable' of '_lsprof.Profiler' objects>",)
+_ALLOCATION_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+)
+
+
+def _location(filename, lineno, function=None):
+    try:
+        filename = os.path.relpath(filename)
+    except ValueError:
+        pass
+    where = f"{filename}:{lineno}"
+    return f"{where}({function})" if function else where
+
+
+class _OperationProfile:
+    __slots__ = ("calls", "profiled_calls", "total", "profile", "allocation_samples", "allocations", "peak")
+
+    def __init__(self):
+        self.calls = 0
+        self.profiled_calls = 0
+        self.total = 0.0
+        # One profile per operation, enabled around each of its calls, so the stats add up in C
+        self.profile = cProfile.Profile()
+        self.allocation_samples = 0
+        # (filename, lineno) -> [bytes, blocks] still allocated when a sampled call ended
+        self.allocations = {}
+        self.peak = 0
+
+    def functions(self):
+        self.profile.create_stats()
+        return [
+            (key, primitive, calls, own, cumulative)
+            for key, (primitive, calls, own, cumulative, _callers) in self.profile.stats.items()
+            if key[2] not in _OWN_FUNCTIONS
+        ]
+
+    def add_allocations(self, before, after):
+        for difference in after.compare_to(before, "lineno"):
+            if not difference.size_diff:
+                continue
+            frame = difference.traceback[0]
+            totals = self.allocations.setdefault((frame.filename, frame.lineno), [0, 0])
+            totals[0] += difference.size_diff
+            totals[1] += difference.count_diff
+        self.allocation_samples += 1
+
+
+# GRASP – Pure Fabrication: Keeps profiling out of the service and the CLI it measures
+# SOLID – SRP: Only collects and reports per-operation profiles
+class Profiler:
+    """
+    `with profiler.profile("name"):` runs the block under cProfile and, if trace_allocations,
+    compares tracemalloc snapshots taken before and after it (for the first allocation_samples
+    calls of each operation). Results add up per operation name.
+
+    One operation is profiled at a time: a block started inside another profiled block (the
+    service calls a CLI action makes) is already part of the outer profile, and one started on
+    another thread while a profile is running is timed and counted but not profiled.
+    """
+
+    def __init__(self, trace_allocations=True, top=DEFAULT_TOP, allocation_samples=DEFAULT_ALLOCATION_SAMPLES):
+        self.trace_allocations = trace_allocations
+        self.top = top
+        self.allocation_samples = allocation_samples
+        self._operations = {}
+        self._lock = threading.Lock()
+        self._profiling = threading.Lock()
+        self._local = threading.local()
+        self._started_tracing = False
+
+    def _operation(self, name):
+        with self._lock:
+            operation = self._operations.get(name)
+            if operation is None:
+                operation = self._operations[name] = _OperationProfile()
+            return operation
+
+    @contextmanager
+    def profile(self, name):
+        if getattr(self._local, "active", False) or not self._profiling.acquire(blocking=False):
+            started = time.perf_counter()
+            try:
+                yield
+            finally:
+                elapsed = time.perf_counter() - started
+                operation = self._operation(name)
+                with self._lock:
+                    operation.calls += 1
+                    operation.total += elapsed
+            return
+
+        self._local.active = True
+        try:
+            operation = self._operation(name)
+            before = None
+            if self.trace_allocations and operation.allocation_samples < self.allocation_samples:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start(ALLOCATION_FRAMES)
+                    self._started_tracing = True
+                tracemalloc.reset_peak()
+                before = tracemalloc.take_snapshot().filter_traces(_ALLOCATION_FILTERS)
+                baseline = tracemalloc.get_traced_memory()[0]
+            started = time.perf_counter()
+            operation.profile.enable()
+            try:
+                yield
+            finally:
+                operation.profile.disable()
+                elapsed = time.perf_counter() - started
+                if before is not None:
+                    peak = tracemalloc.get_traced_memory()[1] - baseline
+                    after = tracemalloc.take_snapshot().filter_traces(_ALLOCATION_FILTERS)
+                with self._lock:
+                    operation.calls += 1
+                    operation.profiled_calls += 1
+                    operation.total += elapsed
+                    if before is not None:
+                        operation.peak = max(operation.peak, peak)
+                        operation.add_allocations(before, after)
+        finally:
+            self._local.active = False
+            self._profiling.release()
+
+    def stop(self):
+        """Stop tracing allocations if this profiler started it."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def report(self, top=None):
+        """One dict per operation, most total time first, with its top functions and allocation sites."""
+        top = top or self.top
+        # Waits for a running profile, so no stats are read while one is enabled
+        with self._profiling, self._lock:
+            rows = []
+            for name, operation in self._operations.items():
+                functions = sorted(operation.functions(), key=lambda function: function[4], reverse=True)
+                allocations = sorted(operation.allocations.items(), key=lambda item: abs(item[1][0]), reverse=True)
+                rows.append({
+                    "operation": name,
+                    "calls": operation.calls,
+                    "profiled_calls": operation.profiled_calls,
+                    "allocation_samples": operation.allocation_samples,
+                    "total_ms": operation.total * 1000,
+                    "peak_kib": operation.peak / 1024,
+                    "functions": [
+                        {
+                            "function": _location(*key),
+                            "calls": calls if calls == primitive else f"{calls}/{primitive}",
+                            "own_ms": own * 1000,
+                            "cumulative_ms": cumulative * 1000
+                        }
+                        for key, primitive, calls, own, cumulative in functions[:top]
+                    ],
+                    "allocations": [
+                        {"site": _location(*key), "kib": size / 1024, "blocks": blocks}
+                        for key, (size, blocks) in allocations[:top]
+                    ]
+                })
+        rows.sort(key=lambda row: row["total_ms"], reverse=True)
+        return rows
+
+    def format_report(self, top=None):
+        """The report as text, one section per operation."""
+        lines = []
+        for row in self.report(top):
+            lines.append(f"=== {row['operation']}: {row['calls']} calls ({row['profiled_calls']} profiled), "
+                         f"{row['total_ms']:.1f}ms total, peak {row['peak_kib']:.1f} KiB allocated")
+            lines.append(f"{'Calls':>12} {'Own ms':>9} {'Cum ms':>9}  Function")
+            for function in row["functions"]:
+                lines.append(f"{function['calls']:>12} {function['own_ms']:>9.2f} {function['cumulative_ms']:>9.2f}  "
+                             f"{function['function']}")
+            if row["allocations"]:
+                lines.append(f"{'KiB':>12} {'Blocks':>9}  Allocation site (still allocated after "
+                             f"{row['allocation_samples']} sampled calls)")
+                for site in row["allocations"]:
+                    lines.append(f"{site['kib']:>12.1f} {site['blocks']:>9}  {site['site']}")
+            lines.append("")
+        return "\n".join(lines)
+
+
+# SOLID – OCP: Profiles a service's public methods without changing the service
+class ProfiledService:
+    """Service proxy running every public method call made through it under Profiler.profile."""
+
+    def __init__(self, service, profiler):
+        self._service = service
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        attribute = getattr(self._service, name)
+        if name.startswith("_") or not callable(attribute):
+            return attribute
+        profiler = self._profiler
+
+        def call(*args, **kwargs):
+            with profiler.profile(name):
+                return attribute(*args, **kwargs)
+        call.__name__ = name
+        self.__dict__[name] = call
+        return call
+
+
+@contextmanager
+def profiled(service, trace_allocations=True, top=DEFAULT_TOP, allocation_samples=DEFAULT_ALLOCATION_SAMPLES):
+    """
+    `with profiled(service) as (service, profiler):` yields a profiling proxy for service and the
+    Profiler collecting its calls; allocation tracing stops when the block ends.
+    """
+    profiler = Profiler(trace_allocations, top, allocation_samples)
+    try:
+        yield ProfiledService(service, profiler), profiler
+    finally:
+        profiler.stop()
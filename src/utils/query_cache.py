@@ -0,0 +1,125 @@
+# SOLID – SRP: This module only caches query results and forgets them when their data changes
+import copy
+import threading
+from .lru_cache import LRUCache
+
+# Tag id for entries that depend on a whole collection (listings, searches)
+ALL = "*"
+
+_MISSING = object()
+
+
+def _copy_result(value):
+    """Shallow copies, so callers editing a returned model can't change the cached one."""
+    if isinstance(value, list):
+        return [copy.copy(item) for item in value]
+    return copy.copy(value)
+
+
+# GRASP – Pure Fabrication: Read-through cache in front of the repositories
+class QueryCache:
+    """
+    Query results keyed by method and arguments, each tagged with what it was read from:
+    (collection, id) for a single item, (collection, ALL) for anything that lists or searches.
+    invalidate(collection, ids) drops the entries for those ids and the collection's listings;
+    ids=None drops everything read from the collection. max_size=0 turns caching off.
+    change_source, if given, is called before each lookup and returns the collections other
+    writers changed (e.g. a storage change tracker); those are dropped before answering.
+    bypass, if given, is called before each lookup; while it returns True the loader is called
+    directly and nothing is cached (e.g. inside a storage transaction, whose reads may be rolled
+    back and whose writes only invalidate on commit).
+    """
+
+    def __init__(self, max_size=1024, change_source=None, bypass=None):
+        self.max_size = max_size
+        self.change_source = change_source
+        self.bypass = bypass
+        self._entries = LRUCache(max_size) if max_size > 0 else None
+        self._tags = {}
+        self._tagged_keys = 0
+        self._lock = threading.Lock()
+        # Bumped by every invalidation; a load that overlapped one is not cached
+        self._generation = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.external_changes = 0
+
+    def _drop_external_changes(self):
+        for collection in self.change_source():
+            with self._lock:
+                self.external_changes += 1
+            self.invalidate(collection)
+
+    def get_or_load(self, key, tags, loader):
+        if self._entries is None or (self.bypass is not None and self.bypass()):
+            return loader()
+        if self.change_source is not None:
+            self._drop_external_changes()
+
+        value = self._entries.get(key, _MISSING)
+        if value is not _MISSING:
+            with self._lock:
+                self.hits += 1
+            return _copy_result(value)
+
+        with self._lock:
+            self.misses += 1
+            generation = self._generation
+        value = loader()
+        with self._lock:
+            if generation == self._generation:
+                self._entries.put(key, _copy_result(value))
+                for tag in tags:
+                    self._tags.setdefault(tag, set()).add(key)
+                self._tagged_keys += len(tags)
+                if self._tagged_keys > 4 * self.max_size:
+                    self._prune_tags()
+        return value
+
+    def _prune_tags(self):
+        """Forget tags of entries the LRU already evicted."""
+        for tag in list(self._tags):
+            keys = {key for key in self._tags[tag] if key in self._entries}
+            if keys:
+                self._tags[tag] = keys
+            else:
+                del self._tags[tag]
+        self._tagged_keys = sum(len(keys) for keys in self._tags.values())
+
+    def invalidate(self, collection, ids=None):
+        if self._entries is None:
+            return
+        with self._lock:
+            self._generation += 1
+            if ids is None:
+                tags = [tag for tag in self._tags if tag[0] == collection]
+            else:
+                tags = [(collection, ALL)] + [(collection, item_id) for item_id in ids]
+            for tag in tags:
+                for key in self._tags.pop(tag, ()):
+                    if self._entries.pop(key, _MISSING) is not _MISSING:
+                        self.invalidations += 1
+
+    def clear(self):
+        if self._entries is None:
+            return
+        with self._lock:
+            self._generation += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._tags.clear()
+            self._tagged_keys = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "external_changes": self.external_changes,
+                "entries": len(self._entries) if self._entries is not None else 0,
+            }
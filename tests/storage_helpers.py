@@ -0,0 +1,33 @@
+"""
+Helpers for tests that need their own storage file instead of the shared instance.
+"""
+
+import os
+import tempfile
+from src.repositories.sqlite_storage import SQLiteStorage
+from src.repositories.json_storage import JSONStorage
+
+
+def open_storage(storage_class, path):
+    """Create a storage on its own file, bypassing the shared instances for test isolation."""
+    if storage_class is SQLiteStorage:
+        saved = SQLiteStorage._instances
+        SQLiteStorage._instances = {}
+        try:
+            return SQLiteStorage(path)
+        finally:
+            SQLiteStorage._instances = saved
+    saved = storage_class._instance
+    storage_class._instance = None
+    try:
+        return storage_class(path)
+    finally:
+        storage_class._instance = saved
+
+
+def open_temp_storages(temp_dir):
+    """One SQLite and one JSON storage inside temp_dir."""
+    return [
+        open_storage(SQLiteStorage, os.path.join(temp_dir, "hotel.db")),
+        open_storage(JSONStorage, os.path.join(temp_dir, "hotel.json")),
+    ]
@@ -0,0 +1,152 @@
+"""
+Unit tests for the HTTP/JSON API server and its load-test client.
+Each test runs on both SQLite and JSON storage, against a server on a local port.
+"""
+
+import asyncio
+import http.client
+import json
+import socket
+import tempfile
+import unittest
+from src.api import HotelApiServer
+from src.api.load_test import LoadTestClient
+from src.services.reservation_service import ReservationService
+from tests.storage_helpers import open_temp_storages
+
+
+class TestHotelApiServer(unittest.TestCase):
+    """Test routes, keep-alive, pipelining and error statuses."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.services = [ReservationService(storage) for storage in open_temp_storages(self.temp_dir.name)]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def serve(self, service):
+        server = HotelApiServer(service, port=0, workers=4).start_in_thread()
+        self.addCleanup(server.stop_thread)
+        return server
+
+    @staticmethod
+    def call(connection, method, path, body=None):
+        connection.request(method, path, body=json.dumps(body) if body is not None else None)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+
+    def test_booking_flow(self):
+        """Test rooms, guests, availability, reservations and payments over one connection."""
+        for service in self.services:
+            server = self.serve(service)
+            connection = http.client.HTTPConnection("127.0.0.1", server.port)
+
+            status, room = self.call(connection, "POST", "/rooms",
+                                     {"number": "101", "room_type": "suite", "price_per_night": 200.0, "capacity": 4})
+            self.assertEqual(status, 201)
+            self.call(connection, "POST", "/rooms", {"number": "102", "room_type": "standard", "price_per_night": 90.0})
+            status, guest = self.call(connection, "POST", "/guests",
+                                      {"name": "Jane Doe", "email": "jane@example.com", "phone": "123"})
+            self.assertEqual(status, 201)
+
+            status, rooms = self.call(connection, "GET", "/rooms/available?min_capacity=3")
+            self.assertEqual([item["number"] for item in rooms], ["101"])
+
+            status, reservation = self.call(connection, "POST", "/reservations", {
+                "guest_id": guest["id"], "room_id": room["id"],
+                "check_in_date": "2024-01-01", "check_out_date": "2024-01-03"
+            })
+            self.assertEqual(status, 201)
+            status, payment = self.call(connection, "POST", "/payments", {
+                "reservation_id": reservation["id"], "amount": 100.0, "payment_type": "cash"
+            })
+            self.assertEqual(status, 201)
+
+            status, details = self.call(connection, "GET", f"/reservations/{reservation['id']}")
+            self.assertEqual(details["guest_name"], "Jane Doe")
+            self.assertEqual(details["remaining"], 300.0)
+            status, rooms = self.call(connection, "GET", "/rooms/available")
+            self.assertEqual([item["number"] for item in rooms], ["102"])
+            status, guests = self.call(connection, "GET", "/guests/search?q=doe")
+            self.assertEqual([item["id"] for item in guests], [guest["id"]])
+            connection.close()
+
+            self.assertEqual(server.connections, 1)
+
+    def test_error_statuses(self):
+        """Test unknown routes, wrong methods, bad bodies and missing items."""
+        for service in self.services:
+            server = self.serve(service)
+            connection = http.client.HTTPConnection("127.0.0.1", server.port)
+
+            self.assertEqual(self.call(connection, "GET", "/nowhere")[0], 404)
+            self.assertEqual(self.call(connection, "PUT", "/rooms")[0], 405)
+            status, body = self.call(connection, "POST", "/rooms", {"number": "101"})
+            self.assertEqual(status, 400)
+            self.assertIn("room_type", body["error"])
+            self.assertEqual(self.call(connection, "GET", "/rooms/missing")[0], 404)
+            self.assertEqual(self.call(connection, "DELETE", "/guests/missing")[0], 404)
+            self.assertEqual(self.call(connection, "GET", "/rooms/available?max_price=cheap")[0], 400)
+            connection.close()
+
+    def test_unknown_projection_fields_are_rejected(self):
+        """Test ?fields= only accepts the collection's columns."""
+        for service in self.services:
+            server = self.serve(service)
+            connection = http.client.HTTPConnection("127.0.0.1", server.port)
+            self.call(connection, "POST", "/rooms", {"number": "101", "room_type": "suite", "price_per_night": 200.0})
+
+            status, rooms = self.call(connection, "GET", "/rooms?fields=number,capacity")
+            self.assertEqual((status, rooms), (200, [{"number": "101", "capacity": 2}]))
+            status, body = self.call(connection, "GET", "/rooms?fields=number,foo")
+            self.assertEqual(status, 400)
+            self.assertIn("foo", body["error"])
+            self.assertEqual(self.call(connection, "GET", "/guests?fields=id%20FROM%20rooms--")[0], 400)
+            connection.close()
+
+    def test_pipelined_requests_keep_order(self):
+        """Test pipelined requests are answered in order and reads see earlier writes."""
+        for service in self.services:
+            server = self.serve(service)
+            body = json.dumps({"number": "101", "room_type": "suite", "price_per_night": 200.0})
+            requests = (
+                "GET /rooms HTTP/1.1\r\nHost: test\r\n\r\n"
+                f"POST /rooms HTTP/1.1\r\nHost: test\r\nContent-Length: {len(body)}\r\n\r\n{body}"
+                "GET /rooms HTTP/1.1\r\nHost: test\r\nConnection: close\r\n\r\n"
+            )
+            with socket.create_connection(("127.0.0.1", server.port)) as sock:
+                sock.sendall(requests.encode())
+                received = b""
+                while True:
+                    chunk = sock.recv(65536)
+                    if not chunk:
+                        break
+                    received += chunk
+
+            parts = received.split(b"HTTP/1.1 ")[1:]
+            self.assertEqual([part[:3] for part in parts], [b"200", b"201", b"200"])
+            self.assertTrue(parts[0].endswith(b"[]"))
+            self.assertIn(b'"number": "101"', parts[2])
+
+
+class TestLoadTestClient(unittest.TestCase):
+    """Test the load-test client counts every pipelined response."""
+
+    def test_counts_requests(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            service = ReservationService(open_temp_storages(temp_dir)[0])
+            server = HotelApiServer(service, port=0).start_in_thread()
+            try:
+                client = LoadTestClient(port=server.port, path="/health", pipeline=4)
+                result = asyncio.run(client.run(requests=50, connections=3))
+            finally:
+                server.stop_thread()
+
+        self.assertEqual(result["requests"], 50)
+        self.assertEqual(result["failed"], 0)
+        self.assertEqual(server.requests, 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+Unit tests for AsyncReservationService and AsyncSQLiteStorage.
+"""
+
+import asyncio
+import os
+import tempfile
+import unittest
+from src.repositories.async_sqlite_storage import AsyncSQLiteStorage
+from src.repositories.sqlite_storage import SQLiteStorage
+from src.services.async_reservation_service import AsyncReservationService
+from tests.storage_helpers import open_storage
+
+
+class TestAsyncReservationService(unittest.TestCase):
+    """Test batched writes, savepoint isolation and reads from the pool."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.storage = open_storage(SQLiteStorage, os.path.join(self.temp_dir.name, "hotel.db"))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_concurrent_writes_share_commits(self):
+        """Test queued writes are committed in batches and a failing one doesn't sink the rest."""
+        async def scenario():
+            async with AsyncReservationService(self.storage) as service:
+                numbers = [str(100 + index) for index in range(50)] + ["100"]
+                outcomes = await asyncio.gather(
+                    *(service.add_room(number, "standard", 90.0) for number in numbers),
+                    return_exceptions=True
+                )
+                rooms = await service.get_all_rooms()
+                return outcomes, rooms, service.storage.batches
+
+        outcomes, rooms, batches = asyncio.run(scenario())
+        failures = [outcome for outcome in outcomes if isinstance(outcome, Exception)]
+        self.assertEqual(len(failures), 1)
+        self.assertIn("already exists", str(failures[0]))
+        self.assertEqual(len(rooms), 50)
+        self.assertLess(batches, 51)
+
+    def test_failed_write_rolls_back_only_itself(self):
+        """Test a write that raises after changing data leaves nothing behind."""
+        def insert_then_fail():
+            self.storage.insert_items("guests", [{"id": "g1", "name": "A", "email": "a@x", "phone": "1"}])
+            raise ValueError("boom")
+
+        async def scenario():
+            async with AsyncSQLiteStorage(self.storage) as storage:
+                results = await asyncio.gather(
+                    storage.write(insert_then_fail),
+                    storage.insert_items("guests", [{"id": "g2", "name": "B", "email": "b@x", "phone": "2"}]),
+                    return_exceptions=True
+                )
+                return results, await storage.find_in("guests", "id", ["g1", "g2"])
+
+        results, guests = asyncio.run(scenario())
+        self.assertIsInstance(results[0], ValueError)
+        self.assertEqual([guest["id"] for guest in guests], ["g2"])
+
+    def test_reads_see_committed_writes(self):
+        """Test a booking made through the writer is visible to pooled reads."""
+        async def scenario():
+            async with AsyncReservationService(self.storage, read_connections=2) as service:
+                room = await service.add_room("101", "suite", 200.0)
+                guest = await service.add_guest("Jane Doe", "jane@example.com", "123")
+                reservation = await service.create_reservation(guest.id, room.id, "2024-01-01", "2024-01-03")
+                details, available = await asyncio.gather(
+                    service.get_reservation_details(reservation.id), service.search_available_rooms()
+                )
+                return details, available
+
+        details, available = asyncio.run(scenario())
+        self.assertEqual(details[0]["guest_name"], "Jane Doe")
+        self.assertEqual(available, [])
+
+    def test_pooled_reads_use_the_query_cache(self):
+        """Test reads on the pool's long-lived connections are cached, while a write still invalidates them."""
+        async def scenario():
+            async with AsyncReservationService(self.storage, read_connections=2) as service:
+                await service.add_room("101", "suite", 200.0)
+                for _ in range(20):
+                    await service.get_all_rooms()
+                before_write = service.service.cache_stats()
+                await service.add_room("102", "suite", 200.0)
+                return before_write, await service.get_all_rooms()
+
+        before_write, rooms = asyncio.run(scenario())
+        self.assertEqual((before_write["misses"], before_write["hits"]), (1, 19))
+        self.assertEqual(len(rooms), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+Unit tests for the batch command runner behind `python main.py run`.
+Each test runs on both SQLite and JSON storage.
+"""
+
+import json
+import tempfile
+import unittest
+from src.services.command_runner import CommandRunner
+from src.services.reservation_service import ReservationService
+from tests.storage_helpers import open_temp_storages
+from tests.test_reservation_service import SlowCountingGateway
+
+
+def command_lines(*commands):
+    return [json.dumps(command) for command in commands]
+
+
+class TestCommandRunner(unittest.TestCase):
+    """Test scripted commands, references, transactions and the summary."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.services = [ReservationService(storage) for storage in open_temp_storages(self.temp_dir.name)]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_references_and_reads(self):
+        """Test named results feed later commands and reads see earlier writes."""
+        lines = command_lines(
+            {"command": "add_room", "as": "room", "number": "101", "room_type": "standard", "price_per_night": 100.0},
+            {"command": "add_guest", "as": "guest", "name": "Jane Doe", "email": "jane@example.com", "phone": "123"},
+            {"command": "create_reservation", "as": "stay", "guest_id": "$guest", "room_id": "$room",
+             "check_in_date": "2024-01-01", "check_out_date": "2024-01-03"},
+            {"command": "process_payment", "reservation_id": "$stay", "amount": 50.0, "payment_type": "cash"},
+            {"command": "get_balance", "reservation_id": "$stay"},
+        )
+        for service in self.services:
+            runner = CommandRunner(service)
+            outcome = runner.run(runner.read_commands(["# setup", ""] + lines))
+
+            self.assertEqual(outcome["summary"]["failed"], 0)
+            self.assertEqual(outcome["entries"][0]["line"], 3)
+            self.assertEqual(outcome["entries"][-1]["result"]["remaining"], 150.0)
+            self.assertEqual(outcome["summary"]["latency"]["add_room"]["count"], 1)
+
+    def test_failed_write_only_loses_itself(self):
+        """Test a failing command's group is replayed so its neighbours still commit."""
+        lines = command_lines(
+            {"command": "add_room", "number": "101", "room_type": "standard", "price_per_night": 100.0},
+            {"command": "add_room", "number": "101", "room_type": "standard", "price_per_night": 100.0},
+            {"command": "add_room", "number": "102", "room_type": "suite", "price_per_night": 200.0},
+            {"command": "drop_tables"},
+        ) + ["not json"]
+        for service in self.services:
+            runner = CommandRunner(service, group_size=10)
+            outcome = runner.run(runner.read_commands(lines))
+
+            self.assertEqual([entry["ok"] for entry in outcome["entries"]], [True, False, True, False, False])
+            self.assertIn("already exists", outcome["entries"][1]["error"])
+            self.assertEqual(sorted(room.number for room in service.get_all_rooms()), ["101", "102"])
+
+    def test_card_charges_are_not_replayed(self):
+        """Test a gateway charge stays out of write groups, so a later failure can't charge the card again."""
+        lines = command_lines(
+            {"command": "add_room", "as": "room", "number": "101", "room_type": "standard", "price_per_night": 100.0},
+            {"command": "add_guest", "as": "guest", "name": "Jane Doe", "email": "jane@example.com", "phone": "123"},
+            {"command": "create_reservation", "as": "stay", "guest_id": "$guest", "room_id": "$room",
+             "check_in_date": "2024-01-01", "check_out_date": "2024-01-03"},
+            {"command": "process_payment", "reservation_id": "$stay", "amount": 50.0, "payment_type": "card",
+             "card_number": "4111111111111111"},
+            {"command": "add_room", "number": "101", "room_type": "standard", "price_per_night": 100.0},
+        )
+        for plain_service in self.services:
+            gateway = SlowCountingGateway()
+            service = ReservationService(plain_service.storage, payment_gateway=gateway)
+            runner = CommandRunner(service, group_size=10)
+            outcome = runner.run(runner.read_commands(lines))
+
+            self.assertEqual([entry["ok"] for entry in outcome["entries"]], [True, True, True, True, False])
+            self.assertEqual(len(gateway.charges), 1)
+            self.assertEqual(service.get_balance(outcome["entries"][2]["result"].id)["amount_paid"], 50.0)
+
+    def test_mixed_case_card_charges_are_not_replayed(self):
+        """Test a "Card" payment type is kept out of write groups like "card"."""
+        lines = command_lines(
+            {"command": "add_room", "as": "room", "number": "101", "room_type": "standard", "price_per_night": 100.0},
+            {"command": "add_guest", "as": "guest", "name": "Jane Doe", "email": "jane@example.com", "phone": "123"},
+            {"command": "create_reservation", "as": "stay", "guest_id": "$guest", "room_id": "$room",
+             "check_in_date": "2024-01-01", "check_out_date": "2024-01-03"},
+            {"command": "process_payment", "reservation_id": "$stay", "amount": 50.0, "payment_type": "Card",
+             "card_number": "4111111111111111"},
+            {"command": "delete_guest", "guest_id": "missing"},
+        )
+        for plain_service in self.services:
+            gateway = SlowCountingGateway()
+            service = ReservationService(plain_service.storage, payment_gateway=gateway)
+            runner = CommandRunner(service, group_size=10)
+            outcome = runner.run(runner.read_commands(lines))
+
+            self.assertEqual([entry["ok"] for entry in outcome["entries"]], [True, True, True, True, False])
+            self.assertEqual(len(gateway.charges), 1)
+            self.assertEqual(len(service.payment_repo.get_by_reservation(outcome["entries"][2]["result"].id)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
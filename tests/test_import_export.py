@@ -0,0 +1,170 @@
+"""
+Unit tests for streaming export and import.
+Each test runs on both SQLite and JSON storage.
+"""
+
+import csv
+import gzip
+import json
+import os
+import tempfile
+import unittest
+from src.models.reservation import Reservation
+from src.services.export_service import ExportService
+from src.services.import_service import ImportService
+from tests.storage_helpers import open_temp_storages
+
+
+class TestExportService(unittest.TestCase):
+    """Test exports stream the right rows and columns."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.storages = open_temp_storages(self.temp_dir.name)
+        stays = [
+            Reservation("guest-1", "room-1", "2024-01-01", "2024-01-03"),
+            Reservation("guest-2", "room-1", "2024-02-01", "2024-02-03"),
+            Reservation("guest-3", "room-2", "2024-03-01", "2024-03-03"),
+        ]
+        for storage in self.storages:
+            storage.insert_items("reservations", [stay.to_dict() for stay in stays])
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_gzip_csv_with_selected_columns(self):
+        """Test CSV export keeps only the requested columns, in order."""
+        for storage in self.storages:
+            path = os.path.join(self.temp_dir.name, "reservations.csv.gz")
+            result = ExportService(storage).export("reservations", path, fields=["guest_id", "check_in_date"])
+
+            with gzip.open(path, "rt", newline="") as exported:
+                rows = list(csv.reader(exported))
+            self.assertEqual(result["rows"], 3)
+            self.assertEqual(rows[0], ["guest_id", "check_in_date"])
+            self.assertEqual(rows[1], ["guest-1", "2024-01-01"])
+
+    def test_jsonl_date_range(self):
+        """Test date range includes the start date and excludes the end date."""
+        for storage in self.storages:
+            path = os.path.join(self.temp_dir.name, "reservations.jsonl")
+            result = ExportService(storage).export(
+                "reservations", path, start_date="2024-02-01", end_date="2024-03-01"
+            )
+
+            with open(path) as exported:
+                rows = [json.loads(line) for line in exported]
+            self.assertEqual(result["rows"], 1)
+            self.assertEqual(rows[0]["guest_id"], "guest-2")
+
+    def test_unknown_format_rejected(self):
+        """Test file names without a known extension are rejected."""
+        with self.assertRaises(ValueError):
+            ExportService(self.storages[0]).export("reservations", os.path.join(self.temp_dir.name, "out.xlsx"))
+
+
+class TestImportService(unittest.TestCase):
+    """Test imports validate, deduplicate and resume."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.storages = open_temp_storages(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_csv(self, name, fields, rows):
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, "w", newline="") as output:
+            writer = csv.writer(output)
+            writer.writerow(fields)
+            writer.writerows(rows)
+        return path
+
+    def write_jsonl(self, name, rows):
+        path = os.path.join(self.temp_dir.name, name)
+        with gzip.open(path, "wt") as output:
+            for row in rows:
+                output.write(json.dumps(row) + "\n")
+        return path
+
+    def test_guests_validated_and_deduplicated(self):
+        """Test bad rows are reported and repeated emails imported once."""
+        path = self.write_csv("guests.csv", ["name", "email", "phone"], [
+            ["Jane Doe", "jane@example.com", "123"],
+            ["No Email", "not-an-email", "456"],
+            ["Jane Again", "jane@example.com", "789"],
+            ["John Roe", "john@example.com", "321"],
+        ])
+        for storage in self.storages:
+            result = ImportService(storage).import_file("guests", path, batch_size=2)
+            again = ImportService(storage).import_file("guests", path)
+
+            self.assertEqual((result["imported"], result["duplicates"], result["invalid"]), (2, 1, 1))
+            self.assertEqual(result["errors"][0]["line"], 2)
+            self.assertEqual(again["imported"], 0)
+            self.assertEqual(len(storage.read_collection("guests")), 2)
+
+    def test_reservations_resolve_natural_keys(self):
+        """Test reservations can name their room and guest by number and email."""
+        rooms = self.write_csv("rooms.csv", ["number", "room_type", "price_per_night", "capacity"], [
+            ["101", "standard", "100", "2"],
+        ])
+        guests = self.write_csv("guests.csv", ["name", "email", "phone"], [["Jane Doe", "jane@example.com", "123"]])
+        reservations = self.write_jsonl("reservations.jsonl.gz", [
+            {"guest_email": "jane@example.com", "room_number": "101",
+             "check_in_date": "2024-01-01", "check_out_date": "2024-01-03"},
+            {"guest_email": "nobody@example.com", "room_number": "101",
+             "check_in_date": "2024-01-01", "check_out_date": "2024-01-03"},
+        ])
+        for storage in self.storages:
+            service = ImportService(storage)
+            service.import_file("rooms", rooms)
+            service.import_file("guests", guests)
+            result = service.import_file("reservations", reservations)
+
+            self.assertEqual((result["imported"], result["invalid"]), (1, 1))
+            stored = storage.read_collection("reservations")[0]
+            self.assertEqual(stored["room_id"], storage.read_collection("rooms")[0]["id"])
+            summary = service.summary_repo.get_range("2024-01-01", "2024-01-05")
+            self.assertEqual(sum(row["room_revenue"] for row in summary), 200.0)
+
+    def test_bad_json_lines_and_reruns_without_ids(self):
+        """Test malformed lines are reported per line and a rerun of id-less reservations adds nothing."""
+        rooms = self.write_csv("rooms.csv", ["number", "room_type", "price_per_night"], [["101", "standard", "100"]])
+        guests = self.write_csv("guests.csv", ["name", "email", "phone"], [["Jane Doe", "jane@example.com", "123"]])
+        path = os.path.join(self.temp_dir.name, "reservations.jsonl")
+        with open(path, "w") as output:
+            output.write(json.dumps({"guest_email": "jane@example.com", "room_number": "101",
+                                     "check_in_date": "2024-01-01", "check_out_date": "2024-01-03"}) + "\n")
+            output.write("{not json\n")
+            output.write("[1, 2]\n")
+        for storage in self.storages:
+            service = ImportService(storage)
+            service.import_file("rooms", rooms)
+            service.import_file("guests", guests)
+            result = service.import_file("reservations", path)
+            again = service.import_file("reservations", path)
+
+            self.assertEqual((result["imported"], result["invalid"]), (1, 2))
+            self.assertEqual([error["line"] for error in result["errors"]], [2, 3])
+            self.assertIn("Invalid JSON", result["errors"][0]["error"])
+            self.assertEqual((again["imported"], again["duplicates"]), (0, 1))
+            self.assertEqual(len(storage.read_collection("reservations")), 1)
+
+    def test_resume_from_checkpoint(self):
+        """Test a rerun with the same checkpoint skips committed lines."""
+        path = self.write_csv("rooms.csv", ["number", "room_type", "price_per_night"], [
+            [str(100 + index), "standard", "90"] for index in range(5)
+        ])
+        for index, storage in enumerate(self.storages):
+            checkpoint = os.path.join(self.temp_dir.name, f"rooms-{index}.checkpoint")
+            ImportService.save_checkpoint(checkpoint, "rooms", path, 3)
+            result = ImportService(storage).import_file("rooms", path, batch_size=1, checkpoint_path=checkpoint)
+
+            self.assertEqual((result["skipped"], result["read"], result["imported"]), (3, 2, 2))
+            self.assertEqual(ImportService.load_checkpoint(checkpoint, "rooms", path), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
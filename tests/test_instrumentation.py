@@ -0,0 +1,103 @@
+"""
+Unit tests for the metrics registry and the instrumented service/storage middleware.
+Each service test runs on both SQLite and JSON storage.
+"""
+
+import http.client
+import tempfile
+import unittest
+from src.api import HotelApiServer
+from src.services.reservation_service import ReservationService
+from src.utils.instrumentation import instrument
+from src.utils.metrics import METRICS, Histogram
+from tests.storage_helpers import open_temp_storages
+
+
+class TestInstrumentation(unittest.TestCase):
+    """Test latency, row and byte counts are recorded per operation and exported."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.storages = open_temp_storages(self.temp_dir.name)
+        METRICS.reset()
+
+    def tearDown(self):
+        METRICS.disable()
+        METRICS.reset()
+        self.temp_dir.cleanup()
+
+    def operation(self, layer, name, collection=""):
+        for row in METRICS.snapshot():
+            if (row["layer"], row["operation"], row["collection"]) == (layer, name, collection):
+                return row
+        return None
+
+    def test_service_and_storage_calls_are_recorded(self):
+        """Test calls, rows read and written, errors and bytes per operation."""
+        for storage in self.storages:
+            METRICS.reset()
+            service = instrument(ReservationService(storage))
+            room = service.add_room("101", "standard", 100.0)
+            service.add_room("102", "suite", 250.0)
+            self.assertEqual(len(service.get_all_rooms()), 2)
+            self.assertEqual(service.get_room(room.id).number, "101")
+            with self.assertRaises(ValueError):
+                service.add_room("101", "standard", 100.0)
+
+            add_room = self.operation("service", "add_room")
+            self.assertEqual(add_room["calls"], 3)
+            self.assertEqual(add_room["errors"], 1)
+            self.assertEqual(self.operation("service", "get_all_rooms")["rows_read"], 2)
+            self.assertEqual(self.operation("storage", "insert_items", "rooms")["rows_written"], 2)
+            self.assertGreater(add_room["p99_ms"], 0)
+            if not storage.supports_sql:
+                self.assertGreater(self.operation("json_storage", "write_all")["bytes"], 0)
+            # Everything else still reaches the real storage
+            self.assertEqual(service.storage.supports_sql, storage.supports_sql)
+            self.assertIs(service.room_repo.storage, service.storage)
+
+    def test_prometheus_dump(self):
+        """Test the dump has cumulative buckets ending at the call count, plus counters."""
+        service = instrument(ReservationService(self.storages[0]))
+        for number in range(3):
+            service.add_room(str(number), "standard", 100.0)
+
+        text = METRICS.to_prometheus()
+        labels = 'layer="service",operation="add_room",collection=""'
+        self.assertIn("# TYPE hotel_operation_duration_seconds histogram", text)
+        self.assertIn(f'hotel_operation_duration_seconds_bucket{{{labels},le="+Inf"}} 3', text)
+        self.assertIn(f"hotel_operation_duration_seconds_count{{{labels}}} 3", text)
+        self.assertIn('hotel_rows_written_total{layer="storage",operation="insert_items",collection="rooms"} 3', text)
+
+    def test_api_serves_metrics(self):
+        """Test /metrics returns the Prometheus text with the routes that were called."""
+        service = instrument(ReservationService(self.storages[0]))
+        server = HotelApiServer(service, port=0, workers=2).start_in_thread()
+        self.addCleanup(server.stop_thread)
+        connection = http.client.HTTPConnection("127.0.0.1", server.port)
+        connection.request("GET", "/rooms")
+        connection.getresponse().read()
+        connection.request("GET", "/metrics")
+        response = connection.getresponse()
+        text = response.read().decode()
+        connection.close()
+
+        self.assertEqual(response.status, 200)
+        self.assertTrue(response.getheader("Content-Type").startswith("text/plain"))
+        self.assertIn('layer="http",operation="list_rooms"', text)
+        self.assertIn('layer="service",operation="get_all_rooms"', text)
+        self.assertIn('hotel_serialized_bytes_total{layer="http",operation="response"', text)
+
+    def test_histogram_quantiles(self):
+        """Test quantiles come from bucket bounds and never exceed the slowest call."""
+        histogram = Histogram()
+        for seconds in [0.0002] * 90 + [0.003] * 9 + [0.04]:
+            histogram.observe(seconds)
+        self.assertEqual(histogram.quantile(0.50), 0.00025)
+        self.assertEqual(histogram.quantile(0.95), 0.005)
+        self.assertEqual(histogram.quantile(1.0), 0.04)
+        self.assertEqual(Histogram().quantile(0.5), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
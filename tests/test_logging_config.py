@@ -0,0 +1,102 @@
+"""
+Unit tests for the queued logging setup and its per-logger levels.
+"""
+
+import logging
+import os
+import tempfile
+import unittest
+from unittest import mock
+from src.utils.log_handlers import BufferedRotatingFileHandler
+from src.utils.logging_benchmark import measure_logging_overhead
+from src.utils.logging_config import get_logger, parse_log_levels, setup_logging, stop_logging
+
+
+class TestLoggingConfig(unittest.TestCase):
+    """Test level parsing, the queue pipeline and the overhead benchmark."""
+
+    RECORD_GLOBALS = ("_srcfile", "logThreads", "logProcesses", "logMultiprocessing")
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root = logging.getLogger()
+        self.saved = (root.level, list(root.handlers))
+        self.saved_globals = {name: getattr(logging, name) for name in self.RECORD_GLOBALS}
+
+    def tearDown(self):
+        stop_logging()
+        root = logging.getLogger()
+        root.setLevel(self.saved[0])
+        root.handlers[:] = self.saved[1]
+        logging.getLogger("src.repositories").setLevel(logging.NOTSET)
+        for name, value in self.saved_globals.items():
+            setattr(logging, name, value)
+        self.temp_dir.cleanup()
+
+    def test_parse_log_levels(self):
+        """Test a spec splits into the root level and per-logger levels."""
+        self.assertEqual(parse_log_levels(None), (None, {}))
+        self.assertEqual(parse_log_levels("src.repositories=debug"), (None, {"src.repositories": "DEBUG"}))
+        self.assertEqual(parse_log_levels("debug, src.repositories=WARNING,SQLiteStorage=error"),
+                         ("DEBUG", {"src.repositories": "WARNING", "SQLiteStorage": "ERROR"}))
+        with self.assertRaises(ValueError):
+            parse_log_levels("LOUD")
+
+    def test_records_reach_the_file_through_the_queue(self):
+        """Test messages are formatted lazily, filtered per logger and written once the queue drains."""
+        setup_logging("WARNING", {"src.repositories": "DEBUG"}, logs_dir=self.temp_dir.name)
+        details = {"room": "101"}
+        get_logger("src.repositories.room_repository").debug("Loaded %s", details)
+        # Changing an argument after the call must not change the logged line
+        details["room"] = "999"
+        get_logger("src.services.reservation_service").info("Dropped by the root level")
+        get_logger("src.services.reservation_service").warning("Kept: %.1f%%", 12.5)
+        stop_logging()
+
+        with open(os.path.join(self.temp_dir.name, "app.log"), encoding="utf-8") as file:
+            lines = file.read().splitlines()
+        messages = [line.split("] - ", 1)[1] for line in lines]
+        self.assertIn("Loaded {'room': '101'}", messages)
+        self.assertIn("Kept: 12.5%", messages)
+        self.assertNotIn("Dropped by the root level", messages)
+
+    def test_module_levels_keep_the_environment_root_level(self):
+        """Test a spec naming only loggers leaves the root level from HOTEL_LOG_LEVEL in place."""
+        level, module_levels = parse_log_levels("src.repositories=DEBUG")
+        with mock.patch.dict(os.environ, {"HOTEL_LOG_LEVEL": "WARNING"}):
+            setup_logging(level, module_levels, logs_dir=self.temp_dir.name)
+        self.assertEqual(logging.getLogger().level, logging.WARNING)
+        self.assertEqual(logging.getLogger("src.repositories").level, logging.DEBUG)
+
+    def test_stop_restores_record_globals(self):
+        """Test the skipped record attributes are collected again once logging stops."""
+        setup_logging("INFO", logs_dir=self.temp_dir.name)
+        setup_logging("INFO", logs_dir=self.temp_dir.name)
+        self.assertFalse(logging.logThreads)
+        self.assertIsNone(logging._srcfile)
+        stop_logging()
+        self.assertEqual({name: getattr(logging, name) for name in self.RECORD_GLOBALS}, self.saved_globals)
+
+    def test_rotation_counts_bytes(self):
+        """Test files rotate by encoded size, so multi-byte log lines never push one past maxBytes."""
+        path = os.path.join(self.temp_dir.name, "app.log")
+        handler = BufferedRotatingFileHandler(path, maxBytes=200, backupCount=5, encoding="utf-8", delay=True)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        for number in range(20):
+            handler.emit(logging.makeLogRecord({"msg": f"💳 ✅ payment {number} 💵"}))
+        handler.close()
+
+        files = [path] + [f"{path}.{index}" for index in range(1, 6) if os.path.exists(f"{path}.{index}")]
+        self.assertGreater(len(files), 1)
+        for name in files:
+            self.assertLessEqual(os.path.getsize(name), 200)
+
+    def test_benchmark_reports_each_mode(self):
+        """Test the benchmark measures disabled, synchronous and queued calls."""
+        result = measure_logging_overhead(calls=200)
+        for key in ("disabled_ns", "disabled_fstring_ns", "synchronous_ns", "queued_ns", "queued_total_ns"):
+            self.assertGreater(result[key], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -73,6 +73,12 @@ class TestReservationModel(unittest.TestCase):
         reservation = Reservation("guest-1", "room-1", "2024-01-01", "2024-01-05")
         reservation.confirm()
         self.assertEqual(reservation.status, "confirmed")
+    
+    def test_reservation_nights(self):
+        """Test a reservation and a raw details row count nights the same way."""
+        reservation = Reservation("guest-1", "room-1", "2024-02-27", "2024-03-02")
+        self.assertEqual(reservation.nights(), 4)
+        self.assertEqual(Reservation.count_nights("2024-02-27", "2024-03-02"), 4)
 
 
 class TestPaymentModels(unittest.TestCase):
@@ -101,6 +107,13 @@ class TestPaymentModels(unittest.TestCase):
         self.assertIsInstance(card_payment, Payment)
         self.assertEqual(card_payment.payment_type, "card")
     
+    def test_payment_idempotency_key_round_trip(self):
+        """Test idempotency key survives serialization."""
+        payment = CashPayment("reservation-1", 100.0)
+        payment.idempotency_key = "pos-1"
+        restored = Payment.from_dict(payment.to_dict())
+        self.assertEqual(restored.idempotency_key, "pos-1")
+    
     def test_payment_polymorphism(self):
         """Test polymorphism - different payment types process differently."""
         cash_payment = CashPayment("reservation-1", 100.0)
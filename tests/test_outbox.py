@@ -0,0 +1,95 @@
+"""
+Unit tests for the transactional outbox and its consumer.
+Each test runs on both SQLite and JSON storage.
+"""
+
+import os
+import tempfile
+import unittest
+from src.services.import_service import ImportService
+from src.services.outbox_consumer import OutboxConsumer
+from src.services.reservation_service import ReservationService
+from tests.storage_helpers import open_temp_storages
+
+
+class TestOutbox(unittest.TestCase):
+    """Test service writes log their changes and consumers read only what is new."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.services = [ReservationService(storage) for storage in open_temp_storages(self.temp_dir.name)]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def book(self, service):
+        room = service.add_room("101", "standard", 100.0)
+        guest = service.add_guest("Jane Doe", "jane@example.com", "123")
+        reservation = service.create_reservation(guest.id, room.id, "2024-01-01", "2024-01-03")
+        service.process_payment(reservation.id, 200.0, "card", card_number="4111111111111111")
+        return reservation
+
+    def test_writes_append_events_in_their_transaction(self):
+        """Test each mutation logs one event, and failed or rolled-back ones log none."""
+        for service in self.services:
+            reservation = self.book(service)
+            with self.assertRaises(ValueError):
+                service.create_reservation("someone", reservation.room_id, "2024-02-01", "2024-02-02")
+            with self.assertRaises(RuntimeError):
+                with service.storage.transaction():
+                    service.cancel_reservation(reservation.id)
+                    raise RuntimeError("abort")
+
+            events = service.outbox_repo.read_after(0)
+            self.assertEqual([event["event"] for event in events],
+                             ["room_added", "guest_added", "reservation_created", "payment_processed"])
+            self.assertEqual([event["seq"] for event in events], [1, 2, 3, 4])
+            self.assertEqual(events[2]["payload"]["check_in_date"], "2024-01-01")
+            self.assertEqual(events[3]["payload"]["amount"], 200.0)
+            self.assertNotIn("card_number", events[3]["payload"])
+
+    def test_consumer_reads_deltas_from_saved_offset(self):
+        """Test batches resume from the saved offset and a failing handler doesn't move it."""
+        for service in self.services:
+            self.book(service)
+            seen = []
+            consumer = OutboxConsumer(service.storage, "housekeeping", batch_size=3)
+            self.assertEqual(consumer.consume(seen.extend), 3)
+            self.assertEqual(consumer.lag(), 1)
+
+            reservation = service.get_all_reservations()[0]
+            service.cancel_reservation(reservation.id)
+
+            def broken(events):
+                raise RuntimeError("downstream unavailable")
+
+            resumed = OutboxConsumer(service.storage, "housekeeping", batch_size=3)
+            self.assertEqual(resumed.position, 3)
+            with self.assertRaises(RuntimeError):
+                resumed.consume(broken)
+            self.assertEqual(resumed.drain(seen.extend), 2)
+            self.assertEqual([event["event"] for event in seen[-2:]], ["payment_processed", "reservation_cancelled"])
+            self.assertEqual(resumed.drain(seen.extend), 0)
+
+            # Only the one consumer is registered, so everything it processed can go
+            # (JSON storage keeps the newest event to continue numbering from)
+            self.assertGreaterEqual(service.outbox_repo.prune(), 4)
+            self.assertEqual(resumed.lag(), 0)
+            service.add_room("102", "suite", 250.0)
+            self.assertEqual([event["seq"] for event in resumed.poll()], [6])
+
+    def test_import_logs_events(self):
+        """Test bulk-imported rows reach consumers like service writes do."""
+        path = os.path.join(self.temp_dir.name, "guests.jsonl")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write('{"name": "Jane Doe", "email": "jane@example.com", "phone": "123"}\n')
+            file.write('{"name": "John Roe", "email": "john@example.com", "phone": "456"}\n')
+        for service in self.services:
+            ImportService(service.storage).import_file("guests", path)
+            events = OutboxConsumer(service.storage, "accounting").poll()
+            self.assertEqual([event["event"] for event in events], ["guest_added", "guest_added"])
+            self.assertEqual(events[1]["payload"]["email"], "john@example.com")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+"""
+Unit tests for the async payment gateway client.
+Runs against the local fake gateway, so no network access is needed.
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+from unittest import mock
+from src.gateways import AsyncGatewayClient, GatewayError
+from src.gateways.payment_gateway import _BackgroundLoop
+from src.gateways.fake_gateway import FakeGatewayServer, measure_throughput
+from src.models.payment import CardPayment
+
+
+class TestAsyncGatewayClient(unittest.TestCase):
+    """Test pooled async client against the fake gateway."""
+
+    def test_concurrent_charges_share_pool(self):
+        """Test many concurrent charges are approved over a small connection pool."""
+        async def scenario():
+            server = await FakeGatewayServer(latency=0.001).start()
+            client = AsyncGatewayClient(port=server.port, pool_size=3)
+            try:
+                result = await measure_throughput(client, count=30)
+            finally:
+                await client.close()
+                await server.stop()
+            return server, result
+
+        server, result = asyncio.run(scenario())
+        self.assertEqual(result["approved"], 30)
+        self.assertLessEqual(server.connections, 3)
+
+    def test_retries_then_gives_up(self):
+        """Test retryable failures are retried and finally raise GatewayError."""
+        async def scenario():
+            server = await FakeGatewayServer(latency=0, failure_rate=1.0).start()
+            client = AsyncGatewayClient(port=server.port, retries=2, backoff=0.001)
+            try:
+                with self.assertRaises(GatewayError):
+                    await client.charge("4111111111111111", 10.0, "ref-1")
+            finally:
+                await client.close()
+                await server.stop()
+            return server
+
+        server = asyncio.run(scenario())
+        self.assertEqual(server.requests, 3)
+
+    def test_retry_after_timeout_charges_once(self):
+        """Test a retry of a charge whose answer timed out gets the first answer instead of a second charge."""
+        async def scenario():
+            server = await FakeGatewayServer(latency=0.05).start()
+            client = AsyncGatewayClient(port=server.port, timeout=0.02, retries=2, backoff=0.05)
+            try:
+                response = await client.charge("4111111111111111", 10.0, "ref-2")
+            finally:
+                await client.close()
+                await server.stop()
+            return server, response
+
+        server, response = asyncio.run(scenario())
+        self.assertTrue(response["approved"])
+        self.assertGreaterEqual(server.requests, 2)
+        self.assertEqual(server.charges, 1)
+
+
+class TestCardPaymentWithGateway(unittest.TestCase):
+    """Test CardPayment charges through a gateway from synchronous code."""
+
+    def setUp(self):
+        self.server = FakeGatewayServer(latency=0).start_in_thread()
+
+    def tearDown(self):
+        self.server.stop_thread()
+
+    def test_card_payment_approved(self):
+        """Test approved charge completes the payment and keeps the transaction id."""
+        client = AsyncGatewayClient(port=self.server.port)
+        payment = CardPayment("reservation-1", 100.0, "4111111111111111", client)
+        try:
+            self.assertTrue(payment.process())
+        finally:
+            client.close_sync()
+        self.assertEqual(payment.status, "completed")
+        self.assertIsNotNone(payment.transaction_id)
+
+    def test_card_payment_declined(self):
+        """Test declined charge marks the payment failed."""
+        self.server.decline_rate = 1.0
+        client = AsyncGatewayClient(port=self.server.port)
+        payment = CardPayment("reservation-1", 100.0, "4111111111111111", client)
+        try:
+            self.assertFalse(payment.process())
+        finally:
+            client.close_sync()
+        self.assertEqual(payment.status, "failed")
+
+    def test_concurrent_sync_charges_share_one_loop(self):
+        """Test threads charging through one client create a single background loop."""
+        client = AsyncGatewayClient(port=self.server.port)
+
+        def slow_loop():
+            # Widens the window in which an unguarded check lets several threads through
+            time.sleep(0.02)
+            return _BackgroundLoop()
+
+        with mock.patch("src.gateways.payment_gateway._BackgroundLoop", side_effect=slow_loop) as loops:
+            payments = [CardPayment("reservation-1", 10.0, "4111111111111111", client) for _ in range(8)]
+            threads = [threading.Thread(target=payment.process) for payment in payments]
+            try:
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+            finally:
+                client.close_sync()
+        self.assertEqual(loops.call_count, 1)
+        self.assertTrue(all(payment.status == "completed" for payment in payments))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+"""
+Unit tests for the profiling mode (cProfile and tracemalloc per operation).
+Each service test runs on both SQLite and JSON storage.
+"""
+
+import tempfile
+import threading
+import tracemalloc
+import unittest
+from src.services.reservation_service import ReservationService
+from src.utils.profiling import Profiler, profiled
+from tests.storage_helpers import open_temp_storages
+
+
+class TestProfiling(unittest.TestCase):
+    """Test hot functions and allocation sites are reported per operation."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.storages = open_temp_storages(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def operation(self, profiler, name):
+        for row in profiler.report():
+            if row["operation"] == name:
+                return row
+        return None
+
+    def test_service_calls_are_profiled(self):
+        """Test each public service method gets its own functions and sampled allocation sites."""
+        for storage in self.storages:
+            with profiled(ReservationService(storage), allocation_samples=1) as (service, profiler):
+                service.add_room("101", "standard", 100.0)
+                service.add_room("102", "suite", 250.0)
+                self.assertEqual(len(service.get_all_rooms()), 2)
+
+                add_room = self.operation(profiler, "add_room")
+                self.assertEqual((add_room["calls"], add_room["profiled_calls"]), (2, 2))
+                self.assertEqual(add_room["allocation_samples"], 1)
+                self.assertTrue(any(function["function"].endswith("(add_room)") for function in add_room["functions"]))
+                self.assertGreater(add_room["peak_kib"], 0)
+                self.assertTrue(add_room["allocations"])
+                self.assertIn("=== get_all_rooms: 1 calls (1 profiled)", profiler.format_report())
+            self.assertFalse(tracemalloc.is_tracing())
+
+    def test_nested_and_concurrent_blocks_are_only_counted(self):
+        """Test calls inside a profiled block, or on another thread meanwhile, aren't profiled again."""
+        profiler = Profiler(trace_allocations=False)
+        service = ReservationService(self.storages[0])
+        with profiler.profile("import"):
+            with profiler.profile("add_room"):
+                service.add_room("101", "standard", 100.0)
+            worker = threading.Thread(target=self.run_block, args=(profiler, "other"))
+            worker.start()
+            worker.join()
+
+        self.assertEqual(self.operation(profiler, "import")["profiled_calls"], 1)
+        self.assertTrue(any("(add_room)" in function["function"]
+                            for function in self.operation(profiler, "import")["functions"]))
+        self.assertEqual(self.operation(profiler, "add_room")["profiled_calls"], 0)
+        self.assertEqual(self.operation(profiler, "other")["calls"], 1)
+        self.assertEqual(self.operation(profiler, "other")["profiled_calls"], 0)
+        self.assertEqual(self.operation(profiler, "import")["allocations"], [])
+
+    def run_block(self, profiler, name):
+        with profiler.profile(name):
+            pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+"""
+Unit tests for ReportService.
+Runs every report against both SQLite and JSON storage and checks they agree.
+"""
+
+import os
+import tempfile
+import time
+import unittest
+from datetime import date, timedelta
+from src.models.room import Room
+from src.models.reservation import Reservation
+from src.models.payment import CashPayment, CardPayment
+from src.repositories.sqlite_storage import SQLiteStorage
+from src.services.report_service import ReportService
+from src.services.reservation_service import ReservationService
+from tests.storage_helpers import open_storage, open_temp_storages
+
+
+def seed(storage):
+    """Two rooms, three reservations (one cancelled) and three payments."""
+    standard = Room("101", "standard", 100.0, 2)
+    suite = Room("201", "suite", 250.0, 4)
+    stays = [
+        Reservation("guest-1", standard.id, "2024-01-01", "2024-01-04"),
+        Reservation("guest-2", suite.id, "2024-01-02", "2024-01-03"),
+        Reservation("guest-3", suite.id, "2024-01-05", "2024-01-07"),
+    ]
+    stays[2].cancel()
+    cash = CashPayment(stays[0].id, 300.0)
+    cash.status = "completed"
+    card = CardPayment(stays[1].id, 200.0, "4111111111111111")
+    card.status = "partial"
+    pending = CashPayment(stays[1].id, 50.0)
+
+    storage.insert_items("rooms", [standard.to_dict(), suite.to_dict()])
+    storage.insert_items("reservations", [stay.to_dict() for stay in stays])
+    storage.insert_items("payments", [cash.to_dict(), card.to_dict(), pending.to_dict()])
+
+
+class TestReportService(unittest.TestCase):
+    """Test reports give the same answers on SQLite and JSON storage."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.reports = []
+        for storage in open_temp_storages(self.temp_dir.name):
+            seed(storage)
+            self.reports.append(ReportService(storage))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_revenue_by_day(self):
+        """Test revenue is attributed to each night sold."""
+        for reports in self.reports:
+            days = reports.revenue_by_day("2024-01-01", "2024-01-08")
+            self.assertEqual([row["date"] for row in days], ["2024-01-01", "2024-01-02", "2024-01-03"])
+            self.assertEqual(days[1]["revenue"], 350.0)
+            self.assertEqual(days[1]["occupancy_rate"], 1.0)
+
+    def test_revenue_by_room_type(self):
+        """Test revenue groups by room type and clips stays to the range."""
+        for reports in self.reports:
+            by_type = reports.revenue_by_room_type("2024-01-02", "2024-01-08")
+            self.assertEqual(by_type, [
+                {"room_type": "standard", "revenue": 200.0, "nights_sold": 2},
+                {"room_type": "suite", "revenue": 250.0, "nights_sold": 1},
+            ])
+
+    def test_revenue_by_payment_type(self):
+        """Test only received payments are counted."""
+        for reports in self.reports:
+            by_type = reports.revenue_by_payment_type()
+            self.assertEqual(by_type, [
+                {"payment_type": "card", "amount": 200.0, "payments": 1},
+                {"payment_type": "cash", "amount": 300.0, "payments": 1},
+            ])
+
+    def test_occupancy_summary(self):
+        """Test occupancy, ADR and RevPAR."""
+        for reports in self.reports:
+            summary = reports.occupancy_summary("2024-01-01", "2024-01-05")
+            self.assertEqual(summary["nights_available"], 8)
+            self.assertEqual(summary["nights_sold"], 4)
+            self.assertEqual(summary["occupancy_rate"], 0.5)
+            self.assertEqual(summary["adr"], 137.5)
+            self.assertEqual(summary["revpar"], 68.75)
+
+
+class TestDailySummary(unittest.TestCase):
+    """Test the incrementally maintained daily summary matches a full rebuild."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.storages = open_temp_storages(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    @staticmethod
+    def non_zero(rows):
+        return [row for row in rows if row["nights_sold"] or row["room_revenue"] or row["payments_received"]]
+
+    def test_incremental_summary_matches_rebuild(self):
+        """Test bookings, changes, cancellations and payments keep the summary exact."""
+        for storage in self.storages:
+            service = ReservationService(storage)
+            standard = service.add_room("101", "standard", 100.0)
+            suite = service.add_room("201", "suite", 300.0)
+            guest = service.add_guest("Jane Doe", "jane@example.com", "1234567890")
+
+            first = service.create_reservation(guest.id, standard.id, "2024-03-01", "2024-03-04")
+            second = service.create_reservation(guest.id, suite.id, "2024-03-02", "2024-03-03")
+            service.process_payment(first.id, 100.0, "cash")
+            payment = service.process_payment(second.id, 300.0, "card", "4111111111111111")
+
+            service.update_reservation(first.id, check_out_date="2024-03-05")
+            service.update_room(standard.id, price_per_night=120.0)
+            service.cancel_reservation(second.id)
+            service.delete_payment(payment.id)
+
+            incremental = self.non_zero(service.get_daily_summary("2024-01-01", "2025-01-01"))
+            self.assertEqual(len([row for row in incremental if row["nights_sold"]]), 4)
+            self.assertEqual(sum(row["room_revenue"] for row in incremental), 480.0)
+
+            service.rebuild_daily_summary()
+            rebuilt = service.get_daily_summary("2024-01-01", "2025-01-01")
+            self.assertEqual(incremental, rebuilt)
+
+    def test_deleted_reservation_takes_its_payments(self):
+        """Test deleting a paid reservation removes its payments from storage and the summary."""
+        for storage in self.storages:
+            service = ReservationService(storage)
+            room = service.add_room("101", "standard", 100.0)
+            guest = service.add_guest("Jane Doe", "jane@example.com", "1234567890")
+            reservation = service.create_reservation(guest.id, room.id, "2024-03-01", "2024-03-04")
+            service.process_payment(reservation.id, 50.0, "cash", idempotency_key="pos-1")
+
+            service.delete_reservation(reservation.id)
+            self.assertEqual(service.get_all_payments(), [])
+            self.assertEqual(self.non_zero(service.get_daily_summary("2024-01-01", "2030-01-01")), [])
+            service.rebuild_daily_summary()
+            self.assertEqual(self.non_zero(service.get_daily_summary("2024-01-01", "2030-01-01")), [])
+
+
+class TestReportPerformance(unittest.TestCase):
+    """Test SQL reports over five years of history stay fast."""
+
+    def test_five_year_history_under_a_second(self):
+        """Test the heaviest reports over five years of back-to-back stays."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            storage = open_storage(SQLiteStorage, os.path.join(temp_dir, "hotel.db"))
+            rooms = [Room(str(100 + i), "standard" if i % 2 else "deluxe", 100.0 + i, 2) for i in range(40)]
+            storage.insert_items("rooms", [room.to_dict() for room in rooms])
+
+            reservations = []
+            start = date(2019, 1, 1)
+            for index, room in enumerate(rooms):
+                # Stagger the one-night gaps so every day has some rooms sold
+                day = start + timedelta(days=index % 4)
+                while day < date(2024, 1, 1):
+                    check_out = day + timedelta(days=3)
+                    reservations.append(
+                        Reservation("guest", room.id, day.isoformat(), check_out.isoformat()).to_dict()
+                    )
+                    day = check_out + timedelta(days=1)
+            storage.insert_items("reservations", reservations)
+
+            reports = ReportService(storage)
+            started = time.perf_counter()
+            days = reports.revenue_by_day("2019-01-01", "2024-01-01")
+            summary = reports.occupancy_summary("2019-01-01", "2024-01-01")
+            elapsed = time.perf_counter() - started
+
+            self.assertEqual(len(days), (date(2024, 1, 1) - start).days)
+            self.assertAlmostEqual(summary["occupancy_rate"], 0.75, places=2)
+            self.assertLess(elapsed, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,8 +5,16 @@ Tests service layer and repository operations.
 
 import unittest
 import os
+import tempfile
+import threading
+import time
+from unittest import mock
+from src.models.reservation import Reservation
 from src.services.reservation_service import ReservationService
 from src.factories.payment_factory import PaymentFactory
+from src.gateways.payment_gateway import GatewayError, PaymentGateway
+from src.services.guest_dedup_service import GuestDedupService
+from tests.storage_helpers import open_storage, open_temp_storages
 
 
 class TestReservationService(unittest.TestCase):
@@ -51,6 +59,520 @@ class TestReservationService(unittest.TestCase):
         self.service.add_room(room_num2, "deluxe", 150.0, 2)
         rooms = self.service.get_all_rooms()
         self.assertGreaterEqual(len(rooms), 2)
+    
+    def _create_reservation(self, price=100.0):
+        """Create a room, guest and 3-night reservation for payment tests."""
+        import uuid
+        room = self.service.add_room(f"TEST-{uuid.uuid4().hex[:6]}", "standard", price, 2)
+        guest = self.service.add_guest("Jane Doe", f"test-{uuid.uuid4().hex[:8]}@example.com", "1234567890")
+        return self.service.create_reservation(guest.id, room.id, "2024-01-01", "2024-01-04")
+    
+    def test_get_balance(self):
+        """Test balance tracks amount due, paid and remaining for one reservation."""
+        reservation = self._create_reservation()
+        balance = self.service.get_balance(reservation.id)
+        self.assertEqual(balance["amount_due"], 300.0)
+        self.assertEqual(balance["amount_paid"], 0)
+        self.assertEqual(balance["status"], "unpaid")
+        
+        self.service.process_payment(reservation.id, 100.0, "cash")
+        balance = self.service.get_balance(reservation.id)
+        self.assertEqual(balance["amount_paid"], 100.0)
+        self.assertEqual(balance["remaining"], 200.0)
+        self.assertEqual(balance["status"], "partial")
+    
+    def test_process_payment_status(self):
+        """Test payment status becomes completed once the balance is covered."""
+        reservation = self._create_reservation()
+        first = self.service.process_payment(reservation.id, 100.0, "cash")
+        second = self.service.process_payment(reservation.id, 200.0, "cash")
+        self.assertEqual(first.status, "partial")
+        self.assertEqual(second.status, "completed")
+        self.assertEqual(self.service.get_balance(reservation.id)["status"], "paid")
+    
+    def test_process_payment_idempotency_key(self):
+        """Test retried submissions with the same key return the original payment."""
+        import uuid
+        reservation = self._create_reservation()
+        key = f"pos-{uuid.uuid4().hex}"
+        first = self.service.process_payment(reservation.id, 100.0, "cash", idempotency_key=key)
+        retry = self.service.process_payment(reservation.id, 100.0, "cash", idempotency_key=key)
+        self.assertEqual(first.id, retry.id)
+        
+        # A fresh service has an empty cache and must find the key in storage
+        fresh_retry = ReservationService().process_payment(reservation.id, 100.0, "cash", idempotency_key=key)
+        self.assertEqual(first.id, fresh_retry.id)
+        self.assertEqual(self.service.get_balance(reservation.id)["amount_paid"], 100.0)
+    
+    def test_process_payments_batch(self):
+        """Test batch payments are saved together and failures are reported per item."""
+        reservation = self._create_reservation()
+        items = [
+            {"reservation_id": reservation.id, "amount": 100.0, "payment_type": "cash"},
+            {"reservation_id": reservation.id, "amount": 200.0, "payment_type": "card", "card_number": "4111111111111111"},
+            {"reservation_id": reservation.id, "amount": -5.0, "payment_type": "cash"},
+            {"reservation_id": "missing-reservation", "amount": 50.0, "payment_type": "cash"},
+        ]
+        summary = self.service.process_payments_batch(items, workers=2)
+        
+        self.assertEqual(summary["succeeded"], 2)
+        self.assertEqual(summary["failed"], 2)
+        self.assertEqual(summary["results"][0]["payment"].status, "partial")
+        self.assertEqual(summary["results"][1]["payment"].status, "completed")
+        self.assertIsNotNone(summary["results"][2]["error"])
+        self.assertIsNotNone(summary["results"][3]["error"])
+        self.assertEqual(len(self.service.payment_repo.get_by_reservation(reservation.id)), 2)
+
+
+class TestGuestSearch(unittest.TestCase):
+    """Test guest search on both SQLite (FTS5) and JSON (trigram index) storage."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.services = []
+        for storage in open_temp_storages(self.temp_dir.name):
+            service = ReservationService(storage)
+            service.add_guest("Jane Doe", "jane.doe@example.com", "555-0100")
+            service.add_guest("Janet Smith", "jsmith@example.org", "555-0199")
+            service.add_guest("Bob Janeway", "bob@example.com", "555-0142")
+            self.services.append(service)
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def test_partial_match_ranks_prefix_first(self):
+        """Test substring matches are found and names starting with the query come first."""
+        for service in self.services:
+            names = [guest.name for guest in service.search_guests("jane")]
+            self.assertEqual(len(names), 3)
+            self.assertEqual(names[-1], "Bob Janeway")
+    
+    def test_every_term_must_match(self):
+        """Test multi-word, email, phone and short-prefix queries."""
+        for service in self.services:
+            self.assertEqual([g.name for g in service.search_guests("doe jane")], ["Jane Doe"])
+            self.assertEqual([g.name for g in service.search_guests("example.org")], ["Janet Smith"])
+            self.assertEqual([g.name for g in service.search_guests("0142")], ["Bob Janeway"])
+            self.assertEqual([g.name for g in service.search_guests("ja sm")], ["Janet Smith"])
+            self.assertEqual(service.search_guests("nobody"), [])
+    
+    def test_short_terms_match_after_any_separator(self):
+        """Test 1-2 character terms match words split on punctuation the same way on both storages."""
+        for service in self.services:
+            service.add_guest("Mary-Jo Smith", "mary.jo@example.net", "555-0177")
+            self.assertEqual([g.name for g in service.search_guests("jo")], ["Mary-Jo Smith"])
+            self.assertEqual([g.name for g in service.search_guests("jo sm")], ["Mary-Jo Smith"])
+            self.assertEqual(service.search_guests("ry"), [])
+            self.assertEqual(service.search_guests("j*"), [])
+    
+    def test_index_follows_updates_and_deletes(self):
+        """Test renamed and deleted guests are reflected in search results."""
+        for service in self.services:
+            jane = service.search_guests("jane doe")[0]
+            service.update_guest(jane.id, name="Jane Austen", email="jane.austen@example.com")
+            self.assertEqual([g.name for g in service.search_guests("austen")], ["Jane Austen"])
+            self.assertEqual(service.search_guests("doe jane"), [])
+            
+            service.delete_guest(jane.id)
+            self.assertEqual(service.search_guests("austen"), [])
+
+
+class TestReservationDetails(unittest.TestCase):
+    """Test joined and batched reads on SQLite and JSON storage."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.services = [ReservationService(storage) for storage in open_temp_storages(self.temp_dir.name)]
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def test_details_join_guest_room_and_balance(self):
+        """Test names, numbers and balances are joined in and orphans still listed."""
+        results = []
+        for service in self.services:
+            guest = service.add_guest("Jane Doe", "jane@example.com", "123")
+            room = service.add_room("101", "standard", 100.0)
+            first = service.create_reservation(guest.id, room.id, "2024-01-01", "2024-01-04")
+            service.process_payment(first.id, 120.0, "cash")
+            service.reservation_repo.create(Reservation("missing-guest", room.id, "2024-02-01", "2024-02-02"))
+            
+            details = service.get_reservation_details()
+            self.assertEqual(len(details), 2)
+            self.assertEqual(details[0]["guest_name"], "Jane Doe")
+            self.assertEqual(details[0]["room_number"], "101")
+            self.assertEqual((details[0]["amount_due"], details[0]["remaining"]), (300.0, 180.0))
+            self.assertEqual(details[0]["balance_status"], "partial")
+            self.assertIsNone(details[1]["guest_name"])
+            self.assertEqual(service.get_reservation_details(first.id)[0]["amount_paid"], 120.0)
+            results.append([(row["guest_name"], row["nights"], row["amount_paid"]) for row in details])
+        self.assertEqual(results[0], results[1])
+
+    def test_get_many_and_prefetch(self):
+        """Test bulk lookups keep request order and prefetch uses one query per relation."""
+        for service in self.services:
+            guests = [service.add_guest(f"Guest {i}", f"guest{i}@example.com", "123") for i in range(3)]
+            rooms = [service.add_room(str(100 + i), "standard", 100.0) for i in range(3)]
+            reservations = [
+                service.create_reservation(guest.id, room.id, "2024-01-01", "2024-01-02")
+                for guest, room in zip(guests, rooms)
+            ]
+            service.process_payment(reservations[1].id, 50.0, "cash")
+            
+            found = service.guest_repo.get_many([guests[2].id, "missing", guests[0].id, guests[2].id])
+            self.assertEqual([guest.id for guest in found], [guests[2].id, guests[0].id])
+            
+            with mock.patch.object(service.storage, "find_in", wraps=service.storage.find_in) as find_in:
+                related = service.prefetch_related(reservations)
+            self.assertEqual(find_in.call_count, 3)
+            self.assertEqual(related["guests"][guests[1].id].name, "Guest 1")
+            self.assertEqual(related["rooms"][rooms[2].id].number, "102")
+            self.assertEqual([p.amount for p in related["payments"][reservations[1].id]], [50.0])
+            self.assertEqual(related["payments"][reservations[0].id], [])
+
+    def test_projection_returns_named_rows(self):
+        """Test get_all/iter_all with fields return only those columns, in order."""
+        for service in self.services:
+            room = service.add_room("101", "standard", 100.0)
+            service.add_room("102", "suite", 250.0)
+            
+            rows = service.room_repo.get_all(fields=["id", "number"])
+            self.assertEqual(rows[0], (room.id, "101"))
+            self.assertEqual(rows[1].number, "102")
+            self.assertEqual(rows[0]._fields, ("id", "number"))
+            self.assertEqual(list(service.room_repo.iter_all(fields=["number"])), [("101",), ("102",)])
+            self.assertIs(next(service.room_repo.iter_all(fields=["is_available"])).is_available, True)
+
+
+class SlowCountingGateway(PaymentGateway):
+    """Approves every charge after a short delay and remembers each one."""
+    
+    def __init__(self):
+        self.charges = []
+    
+    def charge_sync(self, card_number, amount, reference):
+        self.charges.append(reference)
+        time.sleep(0.05)
+        return {"approved": True, "transaction_id": f"txn-{len(self.charges)}"}
+
+
+class ReplayingGateway(PaymentGateway):
+    """
+    Answers each new reference with the next scripted outcome ("approve", "decline" or "timeout",
+    where the card is charged but the answer is lost) and replays the charge for a charged reference.
+    """
+    
+    def __init__(self, outcomes=()):
+        self.outcomes = list(outcomes)
+        self.references = []
+        self.charged = {}
+    
+    def charge_sync(self, card_number, amount, reference):
+        self.references.append(reference)
+        if reference in self.charged:
+            return self.charged[reference]
+        outcome = self.outcomes.pop(0) if self.outcomes else "approve"
+        if outcome == "decline":
+            return {"approved": False, "error": "Card declined"}
+        self.charged[reference] = {"approved": True, "transaction_id": f"txn-{len(self.charged) + 1}"}
+        if outcome == "timeout":
+            raise GatewayError("Gateway unavailable: timed out")
+        return self.charged[reference]
+
+
+class TestPaymentIdempotency(unittest.TestCase):
+    """Test idempotency keys on SQLite and JSON storage with a gateway configured."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.gateways = []
+        self.services = []
+        for storage in open_temp_storages(self.temp_dir.name):
+            gateway = SlowCountingGateway()
+            self.gateways.append(gateway)
+            self.services.append(ReservationService(storage, payment_gateway=gateway))
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def _create_reservation(self, service):
+        guest = service.add_guest("Jane Doe", "jane@example.com", "123")
+        room = service.add_room("101", "standard", 100.0)
+        return service.create_reservation(guest.id, room.id, "2024-01-01", "2024-01-04")
+    
+    def test_concurrent_submissions_charge_once(self):
+        """Test submissions racing with one key charge the card once and never report another payment."""
+        for service, gateway in zip(self.services, self.gateways):
+            reservation = self._create_reservation(service)
+            payments, errors = [], []
+            
+            def submit():
+                try:
+                    payments.append(service.process_payment(
+                        reservation.id, 100.0, "card", "4111111111111111", idempotency_key="k1"
+                    ))
+                except ValueError as error:
+                    errors.append(str(error))
+            
+            threads = [threading.Thread(target=submit) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            
+            stored = service.payment_repo.get_by_reservation(reservation.id)
+            self.assertEqual(len(gateway.charges), 1)
+            self.assertEqual(len(stored), 1)
+            self.assertEqual(stored[0].status, "partial")
+            self.assertEqual({payment.id for payment in payments}, {stored[0].id})
+            self.assertTrue(all("still being processed" in error for error in errors))
+            self.assertEqual(service.process_payment(
+                reservation.id, 100.0, "card", "4111111111111111", idempotency_key="k1"
+            ).id, stored[0].id)
+            self.assertEqual(len(gateway.charges), 1)
+    
+    def test_reused_key_for_another_payment_is_rejected(self):
+        """Test a key already used for another amount or reservation raises instead of returning that payment."""
+        for service in self.services:
+            reservation = self._create_reservation(service)
+            service.process_payment(reservation.id, 100.0, "cash", idempotency_key="k2")
+            with self.assertRaises(ValueError):
+                service.process_payment(reservation.id, 150.0, "cash", idempotency_key="k2")
+            with self.assertRaises(ValueError):
+                service.process_payment("other-reservation", 100.0, "cash", idempotency_key="k2")
+            self.assertEqual(service.get_balance(reservation.id)["amount_paid"], 100.0)
+    
+    def _replaying_service(self, storage, outcomes):
+        gateway = ReplayingGateway(outcomes)
+        return ReservationService(storage, payment_gateway=gateway), gateway
+    
+    def test_retry_after_gateway_timeout_charges_once(self):
+        """Test a timed-out charge keeps its key as unknown and a retry gets the gateway's replayed charge."""
+        for storage in [service.storage for service in self.services]:
+            service, gateway = self._replaying_service(storage, ["decline", "timeout"])
+            reservation = self._create_reservation(service)
+            
+            with self.assertRaisesRegex(ValueError, "declined"):
+                service.process_payment(reservation.id, 100.0, "card", "4111111111111111", idempotency_key="k3")
+            self.assertEqual(service.payment_repo.get_by_reservation(reservation.id), [])
+            
+            with self.assertRaisesRegex(ValueError, "unknown"):
+                service.process_payment(reservation.id, 100.0, "card", "4111111111111111", idempotency_key="k3")
+            self.assertEqual(service.payment_repo.get_by_idempotency_key("k3").status, "unknown")
+            self.assertEqual(service.get_balance(reservation.id)["amount_paid"], 0)
+            
+            payment = service.process_payment(reservation.id, 100.0, "card", "4111111111111111", idempotency_key="k3")
+            self.assertEqual(payment.status, "partial")
+            self.assertEqual(gateway.references, ["k3", "k3", "k3"])
+            self.assertEqual(len(gateway.charged), 1)
+            self.assertEqual(len(service.payment_repo.get_by_reservation(reservation.id)), 1)
+            self.assertEqual(service.get_balance(reservation.id)["amount_paid"], 100.0)
+    
+    def test_failed_write_after_the_charge_can_be_retried(self):
+        """Test a payment whose final write fails isn't stuck pending and a retry records it once."""
+        for storage in [service.storage for service in self.services]:
+            service, gateway = self._replaying_service(storage, [])
+            reservation = self._create_reservation(service)
+            
+            with mock.patch.object(service.outbox_repo, "append", side_effect=RuntimeError("disk full")):
+                with self.assertRaises(RuntimeError):
+                    service.process_payment(reservation.id, 100.0, "card", "4111111111111111", idempotency_key="k4")
+            self.assertEqual(service.payment_repo.get_by_idempotency_key("k4").status, "unknown")
+            
+            payment = service.process_payment(reservation.id, 100.0, "card", "4111111111111111", idempotency_key="k4")
+            self.assertEqual(payment.status, "partial")
+            self.assertEqual(len(gateway.charged), 1)
+            self.assertEqual(service.get_balance(reservation.id)["amount_paid"], 100.0)
+            self.assertEqual(sum(row["payments_received"] for row in service.summary_repo.get_range(
+                "2000-01-01", "2100-01-01")), 100.0)
+    
+    def test_stale_pending_claim_is_reclaimed(self):
+        """Test a claim left pending by a crashed process stops blocking its key once it times out."""
+        for storage in [service.storage for service in self.services]:
+            service, gateway = self._replaying_service(storage, [])
+            reservation = self._create_reservation(service)
+            claim = PaymentFactory.create_payment("card", reservation.id, 100.0, "4111111111111111")
+            claim.idempotency_key = "k5"
+            claim.created_at = "2000-01-01T00:00:00"
+            service.payment_repo.create(claim)
+            
+            payment = service.process_payment(reservation.id, 100.0, "card", "4111111111111111", idempotency_key="k5")
+            self.assertEqual((payment.id, payment.status), (claim.id, "partial"))
+            self.assertEqual(len(service.payment_repo.get_by_reservation(reservation.id)), 1)
+
+
+class TestQueryCache(unittest.TestCase):
+    """Test cached reads and their invalidation by change events."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.services = [ReservationService(storage) for storage in open_temp_storages(self.temp_dir.name)]
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def test_repeat_reads_hit_cache_until_written(self):
+        """Test repeat reads skip storage and a write only drops the entries it affects."""
+        for service in self.services:
+            first = service.add_room("101", "standard", 100.0)
+            second = service.add_room("102", "suite", 250.0)
+            guest = service.add_guest("Jane Doe", "jane@example.com", "123")
+            
+            service.get_all_rooms()
+            service.get_room(first.id)
+            service.get_room(second.id)
+            service.get_guest(guest.id)
+            with mock.patch.object(service.storage, "find_by", wraps=service.storage.find_by) as find_by:
+                self.assertEqual(service.get_room(first.id).number, "101")
+                self.assertEqual(len(service.get_all_rooms()), 2)
+            self.assertEqual(find_by.call_count, 0)
+            
+            service.update_room(first.id, price_per_night=120.0)
+            stats = service.cache_stats()
+            self.assertEqual(stats["invalidations"], 2)
+            self.assertEqual(service.get_room(first.id).price_per_night, 120.0)
+            self.assertEqual(service.cache_stats()["hits"], stats["hits"])
+            
+            # The other room and the guest were left cached
+            service.get_room(second.id)
+            service.get_guest(guest.id)
+            self.assertEqual(service.cache_stats()["hits"], stats["hits"] + 2)
+            self.assertGreater(service.cache_stats()["hit_ratio"], 0.0)
+    
+    def test_booking_invalidates_room_and_cached_copies_are_private(self):
+        """Test a reservation refreshes the room's availability and callers can't edit cached models."""
+        for service in self.services:
+            room = service.add_room("101", "standard", 100.0)
+            guest = service.add_guest("Jane Doe", "jane@example.com", "123")
+            service.get_room(room.id).number = "999"
+            self.assertEqual(service.get_room(room.id).number, "101")
+            self.assertEqual(len(service.search_available_rooms()), 1)
+            
+            service.create_reservation(guest.id, room.id, "2024-01-01", "2024-01-03")
+            self.assertFalse(service.get_room(room.id).is_available)
+            self.assertEqual(service.search_available_rooms(), [])
+    
+    def test_rolled_back_writes_publish_nothing(self):
+        """Test change events wait for the commit and are dropped on rollback."""
+        for service in self.services:
+            room = service.add_room("101", "standard", 100.0)
+            service.get_room(room.id)
+            events = []
+            service.events.subscribe("collection_changed", lambda **payload: events.append(payload))
+            
+            with self.assertRaises(RuntimeError):
+                with service.storage.transaction():
+                    service.update_room(room.id, number="201")
+                    self.assertEqual(events, [])
+                    raise RuntimeError("abort")
+            self.assertEqual(events, [])
+            self.assertEqual(service.get_room(room.id).number, "101")
+            
+            with service.storage.transaction():
+                service.update_room(room.id, number="301")
+            self.assertEqual(events, [{"collection": "rooms", "ids": [room.id]}])
+            self.assertEqual(service.get_room(room.id).number, "301")
+    
+    def test_reads_inside_a_rolled_back_transaction_are_not_cached(self):
+        """Test a read of uncommitted data sees it, and the rollback leaves no trace in the cache."""
+        for service in self.services:
+            room = service.add_room("101", "standard", 100.0)
+            service.get_room(room.id)
+            
+            with self.assertRaises(RuntimeError):
+                with service.storage.transaction():
+                    service.update_room(room.id, number="201")
+                    self.assertEqual(service.get_room(room.id).number, "201")
+                    self.assertEqual([r.number for r in service.get_all_rooms()], ["201"])
+                    raise RuntimeError("abort")
+            self.assertEqual(service.get_room(room.id).number, "101")
+            self.assertEqual([r.number for r in service.get_all_rooms()], ["101"])
+    
+    def test_writes_from_other_processes_invalidate_when_tracked(self):
+        """Test a second storage on the same file (another process) is noticed only with tracking on."""
+        paths = [os.path.join(self.temp_dir.name, "hotel.db"), os.path.join(self.temp_dir.name, "hotel.json")]
+        for service, path in zip(self.services, paths):
+            room = service.add_room("101", "standard", 100.0)
+            guest = service.add_guest("Jane Doe", "jane@example.com", "123")
+            tracked = ReservationService(open_storage(type(service.storage), path), track_external_writes=True)
+            self.assertEqual(tracked.get_room(room.id).price_per_night, 100.0)
+            self.assertEqual(tracked.get_guest(guest.id).name, "Jane Doe")
+            self.assertEqual(service.get_room(room.id).price_per_night, 100.0)
+            
+            # A different length, so the JSON file's size changes even within one mtime tick
+            service.update_room(room.id, price_per_night=1250.0)
+            self.assertEqual(tracked.get_room(room.id).price_per_night, 1250.0)
+            self.assertGreaterEqual(tracked.cache_stats()["external_changes"], 1)
+            if service.storage.supports_sql:
+                # SQLite counts writes per table, so the guest lookup is still cached
+                hits = tracked.cache_stats()["hits"]
+                tracked.get_guest(guest.id)
+                self.assertEqual(tracked.cache_stats()["hits"], hits + 1)
+            
+            untracked = ReservationService(open_storage(type(service.storage), path))
+            untracked.get_room(room.id)
+            service.update_room(room.id, price_per_night=99.0)
+            self.assertEqual(untracked.get_room(room.id).price_per_night, 1250.0)
+            self.assertEqual(tracked.get_room(room.id).price_per_night, 99.0)
+    
+    def test_tracker_reports_only_written_collections(self):
+        """Test the SQLite tracker names just the tables another connection committed to."""
+        storage = self.services[0].storage
+        tracker = storage.change_tracker()
+        self.assertEqual(tracker.changed_collections(), set())
+        self.assertEqual(tracker.changed_collections(), set())
+        self.services[0].add_room("101", "standard", 100.0)
+        self.assertEqual(tracker.changed_collections(), {"rooms"})
+        self.assertEqual(tracker.changed_collections(), set())
+        self.services[0].add_guest("Jane Doe", "jane@example.com", "123")
+        self.assertEqual(tracker.changed_collections(), {"guests"})
+        tracker.close()
+
+
+class TestGuestDedup(unittest.TestCase):
+    """Test near-duplicate guests are grouped and merged."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.services = [ReservationService(storage) for storage in open_temp_storages(self.temp_dir.name)]
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def test_find_and_merge_duplicates(self):
+        """Test email case, phone formatting and name matches, then a merge keeping reservations."""
+        for service in self.services:
+            jane = service.add_guest("Jane Doe", "jane@example.com", "+1 (555) 010-0100")
+            same_email = service.add_guest("J. Doe", " JANE@example.com", "999")
+            same_phone = service.add_guest("Doe, Jane", "other@example.com", "555.010.0100")
+            same_user = service.add_guest("jane doe", "jane@mail.org", "123")
+            service.add_guest("Jane Roe", "roe@example.com", "5550100100")
+            room = service.add_room("101", "standard", 100.0)
+            service.create_reservation(same_email.id, room.id, "2024-01-01", "2024-01-02")
+            
+            groups = GuestDedupService(service.storage).find_duplicates()
+            self.assertEqual(len(groups), 1)
+            group = groups[0]
+            self.assertEqual(group["survivor_id"], same_email.id)
+            self.assertEqual(set(group["duplicate_ids"]), {jane.id, same_phone.id, same_user.id})
+            self.assertEqual(group["reasons"], ["email", "name and email user", "phone and name"])
+            
+            service.merge_guests(jane.id, [same_email.id, same_phone.id])
+            self.assertEqual(service.reservation_repo.get_by_guest(jane.id)[0].room_id, room.id)
+            self.assertIsNone(service.get_guest(same_email.id))
+    
+    def test_merge_is_atomic(self):
+        """Test a failed merge leaves every guest and reservation untouched."""
+        for service in self.services:
+            survivor = service.add_guest("Jane Doe", "jane@example.com", "123")
+            duplicate = service.add_guest("Jane Doe", "jane@mail.org", "123")
+            room = service.add_room("101", "standard", 100.0)
+            service.create_reservation(duplicate.id, room.id, "2024-01-01", "2024-01-02")
+            
+            with self.assertRaises(ValueError):
+                service.merge_guests(survivor.id, [duplicate.id, "missing-guest"])
+            self.assertIsNotNone(service.get_guest(duplicate.id))
+            self.assertEqual(len(service.reservation_repo.get_by_guest(duplicate.id)), 1)
 
 
 class TestPaymentFactory(unittest.TestCase):
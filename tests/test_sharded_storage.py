@@ -0,0 +1,92 @@
+"""
+Unit tests for the SQLiteStorage registry, per-property shards and chain-wide reports.
+"""
+
+import os
+import tempfile
+import threading
+import unittest
+from src.repositories.sharded_storage import ShardedSQLiteStorage
+from src.repositories.sqlite_storage import SQLiteStorage
+from src.services.report_service import ChainReportService, ReportService
+from src.services.reservation_service import ReservationService
+
+
+class TestShardedStorage(unittest.TestCase):
+    """Test each property gets its own database and chain reads cover all of them."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.saved_instances = SQLiteStorage._instances
+        SQLiteStorage._instances = {}
+        self.sharded = ShardedSQLiteStorage(os.path.join(self.temp_dir.name, "properties"))
+
+    def tearDown(self):
+        SQLiteStorage._instances = self.saved_instances
+        self.temp_dir.cleanup()
+
+    def book(self, property_id, number, price, nights):
+        service = ReservationService(self.sharded.shard(property_id))
+        room = service.add_room(number, "standard", price)
+        guest = service.add_guest("Jane Doe", "jane@example.com", "123")
+        check_out = f"2024-01-{1 + nights:02d}"
+        return service.create_reservation(guest.id, room.id, "2024-01-01", check_out)
+
+    def test_registry_shares_one_instance_per_file(self):
+        """Test the same path gives the same storage and another path a different one."""
+        path = os.path.join(self.temp_dir.name, "hotel.db")
+        self.assertIs(SQLiteStorage(path), SQLiteStorage(os.path.join(self.temp_dir.name, ".", "hotel.db")))
+        self.assertIsNot(SQLiteStorage(path), SQLiteStorage(os.path.join(self.temp_dir.name, "other.db")))
+        self.assertIs(self.sharded.shard("hotel-a"), self.sharded.shard("hotel-a"))
+        with self.assertRaises(ValueError):
+            self.sharded.shard("../hotel")
+
+    def test_properties_are_isolated(self):
+        """Test writes to one property never show up in another."""
+        self.book("hotel-a", "101", 100.0, 2)
+        self.book("hotel-b", "101", 150.0, 1)
+
+        self.assertEqual(self.sharded.property_ids(), ["hotel-a", "hotel-b"])
+        self.assertEqual(len(self.sharded.shard("hotel-a").read_collection("rooms")), 1)
+        self.assertEqual(self.sharded.shard("hotel-b").read_collection("rooms")[0]["price_per_night"], 150.0)
+
+        rooms = self.sharded.read_collection("rooms")
+        self.assertEqual(sorted(room["property_id"] for room in rooms), ["hotel-a", "hotel-b"])
+        self.assertEqual(len(self.sharded.find_by("guests", "email", "jane@example.com")), 2)
+
+    def test_fan_out_runs_shards_in_parallel(self):
+        """Test every shard is called on its own thread and a failure is raised."""
+        for property_id in ("hotel-a", "hotel-b", "hotel-c"):
+            self.book(property_id, "101", 100.0, 1)
+        barrier = threading.Barrier(3, timeout=5)
+
+        def count_rooms(storage):
+            # Only passes if all three shards are being read at the same time
+            barrier.wait()
+            return storage.query("SELECT COUNT(*) FROM rooms")[0][0]
+
+        self.assertEqual(self.sharded.fan_out(count_rooms), {"hotel-a": 1, "hotel-b": 1, "hotel-c": 1})
+        with self.assertRaises(Exception):
+            self.sharded.fan_out(lambda storage: storage.query("SELECT * FROM missing_table"))
+
+    def test_chain_report_adds_up_properties(self):
+        """Test chain totals match the sum of each property's own report."""
+        self.book("hotel-a", "101", 100.0, 2)
+        self.book("hotel-b", "201", 150.0, 1)
+
+        summary = ChainReportService(self.sharded).occupancy_summary("2024-01-01", "2024-01-05")
+        self.assertEqual(summary["properties"], 2)
+        self.assertEqual(summary["rooms"], 2)
+        self.assertEqual(summary["nights_available"], 8)
+        self.assertEqual(summary["nights_sold"], 3)
+        self.assertEqual(summary["room_revenue"], 350.0)
+        self.assertAlmostEqual(summary["adr"], 350.0 / 3)
+        self.assertEqual(summary["by_property"]["hotel-a"],
+                         ReportService(self.sharded.shard("hotel-a")).occupancy_summary("2024-01-01", "2024-01-05"))
+
+        by_type = ChainReportService(self.sharded).revenue_by_room_type("2024-01-01", "2024-01-05")
+        self.assertEqual(by_type, [{"room_type": "standard", "revenue": 350.0, "nights_sold": 3}])
+
+
+if __name__ == "__main__":
+    unittest.main()
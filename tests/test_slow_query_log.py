@@ -0,0 +1,101 @@
+"""
+Unit tests for the SQLite slow-query log.
+"""
+
+import os
+import tempfile
+import unittest
+import weakref
+from src.repositories.slow_query_log import full_scans, normalize_sql
+from src.repositories.sqlite_storage import SQLiteStorage
+from tests.storage_helpers import open_storage
+
+
+class TestSlowQueryLog(unittest.TestCase):
+    """Test statement timing, aggregation by normalised SQL and plan capture."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.storage = open_storage(SQLiteStorage, os.path.join(self.temp_dir.name, "hotel.db"))
+        self.storage.insert_items("guests", [
+            {"id": f"guest-{number}", "name": f"Guest {number}", "email": f"guest{number}@example.com",
+             "phone": str(number), "created_at": None, "updated_at": None}
+            for number in range(50)
+        ])
+        self.log = self.storage.slow_query_log
+        self.log.reset()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def entry(self, sql):
+        for row in self.log.report():
+            if row["sql"] == sql:
+                return row
+        return None
+
+    def test_normalize_sql(self):
+        """Test literals, placeholder lists and whitespace collapse to one key."""
+        self.assertEqual(normalize_sql("SELECT *  FROM guests\n WHERE id IN (?, ?, ?) AND name = 'O''Brien' LIMIT 10"),
+                         "SELECT * FROM guests WHERE id IN (?, ...) AND name = ? LIMIT ?")
+        self.assertEqual(normalize_sql("SELECT * FROM guests_fts WHERE day >= :start"),
+                         "SELECT * FROM guests_fts WHERE day >= ?")
+
+    def test_full_scans(self):
+        """Test only plain table scans are flagged."""
+        plan = ["SCAN guests", "SEARCH rooms USING INDEX sqlite_autoindex_rooms_1 (id=?)",
+                "SCAN payments USING INDEX idx_payments_reservation_id", "SCAN guests_fts VIRTUAL TABLE INDEX 0:",
+                "SCAN TABLE reservations", "SCAN CONSTANT ROW"]
+        self.assertEqual(full_scans(plan), ["guests", "reservations"])
+
+    def test_statements_aggregate_and_slow_ones_get_plans(self):
+        """Test repeated lookups share one entry and slow ones carry their plan."""
+        self.log.threshold = 0
+        for number in range(3):
+            self.storage.find_by("guests", "phone", str(number))
+        self.storage.find_by("guests", "email", "guest1@example.com")
+
+        by_phone = self.entry("SELECT * FROM guests WHERE phone = ?")
+        self.assertEqual(by_phone["calls"], 3)
+        self.assertEqual(by_phone["slow_calls"], 3)
+        self.assertEqual(by_phone["full_scans"], ["guests"])
+        by_email = self.entry("SELECT * FROM guests WHERE email = ?")
+        self.assertIn("USING INDEX idx_guests_email", by_email["plan"][0])
+        self.assertEqual(by_email["full_scans"], [])
+        self.assertEqual(self.log.recent()[-1]["params"], ["guest1@example.com"])
+
+    def test_threshold_and_fetch_time(self):
+        """Test fast statements are only counted, and streamed reads are recorded even when abandoned."""
+        self.log.threshold = 60
+        self.assertEqual(len(list(self.storage.iter_collection("guests", batch_size=10))), 50)
+        stream = self.storage.iter_collection("guests", fields=["id"], batch_size=10)
+        next(stream)
+        stream.close()
+
+        self.assertEqual(self.entry("SELECT * FROM guests")["calls"], 1)
+        self.assertEqual(self.entry("SELECT id FROM guests")["calls"], 1)
+        self.assertEqual(self.entry("SELECT * FROM guests")["slow_calls"], 0)
+        self.assertIsNone(self.entry("SELECT * FROM guests")["plan"])
+        self.assertEqual(self.log.recent(), [])
+
+    def test_fetchone_on_a_persistent_connection(self):
+        """Test single-row lookups on a long-lived connection are recorded and their cursors released."""
+        connection = self.storage._connect()
+        self.addCleanup(connection.close)
+        self.log.threshold = 60
+        for number in range(50):
+            cursor = connection.execute("SELECT * FROM guests WHERE id = ?", (f"guest-{number}",))
+            self.assertEqual(cursor.fetchone()[0], f"guest-{number}")
+        released = weakref.ref(cursor)
+        del cursor
+        self.assertIsNone(released())
+        for row in connection.execute("SELECT id FROM guests WHERE phone = ?", ("7",)):
+            self.assertEqual(row[0], "guest-7")
+
+        self.assertEqual(self.entry("SELECT * FROM guests WHERE id = ?")["calls"], 50)
+        self.assertEqual(self.entry("SELECT id FROM guests WHERE phone = ?")["calls"], 1)
+        self.assertGreater(self.entry("SELECT id FROM guests WHERE phone = ?")["total_ms"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Startup-time checks for one-shot CLI invocations.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+from src.repositories.sqlite_storage import SQLiteStorage, SCHEMA_VERSION
+from tests.storage_helpers import open_storage
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Wall-clock budget for starting Python, importing main and building the service
+STARTUP_BUDGET_SECONDS = 0.5
+
+# Modules only some commands need; importing main must not load them
+DEFERRED_MODULES = [
+    "concurrent.futures",
+    "logging.handlers",
+    "src.services.export_service",
+    "src.services.import_service",
+    "src.services.guest_dedup_service",
+    "src.services.command_runner",
+    "src.services.outbox_consumer",
+    "src.repositories.sharded_storage",
+    "src.utils.instrumentation",
+    "src.utils.profiling",
+    "cProfile",
+    "tracemalloc",
+    "src.api.http_server",
+]
+
+STARTUP_SCRIPT = """
+import json, sys
+import main
+from src.services.reservation_service import ReservationService
+ReservationService()
+print(json.dumps(sorted(name for name in %r if name in sys.modules)))
+""" % (DEFERRED_MODULES,)
+
+
+class TestStartup(unittest.TestCase):
+    """Test the CLI starts without doing work it doesn't need yet."""
+
+    def run_startup(self):
+        started = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, "-c", STARTUP_SCRIPT], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        )
+        return time.perf_counter() - started, json.loads(completed.stdout.strip().splitlines()[-1])
+
+    def test_startup_within_budget(self):
+        """Test importing main and building the service is fast and defers optional modules."""
+        timings = []
+        for _ in range(3):
+            elapsed, loaded = self.run_startup()
+            timings.append(elapsed)
+            self.assertEqual(loaded, [])
+        self.assertLess(min(timings), STARTUP_BUDGET_SECONDS)
+
+    def test_schema_setup_runs_once_per_version(self):
+        """Test the DDL is skipped when the database is already at the current schema version."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "hotel.db")
+            first = open_storage(SQLiteStorage, path)
+            self.assertEqual(first.query("PRAGMA user_version")[0][0], SCHEMA_VERSION)
+
+            with mock.patch.object(SQLiteStorage, "_initialize_database") as initialize:
+                second = open_storage(SQLiteStorage, path)
+                self.assertFalse(initialize.called)
+                self.assertEqual(second.read_collection("rooms"), [])
+                self.assertFalse(initialize.called)
+
+
+if __name__ == "__main__":
+    unittest.main()